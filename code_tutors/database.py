@@ -0,0 +1,76 @@
+"""Database settings read from the environment."""
+import os
+from urllib.parse import parse_qsl, unquote, urlparse
+
+POSTGRES_SCHEMES = ('postgres', 'postgresql', 'pgsql')
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+
+def _flag(environ, name, default):
+    return environ.get(name, default).strip().lower() in TRUE_VALUES
+
+
+def sqlite_config(name, environ):
+    """Return a SQLite DATABASES entry, tuned unless DB_SQLITE_PROFILE is false."""
+    if not _flag(environ, 'DB_SQLITE_PROFILE', 'true'):
+        return {'ENGINE': 'django.db.backends.sqlite3', 'NAME': name, 'SQLITE_PROFILE': False}
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name,
+        # Take the write lock when a transaction starts rather than failing to upgrade a read lock
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
+    }
+
+
+def replica_config(base_dir, environ=os.environ):
+    """Return the read replica DATABASES entry described by DATABASE_REPLICA_URL, or None."""
+    url = environ.get('DATABASE_REPLICA_URL', '').strip()
+    if not url:
+        return None
+    config = database_config(base_dir, dict(environ, DATABASE_URL=url))
+    # Tests read the primary's test database through the replica alias
+    config['TEST'] = {'MIRROR': 'default'}
+    return config
+
+
+def database_config(base_dir, environ=os.environ):
+    """Return the default DATABASES entry described by DATABASE_URL.
+
+    Without DATABASE_URL the project's SQLite file is used. SQLite
+    connections get the SQLITE_PRAGMAS profile and IMMEDIATE transactions
+    unless DB_SQLITE_PROFILE is false. PostgreSQL URLs
+    use Django's native connection pool unless DB_POOL is false, in which
+    case connections persist for DB_CONN_MAX_AGE seconds instead.
+    """
+    url = environ.get('DATABASE_URL', '').strip()
+    if not url:
+        return sqlite_config(base_dir / 'db.sqlite3', environ)
+
+    parsed = urlparse(url)
+    if parsed.scheme == 'sqlite':
+        return sqlite_config(unquote(parsed.path[1:]) or base_dir / 'db.sqlite3', environ)
+    if parsed.scheme not in POSTGRES_SCHEMES:
+        raise ValueError(f"Unsupported DATABASE_URL scheme: {parsed.scheme}")
+
+    options = dict(parse_qsl(parsed.query))
+    config = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': unquote(parsed.path.lstrip('/')),
+        'USER': unquote(parsed.username or ''),
+        'PASSWORD': unquote(parsed.password or ''),
+        'HOST': parsed.hostname or '',
+        'PORT': str(parsed.port or ''),
+        'OPTIONS': options,
+    }
+    if _flag(environ, 'DB_POOL', 'true'):
+        # Pooled connections are returned to the pool after each request, so they cannot also persist
+        options['pool'] = {
+            'min_size': int(environ.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(environ.get('DB_POOL_MAX_SIZE', 10)),
+            'timeout': float(environ.get('DB_POOL_TIMEOUT', 10)),
+        }
+        config['CONN_MAX_AGE'] = 0
+    else:
+        config['CONN_MAX_AGE'] = int(environ.get('DB_CONN_MAX_AGE', 60))
+        config['CONN_HEALTH_CHECKS'] = True
+    return config
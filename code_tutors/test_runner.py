@@ -0,0 +1,37 @@
+"""Test runner keeping the test suite away from the cache shared by the running site."""
+from django.test import runner
+from django.test.utils import override_settings
+
+# Each test process gets its own memory cache, so setUp's cache.clear() neither
+# empties the site's cache file nor the entries of another parallel test process
+TEST_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'tests',
+    },
+}
+
+
+def use_test_caches(*args):
+    override_settings(CACHES=TEST_CACHES).enable()
+
+
+class ParallelTestSuite(runner.ParallelTestSuite):
+    """Parallel suite whose spawned worker processes also use the test caches."""
+
+    process_setup = use_test_caches
+
+
+class TestRunner(runner.DiscoverRunner):
+    """DiscoverRunner running the tests against TEST_CACHES."""
+
+    parallel_test_suite = ParallelTestSuite
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._caches_override = override_settings(CACHES=TEST_CACHES)
+        self._caches_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._caches_override.disable()
+        super().teardown_test_environment(**kwargs)
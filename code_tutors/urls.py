@@ -55,6 +55,10 @@ urlpatterns = [
 
     path('pending-approvals/', views.pending_approvals, name='pending_approvals'),
     path('approve-match/<int:match_id>/', views.approve_match, name='approve_match'),
+
+    path('export/<str:name>/', views.export_csv, name='export_csv'),
+    path('import/<str:name>/', views.import_csv, name='import_csv'),
+    path('metrics/', views.metrics, name='metrics'),
     
 
 ]
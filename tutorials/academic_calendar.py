@@ -0,0 +1,173 @@
+"""Academic term and holiday calendar shared by the request, matching and calendar views."""
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from datetime import date, timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+Term = namedtuple('Term', ['name', 'start', 'end'])
+
+# Each term is (name, (start month, start day), (end month, end day)).
+# The first entry starts the academic year; later entries with an earlier
+# start month fall into the following calendar year.
+DEFAULT_ACADEMIC_TERMS = (
+    ('Autumn', (9, 1), (12, 20)),
+    ('Spring', (1, 4), (3, 31)),
+    ('Summer', (4, 15), (7, 20)),
+)
+
+LATE_REQUEST_NOTICE = timedelta(weeks=2)
+
+
+def _weekdays_between(start, end):
+    """Return the number of Monday-Friday dates in the inclusive range start..end."""
+    if end < start:
+        return 0
+    total_days = (end - start).days + 1
+    full_weeks, remainder = divmod(total_days, 7)
+    count = full_weeks * 5
+    first_weekday = start.weekday()
+    for offset in range(remainder):
+        if (first_weekday + offset) % 7 < 5:
+            count += 1
+    return count
+
+
+class AcademicCalendar:
+    """Term and holiday data with a sorted interval index for date lookups."""
+
+    def __init__(self, terms=DEFAULT_ACADEMIC_TERMS, holidays=()):
+        self.term_pattern = tuple(terms)
+        self.holidays = tuple(sorted(set(holidays)))
+        # (first year, last year, terms, starts, ends), replaced as a whole so
+        # threads sharing the calendar never see lists of different years
+        self._index = (None, None, (), (), ())
+
+    def _build_year(self, academic_year):
+        """Return the concrete terms of the academic year starting in academic_year."""
+        first_start = self.term_pattern[0][1]
+        terms = []
+        for name, start, end in self.term_pattern:
+            start_year = academic_year if start >= first_start else academic_year + 1
+            end_year = start_year if end >= start else start_year + 1
+            terms.append(Term(name, date(start_year, *start), date(end_year, *end)))
+        return terms
+
+    def _ensure_years(self, first_year, last_year):
+        """Return the (terms, starts, ends) of an interval index covering the given academic years."""
+        indexed_first, indexed_last, terms, starts, ends = self._index
+        if indexed_first is not None and indexed_first <= first_year and last_year <= indexed_last:
+            return terms, starts, ends
+        if indexed_first is not None:
+            first_year = min(first_year, indexed_first)
+            last_year = max(last_year, indexed_last)
+        terms = []
+        for academic_year in range(first_year, last_year + 1):
+            terms.extend(self._build_year(academic_year))
+        terms.sort(key=lambda term: term.start)
+        terms = tuple(terms)
+        starts = tuple(term.start for term in terms)
+        ends = tuple(term.end for term in terms)
+        self._index = (first_year, last_year, terms, starts, ends)
+        return terms, starts, ends
+
+    def _ensure_date(self, day):
+        """Return the (terms, starts, ends) of an interval index covering the terms around day."""
+        return self._ensure_years(day.year - 1, day.year + 1)
+
+    def academic_year_of(self, day):
+        """Return the year in which the academic year containing day started."""
+        start_month, start_day = self.term_pattern[0][1]
+        return day.year if (day.month, day.day) >= (start_month, start_day) else day.year - 1
+
+    def academic_year_terms(self, academic_year):
+        """Return the terms of the academic year starting in academic_year."""
+        terms, starts, _ = self._ensure_years(academic_year, academic_year)
+        index = bisect_left(starts, date(academic_year, *self.term_pattern[0][1]))
+        return terms[index:index + len(self.term_pattern)]
+
+    def term_containing(self, day):
+        """Return the term containing day, or None outside of term time."""
+        terms, starts, ends = self._ensure_date(day)
+        index = bisect_right(starts, day) - 1
+        if index >= 0 and day <= ends[index]:
+            return terms[index]
+        return None
+
+    def next_term(self, day):
+        """Return the first term starting on or after day."""
+        terms, starts, _ = self._ensure_date(day)
+        return terms[bisect_left(starts, day)]
+
+    def next_term_start(self, day):
+        """Return the start date of the first term starting on or after day."""
+        return self.next_term(day).start
+
+    def schedule_terms(self, request_date):
+        """Return the terms a request made on request_date is scheduled over.
+
+        Sessions begin at the next term start and run until the end of that
+        term's academic year.
+        """
+        first = self.next_term(request_date)
+        return tuple(
+            term for term in self.academic_year_terms(self.academic_year_of(first.start))
+            if term.start >= first.start
+        )
+
+    def is_late(self, request_date, notice=LATE_REQUEST_NOTICE):
+        """Return True if request_date falls within the notice period before a term starts."""
+        return self.next_term_start(request_date) - request_date <= notice
+
+    def is_holiday(self, day):
+        """Return True if day is a configured holiday."""
+        index = bisect_left(self.holidays, day)
+        return index < len(self.holidays) and self.holidays[index] == day
+
+    def is_teaching_day(self, day):
+        """Return True if day is a weekday in term time which is not a holiday."""
+        return day.weekday() < 5 and self.term_containing(day) is not None and not self.is_holiday(day)
+
+    def term_intervals(self, start, end):
+        """Return (start, end) pairs of term time clipped to the inclusive range start..end."""
+        if end < start:
+            return []
+        terms, starts, _ = self._ensure_years(self.academic_year_of(start) - 1, self.academic_year_of(end) + 1)
+        first = max(bisect_right(starts, start) - 1, 0)
+        last = bisect_right(starts, end)
+        intervals = []
+        for term in terms[first:last]:
+            clipped_start = max(term.start, start)
+            clipped_end = min(term.end, end)
+            if clipped_start <= clipped_end:
+                intervals.append((clipped_start, clipped_end))
+        return intervals
+
+    def teaching_days_between(self, start, end):
+        """Return the number of teaching days in the inclusive range start..end."""
+        count = 0
+        for interval_start, interval_end in self.term_intervals(start, end):
+            count += _weekdays_between(interval_start, interval_end)
+            first = bisect_left(self.holidays, interval_start)
+            last = bisect_right(self.holidays, interval_end)
+            count -= sum(1 for holiday in self.holidays[first:last] if holiday.weekday() < 5)
+        return count
+
+
+@lru_cache(maxsize=None)
+def get_academic_calendar() -> AcademicCalendar:
+    """Return the process-wide academic calendar built from settings."""
+    return AcademicCalendar(
+        terms=getattr(settings, 'ACADEMIC_TERMS', DEFAULT_ACADEMIC_TERMS),
+        holidays=getattr(settings, 'ACADEMIC_HOLIDAYS', ()),
+    )
+
+
+@receiver(setting_changed)
+def reset_academic_calendar(sender, setting, **kwargs):
+    """Rebuild the academic calendar when its settings are overridden."""
+    if setting in ('ACADEMIC_TERMS', 'ACADEMIC_HOLIDAYS'):
+        get_academic_calendar.cache_clear()
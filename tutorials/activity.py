@@ -0,0 +1,79 @@
+"""Maintenance of the per-user activity counters shown on dashboards."""
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from tutorials.models import Match, RequestSession, User, UserActivity
+
+
+def _count_subquery(queryset, user_field):
+    """Return a subquery counting rows of queryset whose user_field is the outer user."""
+    counted = queryset.filter(**{user_field: OuterRef('pk')}).order_by().values(user_field).annotate(
+        total=Count('pk')
+    ).values('total')
+    return Coalesce(Subquery(counted, output_field=IntegerField()), Value(0))
+
+
+def recompute_activity(user_ids=None, batch_size=500):
+    """Recount the activity of the given users, or of every user, and store it in bulk."""
+    users = User.objects.all() if user_ids is None else User.objects.filter(pk__in=user_ids)
+    pending = Match.objects.filter(tutor_approved=False)
+    active = Match.objects.filter(tutor_approved=True)
+    counts = users.order_by().annotate(
+        open_requests=_count_subquery(RequestSession.objects.filter(match__isnull=True), 'student'),
+        pending_approvals=(
+            _count_subquery(pending, 'tutor') + _count_subquery(pending, 'request_session__student')
+        ),
+        active_matches=(
+            _count_subquery(active, 'tutor') + _count_subquery(active, 'request_session__student')
+        ),
+    ).values_list('pk', *UserActivity.COUNTER_FIELDS)
+
+    total = 0
+    batch = []
+    for user_id, open_requests, pending_approvals, active_matches in counts.iterator(chunk_size=batch_size):
+        batch.append(UserActivity(
+            user_id=user_id,
+            open_requests=open_requests,
+            pending_approvals=pending_approvals,
+            active_matches=active_matches,
+        ))
+        if len(batch) == batch_size:
+            total += _store(batch)
+            batch = []
+    if batch:
+        total += _store(batch)
+    return total
+
+
+def _store(batch):
+    """Insert or overwrite a batch of activity rows."""
+    UserActivity.objects.bulk_create(
+        batch,
+        update_conflicts=True,
+        unique_fields=['user'],
+        update_fields=list(UserActivity.COUNTER_FIELDS),
+    )
+    return len(batch)
+
+
+def adjust_activity(user_id, **deltas):
+    """Apply counter changes for a user; call inside the transaction making the change.
+
+    A user without an activity row is recounted instead, which already
+    includes the change. Counters never drop below zero; drift from writes
+    made outside the views is fixed by the repair_activity_counters command.
+    """
+    updates = {field: Greatest(F(field) + delta, Value(0)) for field, delta in deltas.items() if delta}
+    if not updates:
+        return
+    if not UserActivity.objects.filter(pk=user_id).update(**updates):
+        recompute_activity([user_id])
+
+
+def get_activity(user):
+    """Return the activity counters of a user, counting them on first use."""
+    try:
+        return UserActivity.objects.get(pk=user.pk)
+    except UserActivity.DoesNotExist:
+        recompute_activity([user.pk])
+        return UserActivity.objects.get(pk=user.pk)
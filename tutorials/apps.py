@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class TutorialsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tutorials'
+
+    def ready(self):
+        # Registers the SQLite connection profile before the first connection is made
+        from tutorials import sqlite  # noqa: F401
+        # Connects the receivers invalidating cached users
+        from tutorials import auth  # noqa: F401
@@ -0,0 +1,71 @@
+"""Authentication backend serving request.user from the cache."""
+import copy
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from tutorials.metrics import CACHE_REQUESTS
+from tutorials.models import User
+
+
+def _cache():
+    return caches[getattr(settings, 'AUTH_USER_CACHE', 'default')]
+
+
+def user_cache_key(user_id):
+    return f'tutorials.auth.user:{user_id}'
+
+
+def cacheable_user(user):
+    """Return a copy of user to cache, with its session hash instead of its password hash.
+
+    The password is left deferred, so code that checks it loads it from the
+    database rather than from the shared cache.
+    """
+    cached = copy.copy(user)
+    cached.session_auth_hash = user.get_session_auth_hash()
+    del cached.password
+    return cached
+
+
+def invalidate_cached_user(user_id, using=None):
+    """Drop a user's cached copy now and again once the current transaction commits.
+
+    The second delete stops a request that read the old row before the
+    commit from caching it until the timeout.
+    """
+    key = user_cache_key(user_id)
+    _cache().delete(key)
+    transaction.on_commit(lambda: _cache().delete(key), using=using)
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend whose get_user, run on every authenticated request, reads the cache first.
+
+    Cached users are dropped whenever the user is saved or deleted, so
+    profile and password changes and deletions take effect on the next
+    request. They hold no password hash; see cacheable_user.
+    """
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        user = _cache().get(key)
+        if user is not None:
+            CACHE_REQUESTS.inc(cache='auth_user', result='hit')
+            return user if self.user_can_authenticate(user) else None
+        CACHE_REQUESTS.inc(cache='auth_user', result='miss')
+        user = super().get_user(user_id)
+        if user is not None:
+            _cache().set(key, cacheable_user(user), getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 300))
+        return user
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def drop_cached_user(sender, instance, using, **kwargs):
+    """Invalidate the cached copy of a saved or deleted user."""
+    invalidate_cached_user(instance.pk, using=using)
@@ -0,0 +1,128 @@
+"""CSV exports of the admin listings, streamed in chunks so memory stays flat."""
+import csv
+from collections import namedtuple
+
+from tutorials.models import Frequency, Invoice, Match, RequestSession, User
+from tutorials.recurrence import weekday_names
+from tutorials.search import matched_request_search, requested_session_search, user_search
+
+
+class Export(namedtuple('Export', ['queryset', 'columns'])):
+    """A listing's filtered queryset and its (header, field, converter) columns."""
+
+    __slots__ = ()
+
+
+def _days(mask):
+    return ', '.join(weekday_names(mask))
+
+
+def _users(search_query='', tutor=None):
+    users = User.objects.all()
+    if search_query:
+        users = users.filter(user_search(search_query))
+    return users
+
+
+def _matches(search_query='', tutor=None):
+    matches = Match.objects.filter(tutor_approved=True)
+    if search_query:
+        matches = matches.filter(matched_request_search(search_query))
+    return matches
+
+
+def _requests(search_query='', tutor=None):
+    requests = RequestSession.objects.filter(match__isnull=True)
+    if search_query:
+        requests = requests.filter(requested_session_search(search_query))
+    return requests
+
+
+def _invoices(search_query='', tutor=None):
+    invoices = Invoice.objects.filter(match__tutor_approved=True)
+    if tutor is not None:
+        invoices = invoices.filter(match__tutor_id=tutor)
+    return invoices
+
+
+EXPORTS = {
+    'users': Export(_users, (
+        ('id', 'id', None),
+        ('username', 'username', None),
+        ('first_name', 'first_name', None),
+        ('last_name', 'last_name', None),
+        ('email', 'email', None),
+        ('user_type', 'user_type', None),
+        ('date_joined', 'date_joined', None),
+    )),
+    'matches': Export(_matches, (
+        ('id', 'id', None),
+        ('tutor', 'tutor__username', None),
+        ('student', 'request_session__student__username', None),
+        ('subject', 'request_session__subject__name', None),
+        ('proficiency', 'request_session__proficiency', None),
+        ('date_requested', 'request_session__date_requested', None),
+        ('frequency', 'request_session__frequency', Frequency.to_string),
+        ('days', 'request_session__weekdays', _days),
+    )),
+    'requests': Export(_requests, (
+        ('id', 'id', None),
+        ('student', 'student__username', None),
+        ('subject', 'subject__name', None),
+        ('proficiency', 'proficiency', None),
+        ('date_requested', 'date_requested', None),
+        ('frequency', 'frequency', Frequency.to_string),
+        ('days', 'weekdays', _days),
+    )),
+    'invoices': Export(_invoices, (
+        ('id', 'id', None),
+        ('match', 'match_id', None),
+        ('tutor', 'match__tutor__username', None),
+        ('student', 'match__request_session__student__username', None),
+        ('subject', 'match__request_session__subject__name', None),
+        ('payment', 'payment', None),
+        ('payment_status', 'payment_status', None),
+        ('bank_transfer', 'bank_transfer', None),
+    )),
+}
+
+
+def export_rows(name, search_query='', tutor=None, chunk_size=2000):
+    """Yield the header and then each row of an export, fetching chunk_size rows at a time.
+
+    Rows are read in primary key order with values_list().iterator(), so
+    no model instances are built and only one chunk is held in memory.
+    """
+    export = EXPORTS[name]
+    yield [header for header, _, _ in export.columns]
+    converters = [convert for _, _, convert in export.columns]
+    rows = export.queryset(search_query, tutor).order_by('pk').values_list(
+        *(field for _, field, _ in export.columns)
+    ).iterator(chunk_size=chunk_size)
+    for row in rows:
+        yield [value if convert is None else convert(value) for value, convert in zip(row, converters)]
+
+
+class _Echo:
+    """File-like object whose write() returns the text, so csv.writer can produce lines one at a time."""
+
+    def write(self, value):
+        return value
+
+
+# Leading characters that make spreadsheets read a cell as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def neutralise(value):
+    """Prefix text a spreadsheet would evaluate, such as every '@username', with a quote."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_lines(rows):
+    """Yield each row as one line of CSV text, with formula-like text neutralised."""
+    writer = csv.writer(_Echo())
+    for row in rows:
+        yield writer.writerow([neutralise(value) for value in row])
@@ -5,7 +5,9 @@ from django.core.validators import RegexValidator
 from django.utils import timezone
 
 from django.forms import Select
-from .models import User, Match, RequestSession, RequestSessionDay, TutorSubject, Subject, Frequency
+from .instrumentation import timed
+from .tracing import set_attribute, span
+from .models import User, Match, RequestSession, TutorSubject, Subject, Frequency
 from django.core.exceptions import ValidationError
 
 class AddTutorSubjectForm(forms.ModelForm):
@@ -204,24 +206,23 @@ class TutorMatchForm(forms.Form):
         widget=forms.Select(attrs={'class': 'form-select mb-3'})
     )
 
+    @timed('match-form')
+    @span('tutor.eligibility')
     def __init__(self, request_session: RequestSession, *args, **kwargs) -> None:
         """Initialize form with filtered tutor queryset based on request requirements."""
         super().__init__(*args, **kwargs)
+        set_attribute('subject.id', request_session.subject_id)
+        set_attribute('proficiency', request_session.proficiency)
 
-        # Define proficiency levels in order of hierarchy
-        proficiency_hierarchy = {'beginner': 1,'intermediate': 2,'advanced': 3}
-
-        # Get the requested proficiency level and normalize it to lowercase
-        requested_proficiency = request_session.proficiency.lower()
-
+        # Tutors teaching the subject at the requested proficiency or above
+        qualified_subjects = TutorSubject.objects.qualified_for(
+            request_session.subject_id,
+            request_session.proficiency
+        )
         self.fields['tutor'].queryset = User.objects.filter(
             user_type='tutor',
-            tutor_subjects__subject=request_session.subject,
-            tutor_subjects__proficiency__in=[
-                prof.capitalize() for prof, level in proficiency_hierarchy.items()
-                if level >= proficiency_hierarchy[requested_proficiency]
-            ]
-        ).distinct()
+            id__in=qualified_subjects.values('tutor_id')
+        )
 
 
     def save(self, request_session: RequestSession) -> Match:
@@ -232,13 +233,6 @@ class TutorMatchForm(forms.Form):
             tutor=tutor,
             tutor_approved=False
         )
-
-        for day in request_session.days.all():
-            RequestSessionDay.objects.create(
-                request_session=request_session,
-                day_of_week=day.day_of_week
-            )
-        
         return match
     
     def clean_tutor(self):
@@ -292,3 +286,9 @@ class PayInvoice(forms.Form):
         if not bank_transfer:
             raise ValidationError("Bank transfer number is required")
         return bank_transfer.strip()
+
+
+class CsvImportForm(forms.Form):
+    """Form for admins to upload a CSV file to import."""
+
+    file = forms.FileField(label='CSV file', widget=forms.ClearableFileInput(attrs={'accept': '.csv,text/csv'}))
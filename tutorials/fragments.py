@@ -0,0 +1,39 @@
+"""Versioning of the template fragments cached with {% cache %}."""
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from tutorials.generations import bump_generation, get_generations
+
+# Models whose rows appear in the calendar grids
+CALENDAR_MODELS = (
+    'tutorials.RequestSession',
+    'tutorials.RequestSessionDay',
+    'tutorials.Match',
+    'tutorials.Subject',
+    'tutorials.User',
+)
+
+# Stands for the academic calendar settings, which shape every calendar
+ACADEMIC_CALENDAR = 'tutorials.academic_calendar'
+
+
+def calendar_version():
+    """Return the current version of the calendar data, part of every calendar fragment key."""
+    return '.'.join(str(generation) for generation in get_generations(ACADEMIC_CALENDAR, *CALENDAR_MODELS))
+
+
+def fragment_cache(request):
+    """Context processor giving templates the timeout and data version of cached fragments."""
+    return {
+        'fragment_cache_timeout': getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 300),
+        # Called by the template only when a calendar fragment is rendered
+        'calendar_version': calendar_version,
+    }
+
+
+@receiver(setting_changed)
+def reset_calendar_fragments(sender, setting, **kwargs):
+    """Drop cached calendars when the academic calendar settings change."""
+    if setting in ('ACADEMIC_TERMS', 'ACADEMIC_HOLIDAYS'):
+        bump_generation(ACADEMIC_CALENDAR)
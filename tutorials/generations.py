@@ -0,0 +1,146 @@
+"""Per-table generation counters and the page cache keyed on them.
+
+Every save or delete of a tutorials model bumps its table's generation,
+an O(1) cache increment, and bumps it again once the write's transaction
+commits. Cached data is stored under keys holding the
+generations of the tables it was read from, so a write makes it
+unreachable without finding and deleting it. Queryset update() and
+bulk_create() send no signals, so code writing that way calls
+bump_generation itself.
+"""
+import hashlib
+import time
+from datetime import date
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http import HttpResponse
+
+from tutorials.metrics import CACHE_REQUESTS
+from tutorials.routers import used_replica
+
+# Fields whose saves are not shown by any cached page; logging in saves
+# last_login and, when the hasher's work factor has changed, password
+UNCACHED_FIELDS = frozenset({'last_login', 'password'})
+
+
+def _label(model):
+    return model if isinstance(model, str) else model._meta.label
+
+
+def generation_key(model):
+    return f'tutorials.generation:{_label(model).lower()}'
+
+
+def _initial_generation():
+    # A counter recreated after eviction must not reuse the generations of the old one
+    return time.time_ns()
+
+
+def get_generations(*models):
+    """Return the current generation of each model's table, in order."""
+    keys = [generation_key(model) for model in models]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, _initial_generation(), None)
+            generations[key] = cache.get(key)
+    return tuple(generations[key] for key in keys)
+
+
+def _bump(models):
+    for model in models:
+        key = generation_key(model)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _initial_generation(), None)
+
+
+def bump_generation(*models, using=None):
+    """Start a new generation of each model's table now and again once the current transaction commits.
+
+    A request running during the transaction can read the first new
+    generation together with the old rows; the second bump makes what it
+    caches unreachable.
+    """
+    _bump(models)
+    transaction.on_commit(lambda: _bump(models), using=using)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_saved_table(sender, using, update_fields=None, **kwargs):
+    """Bump the table generation of a saved or deleted tutorials model."""
+    if sender._meta.app_label != 'tutorials':
+        return
+    if update_fields and update_fields <= UNCACHED_FIELDS:
+        return
+    bump_generation(sender, using=using)
+
+
+def page_key(request, view_name, models):
+    """Return the cache key of a page for this user, URL, day and table generations.
+
+    The CSRF secret is part of the key because the page embeds a token
+    derived from it.
+    """
+    parts = [
+        view_name,
+        request.user.pk,
+        request.get_full_path(),
+        request.META.get('CSRF_COOKIE', ''),
+        date.today().isoformat(),
+        *get_generations(*models),
+    ]
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return f'tutorials.page:{view_name}:{digest}'
+
+
+def cache_page_by_generations(*models):
+    """Decorator caching a view's rendered GET responses until a table it reads from changes.
+
+    Pages carrying flash messages, pages of users without a CSRF cookie
+    and pages read from a replica, which may lag behind the generation
+    counters, are rendered but not stored.
+    """
+
+    def decorator(view_function):
+        view_name = f'{view_function.__module__}.{view_function.__qualname__}'
+
+        @wraps(view_function)
+        def modified_view_function(request, *args, **kwargs):
+            if (
+                request.method != 'GET'
+                or not request.user.is_authenticated
+                or 'CSRF_COOKIE' not in request.META
+                or len(get_messages(request))
+            ):
+                return view_function(request, *args, **kwargs)
+
+            key = page_key(request, view_name, models)
+            cached = cache.get(key)
+            if cached is not None:
+                CACHE_REQUESTS.inc(cache='page', result='hit')
+                content, status, headers = cached
+                response = HttpResponse(content, status=status)
+                for header, value in headers:
+                    response[header] = value
+                return response
+
+            CACHE_REQUESTS.inc(cache='page', result='miss')
+            response = view_function(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming and not used_replica():
+                cache.set(
+                    key,
+                    (response.content, response.status_code, list(response.items())),
+                    getattr(settings, 'PAGE_CACHE_TIMEOUT', 600),
+                )
+            return response
+        return modified_view_function
+    return decorator
@@ -1,7 +1,10 @@
 from django.conf import settings
 from django.shortcuts import redirect
 
+from tutorials.instrumentation import timed
+from tutorials.metrics import PDF_RENDER_SECONDS
 from tutorials.pdfController import PDFUser
+from tutorials.tracing import span
 from .models import Invoice, TutorSubject
 
 def login_prohibited(view_function):
@@ -29,6 +32,9 @@ class InvoiceService:
         return paid, unpaid
 
     @staticmethod
+    @timed('invoice-pdf')
+    @PDF_RENDER_SECONDS.time()
+    @span('invoice.pdf')
     def generate_pdf(user, match, invoice):
         tutor = match.tutor
         tutor_name = f"{tutor.first_name} {tutor.last_name}"
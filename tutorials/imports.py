@@ -0,0 +1,199 @@
+"""Bulk CSV imports of student requests and tutor subjects, validated and inserted a chunk at a time."""
+import csv
+import re
+from collections import namedtuple
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.utils.timezone import now
+
+from tutorials.activity import recompute_activity
+from tutorials.generations import bump_generation
+from tutorials.models import (
+    PROFICIENCY_LEVELS, Frequency, RequestSession, RequestSessionDay, Subject, TutorSubject, User,
+)
+from tutorials.recurrence import WEEKDAYS, weekday_mask
+
+
+class RowError(namedtuple('RowError', ['line', 'message'])):
+    """A rejected CSV line and the reason it was rejected."""
+
+    __slots__ = ()
+
+
+class ImportReport(namedtuple('ImportReport', ['created', 'errors'])):
+    """The number of rows imported and a RowError for each rejected row."""
+
+    __slots__ = ()
+
+
+class Import(namedtuple('Import', ['model', 'owner', 'owner_type', 'columns', 'build', 'store'])):
+    """How a CSV is imported into model.
+
+    owner is the column and field holding the username of a user of
+    owner_type; build(row, owner_id, subject_id, proficiency, today) returns
+    an unsaved instance and store(instances) inserts a chunk of them.
+    """
+
+    __slots__ = ()
+
+
+def _field_value(model, name, value):
+    """Convert a CSV value with the model field, so errors read like form errors."""
+    try:
+        return model._meta.get_field(name).clean(value, None)
+    except ValidationError as error:
+        raise ValidationError(f"Invalid {name} '{value}': {' '.join(error.messages)}")
+
+
+def _build_request(row, student_id, subject_id, proficiency, today):
+    frequency = Frequency.to_numeric(row['frequency'])
+    if frequency is None:
+        raise ValidationError(f"Unknown frequency '{row['frequency']}'.")
+    days = [day.capitalize() for day in re.split(r'[\s,;|]+', row['days']) if day]
+    if not days:
+        raise ValidationError("No days given.")
+    unknown = [day for day in days if day not in WEEKDAYS]
+    if unknown:
+        raise ValidationError(f"Unknown days: {', '.join(unknown)}.")
+    date_requested = today
+    if row.get('date_requested'):
+        date_requested = _field_value(RequestSession, 'date_requested', row['date_requested'])
+
+    request_session = RequestSession(
+        student_id=student_id,
+        subject_id=subject_id,
+        proficiency=proficiency,
+        frequency=frequency,
+        date_requested=date_requested,
+        weekdays=weekday_mask(days),
+    )
+    # bulk_create does not call save()
+    request_session.update_schedule_window()
+    return request_session
+
+
+def _store_requests(request_sessions):
+    RequestSession.objects.bulk_create(request_sessions)
+    RequestSessionDay.objects.bulk_create([
+        RequestSessionDay(request_session_id=request_session.pk, day_of_week=day)
+        for request_session in request_sessions
+        for day in request_session.day_names
+    ])
+    recompute_activity({request_session.student_id for request_session in request_sessions})
+    # bulk_create sends no post_save signals
+    bump_generation(RequestSession, RequestSessionDay)
+
+
+def _build_tutor_subject(row, tutor_id, subject_id, proficiency, today):
+    tutor_subject = TutorSubject(tutor_id=tutor_id, subject_id=subject_id, proficiency=proficiency)
+    if row.get('price'):
+        tutor_subject.price = _field_value(TutorSubject, 'price', row['price'])
+    return tutor_subject
+
+
+def _store_tutor_subjects(tutor_subjects):
+    TutorSubject.objects.bulk_create(tutor_subjects)
+    bump_generation(TutorSubject)
+
+
+IMPORTS = {
+    'requests': Import(
+        RequestSession, 'student', 'student',
+        ('student', 'subject', 'proficiency', 'frequency', 'days'),
+        _build_request, _store_requests,
+    ),
+    'tutor_subjects': Import(
+        TutorSubject, 'tutor', 'tutor',
+        ('tutor', 'subject', 'proficiency'),
+        _build_tutor_subject, _store_tutor_subjects,
+    ),
+}
+
+
+def _validate(spec, chunk, subjects, seen, today):
+    """Return the (line, instance) pairs built from the valid rows of chunk, and the errors of the others.
+
+    The owners of the chunk and their existing subjects are loaded in one
+    query each; seen holds the (owner, subject) pairs of earlier rows.
+    """
+    owners = dict(User.objects.filter(
+        username__in={row[spec.owner] for _, row in chunk}, user_type=spec.owner_type
+    ).order_by().values_list('username', 'pk'))
+    seen.update(spec.model.objects.filter(
+        **{f'{spec.owner}__in': owners.values()}
+    ).values_list(f'{spec.owner}_id', 'subject_id'))
+
+    valid, errors = [], []
+    for line, row in chunk:
+        try:
+            owner_id = owners.get(row[spec.owner])
+            if owner_id is None:
+                raise ValidationError(f"Unknown {spec.owner_type} '{row[spec.owner]}'.")
+            subject_id = subjects.get(row['subject'].lower())
+            if subject_id is None:
+                raise ValidationError(f"Unknown subject '{row['subject']}'.")
+            proficiency = row['proficiency'].capitalize()
+            if proficiency not in PROFICIENCY_LEVELS:
+                raise ValidationError(f"Unknown proficiency '{row['proficiency']}'.")
+            if (owner_id, subject_id) in seen:
+                raise ValidationError(f"{row[spec.owner]} already has {row['subject']}.")
+            instance = spec.build(row, owner_id, subject_id, proficiency, today)
+        except ValidationError as error:
+            errors.append(RowError(line, ' '.join(error.messages)))
+            continue
+        seen.add((owner_id, subject_id))
+        valid.append((line, instance))
+    return valid, errors
+
+
+def _read_rows(reader, stopped):
+    """Yield the (line, row) pairs of reader, stopping at the first line that is not UTF-8 encoded CSV.
+
+    The rows before that line are still imported, so the line is appended
+    to stopped to be reported after them.
+    """
+    try:
+        for row in reader:
+            # Short rows are padded with None and extra values are keyed by None
+            yield reader.line_num, {key: (value or '').strip() for key, value in row.items() if key is not None}
+    except (UnicodeDecodeError, csv.Error):
+        stopped.append(RowError(
+            reader.line_num + 1, "Not a UTF-8 encoded CSV line; it and the lines after it were not imported."
+        ))
+
+
+def import_rows(name, lines, chunk_size=1000):
+    """Import the CSV lines into the named import and return an ImportReport.
+
+    Rows are read and validated chunk_size at a time against lookups loaded
+    once per import or per chunk, never per row, and each chunk's valid
+    rows are inserted with bulk_create in one transaction. A header that is
+    not UTF-8 encoded CSV raises UnicodeDecodeError or csv.Error; a later
+    such line ends the import with the rows before it kept and reported.
+    """
+    spec = IMPORTS[name]
+    reader = csv.DictReader(lines)
+    missing = [column for column in spec.columns if column not in (reader.fieldnames or ())]
+    if missing:
+        return ImportReport(0, [RowError(1, f"Missing columns: {', '.join(missing)}.")])
+
+    subjects = {subject.lower(): pk for subject, pk in Subject.objects.values_list('name', 'pk')}
+    seen = set()
+    today = now().date()
+    created, errors, stopped = 0, [], []
+    rows = _read_rows(reader, stopped)
+    while chunk := list(islice(rows, chunk_size)):
+        valid, chunk_errors = _validate(spec, chunk, subjects, seen, today)
+        errors.extend(chunk_errors)
+        if not valid:
+            continue
+        try:
+            with transaction.atomic():
+                spec.store([instance for _, instance in valid])
+        except IntegrityError:
+            errors.extend(RowError(line, "Conflicts with a row saved during the import.") for line, _ in valid)
+            continue
+        created += len(valid)
+    return ImportReport(created, errors + stopped)
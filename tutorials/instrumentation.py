@@ -0,0 +1,116 @@
+"""Per-request timing of SQL, template rendering and domain services."""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+from django.template.backends.django import DjangoTemplates
+
+_current_timings = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    """Accumulated durations and call counts of the named parts of a request."""
+
+    __slots__ = ('started', 'durations', 'counts')
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.durations = {}
+        self.counts = {}
+
+    def add(self, name, duration):
+        """Add a duration in seconds to a named part."""
+        self.durations[name] = self.durations.get(name, 0.0) + duration
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def elapsed(self):
+        """Return the seconds since the request started."""
+        return perf_counter() - self.started
+
+    def items(self):
+        """Return (name, milliseconds, count) for each timed part."""
+        return [
+            (name, duration * 1000, self.counts[name])
+            for name, duration in self.durations.items()
+        ]
+
+
+def current_timings():
+    """Return the timings of the request being handled, or None when timing is off."""
+    return _current_timings.get()
+
+
+@contextmanager
+def collect_timings():
+    """Collect timings for the code run inside the block and yield them."""
+    timings = RequestTimings()
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+@contextmanager
+def timing(name):
+    """Time the block under name when the current request is being timed."""
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, perf_counter() - start)
+
+
+def timed(name):
+    """Decorator timing each call of a function under name when the current request is being timed."""
+
+    def decorator(function):
+        @wraps(function)
+        def timed_function(*args, **kwargs):
+            timings = _current_timings.get()
+            if timings is None:
+                return function(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                timings.add(name, perf_counter() - start)
+        return timed_function
+    return decorator
+
+
+def time_query(execute, sql, params, many, context):
+    """Database execute wrapper adding each query to the current timings."""
+    with timing('db'):
+        return execute(sql, params, many, context)
+
+
+class TimedTemplate:
+    """Wrapper around a backend template which times top level renders."""
+
+    __slots__ = ('template',)
+
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        with timing('template'):
+            return self.template.render(context, request)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Django template backend whose templates report their render time."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
@@ -0,0 +1,116 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+# (name, backend, location relative to the scratch directory or None)
+BACKENDS = (
+    ('locmem', 'django.core.cache.backends.locmem.LocMemCache', None),
+    ('filebased', 'django.core.cache.backends.filebased.FileBasedCache', 'filebased'),
+    ('sqlite', 'tutorials.shared_cache.SQLiteCache', 'cache.sqlite3'),
+)
+
+def open_cache(backend, location, max_entries):
+    return import_string(backend)(location or 'benchmark', {'OPTIONS': {'MAX_ENTRIES': max_entries}})
+
+def share_worker(backend, location, max_entries, number, keys, increments, ready, results):
+    """Read the keys set by the parent and increment the shared counter from another process."""
+    cache = open_cache(backend, location, max_entries)
+    ready.wait()
+    hits = sum(1 for key in keys if cache.get(key) is not None)
+    for _ in range(increments):
+        try:
+            cache.incr('counter')
+        except ValueError:
+            # A cache this process cannot see the counter in
+            cache.set('counter', 1)
+    results.put((number, hits))
+
+class Command(BaseCommand):
+    """Build automation command comparing the shared SQLite cache with Django's local memory and file caches."""
+
+    help = 'Times cache operations and checks hits and increments across worker processes for each backend'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--operations', type=int, default=2000, help='Operations timed per kind')
+        parser.add_argument('--processes', type=int, default=4, help='Worker processes sharing the cache')
+        parser.add_argument('--increments', type=int, default=200, help='Counter increments per worker process')
+        parser.add_argument('--max-entries', type=int, default=10000, help='MAX_ENTRIES of each cache')
+
+    def handle(self, *args, **options):
+        """Run the same workload against a fresh cache of each backend."""
+
+        directory = tempfile.mkdtemp(prefix='benchmark_cache_')
+        try:
+            for name, backend, location in BACKENDS:
+                path = os.path.join(directory, location) if location else None
+                timings = self.time_operations(backend, path, options)
+                hit_ratio, counter, expected = self.share(backend, path, options)
+                self.stdout.write(
+                    f"{name:<10} " + ' '.join(f"{kind}={seconds * 1e6:7.1f}us" for kind, seconds in timings.items())
+                    + f" cross-process hits={hit_ratio:6.1%} counter={counter}/{expected}"
+                )
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def time_operations(self, backend, location, options):
+        """Return the mean seconds per set, hit, miss and incr."""
+        cache = open_cache(backend, location, options['max_entries'])
+        operations = options['operations']
+        value = {'rows': list(range(50)), 'title': 'cached page ' * 20}
+        timings = {}
+
+        start = perf_counter()
+        for index in range(operations):
+            cache.set(f'key:{index}', value)
+        timings['set'] = (perf_counter() - start) / operations
+
+        start = perf_counter()
+        for index in range(operations):
+            cache.get(f'key:{index}')
+        timings['hit'] = (perf_counter() - start) / operations
+
+        start = perf_counter()
+        for index in range(operations):
+            cache.get(f'missing:{index}')
+        timings['miss'] = (perf_counter() - start) / operations
+
+        cache.set('generation', 1)
+        start = perf_counter()
+        for _ in range(operations):
+            cache.incr('generation')
+        timings['incr'] = (perf_counter() - start) / operations
+        return timings
+
+    def share(self, backend, location, options):
+        """Return the share of the parent's keys other processes see, and the final and expected counter."""
+        cache = open_cache(backend, location, options['max_entries'])
+        cache.clear()
+        keys = [f'shared:{index}' for index in range(100)]
+
+        # Workers fork before the cache is filled, as web server workers do
+        context = multiprocessing.get_context('fork')
+        ready = context.Event()
+        results = context.Queue()
+        workers = [
+            context.Process(
+                target=share_worker,
+                args=(backend, location, options['max_entries'], number, keys, options['increments'], ready, results),
+            )
+            for number in range(options['processes'])
+        ]
+        for worker in workers:
+            worker.start()
+        cache.set_many({key: index for index, key in enumerate(keys)})
+        cache.set('counter', 0)
+        ready.set()
+        hits = sum(results.get()[1] for _ in workers)
+        for worker in workers:
+            worker.join()
+
+        expected = options['processes'] * options['increments']
+        return hits / (len(keys) * len(workers)), cache.get('counter'), expected
@@ -0,0 +1,75 @@
+import gc
+import tracemalloc
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext
+
+from tutorials.models import Frequency, Match
+from tutorials.read_models import match_rows
+
+def model_dicts(matches):
+    """Build the matched request rows from model instances, as the views used to."""
+    return [
+        {
+            'id': match.id,
+            'tutor': match.tutor.username,
+            'student': match.request_session.student.username,
+            'subject': match.request_session.subject.name,
+            'proficiency': match.request_session.proficiency,
+            'date_requested': match.request_session.date_requested,
+            'frequency': Frequency.to_string(match.request_session.frequency),
+            'days': match.request_session.day_names,
+        }
+        for match in matches
+    ]
+
+# (name, function building the rows from the matches queryset)
+STRATEGIES = (
+    ('models', model_dicts),
+    ('select_related', lambda matches: model_dicts(
+        matches.select_related('tutor', 'request_session__student', 'request_session__subject')
+    )),
+    ('read models', match_rows),
+)
+
+class Command(BaseCommand):
+    """Build automation command comparing the cost of building listing rows from models and from read models."""
+
+    help = 'Times and measures the memory of building every matched request row with each strategy'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=5, help='Timed builds per strategy')
+
+    def handle(self, *args, **options):
+        """Build the rows of all matches with each strategy and report time, queries and peak memory."""
+
+        matches = Match.objects.all()
+        count = matches.count()
+        if not count:
+            raise CommandError("No matches; run the seed command first.")
+        self.stdout.write(f"{count} matches, {options['iterations']} iterations")
+
+        for name, build in STRATEGIES:
+            timings = []
+            for _ in range(options['iterations']):
+                start = perf_counter()
+                build(matches.all())
+                timings.append(perf_counter() - start)
+
+            reset_queries()
+            with CaptureQueriesContext(connection) as queries:
+                build(matches.all())
+
+            gc.collect()
+            tracemalloc.start()
+            rows = build(matches.all())
+            retained, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del rows
+
+            self.stdout.write(
+                f"{name:<15} best={min(timings) * 1000:8.1f}ms queries={len(queries):5} "
+                f"peak={peak / 1024:8.1f}KiB retained={retained / 1024:8.1f}KiB"
+            )
@@ -0,0 +1,130 @@
+import os
+import random
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from time import perf_counter
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+
+from tutorials.models import RequestSession, Subject, User
+
+# Database alias -> whether it uses the SQLite profile
+PROFILES = {
+    'sqlite_default': False,
+    'sqlite_profile': True,
+}
+
+class Command(BaseCommand):
+    """Build automation command comparing concurrent SQLite throughput with and without the connection profile."""
+
+    help = 'Runs concurrent reads and request submissions against fresh copies of the tutorials schema'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent workers')
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds each profile runs for')
+        parser.add_argument('--write-ratio', type=float, default=0.3, help='Share of operations that write')
+        parser.add_argument('--students', type=int, default=50, help='Students created in the schema')
+
+    def handle(self, *args, **options):
+        """Build a seeded schema once, then run the same workload on a copy per profile."""
+
+        directory = tempfile.mkdtemp(prefix='benchmark_sqlite_')
+        try:
+            template = os.path.join(directory, 'template.sqlite3')
+            self.register('sqlite_template', template, profile=False)
+            self.stdout.write("Migrating a fresh schema...")
+            call_command('migrate', database='sqlite_template', verbosity=0)
+            self.seed('sqlite_template', options['students'])
+            connections['sqlite_template'].close()
+
+            for alias, profile in PROFILES.items():
+                path = os.path.join(directory, f'{alias}.sqlite3')
+                shutil.copyfile(template, path)
+                self.register(alias, path, profile)
+                operations, errors, elapsed = self.run_workload(alias, options)
+                self.stdout.write(
+                    f"{alias:<15} {operations / elapsed:8.1f} ops/s "
+                    f"{operations} operations, {errors} 'database is locked' errors"
+                )
+        finally:
+            for alias in ('sqlite_template', *PROFILES):
+                if alias in connections.settings:
+                    connections[alias].close()
+                    del connections.settings[alias]
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def register(self, alias, path, profile):
+        """Add a SQLite connection alias for path, with or without the profile."""
+        database = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': path, 'SQLITE_PROFILE': profile}
+        if profile:
+            database['OPTIONS'] = {'transaction_mode': 'IMMEDIATE'}
+        connections.settings[alias] = connections.configure_settings({
+            DEFAULT_DB_ALIAS: connections.settings[DEFAULT_DB_ALIAS],
+            alias: database,
+        })[alias]
+
+    def seed(self, alias, students):
+        """Create the students and subjects used by the workload."""
+        User.objects.using(alias).bulk_create([
+            User(username=f'@student{index}', email=f'student{index}@example.org', user_type='student')
+            for index in range(students)
+        ])
+        Subject.objects.using(alias).bulk_create([Subject(name=f'Subject {index}') for index in range(10)])
+
+    def run_workload(self, alias, options):
+        """Run the workers against alias and return (operations, lock errors, seconds)."""
+        student_ids = list(User.objects.using(alias).values_list('pk', flat=True))
+        subject_ids = list(Subject.objects.using(alias).values_list('pk', flat=True))
+        stop = threading.Event()
+
+        def worker(number):
+            generator = random.Random(number)
+            operations = errors = 0
+            try:
+                while not stop.is_set():
+                    try:
+                        if generator.random() < options['write_ratio']:
+                            self.submit_request(alias, generator.choice(student_ids), generator.choice(subject_ids))
+                        else:
+                            self.read_requests(alias, generator.choice(student_ids))
+                        operations += 1
+                    except OperationalError as error:
+                        if 'locked' not in str(error):
+                            raise
+                        errors += 1
+            finally:
+                connections[alias].close()
+            return operations, errors
+
+        with ThreadPoolExecutor(max_workers=options['threads']) as executor:
+            started = perf_counter()
+            futures = [executor.submit(worker, number) for number in range(options['threads'])]
+            stop.wait(options['duration'])
+            stop.set()
+            results = [future.result() for future in futures]
+            elapsed = perf_counter() - started
+        return sum(result[0] for result in results), sum(result[1] for result in results), elapsed
+
+    def read_requests(self, alias, student_id):
+        """Read a student's requests as the dashboard and request list do."""
+        sessions = RequestSession.objects.using(alias).filter(student_id=student_id)
+        sessions.count()
+        list(sessions.select_related('subject')[:20])
+
+    def submit_request(self, alias, student_id, subject_id):
+        """Replace a student's request for a subject, reading before writing as the request views do."""
+        with transaction.atomic(using=alias):
+            RequestSession.objects.using(alias).filter(student_id=student_id, subject_id=subject_id).delete()
+            request_session = RequestSession.objects.using(alias).create(
+                student_id=student_id,
+                subject_id=subject_id,
+                frequency=1.0,
+                proficiency='Beginner',
+                date_requested=date.today(),
+            )
+            request_session.set_days(['Monday'])
@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from statistics import mean, median
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+from django.urls import reverse
+
+from tutorials.middleware import QueryCounter
+from tutorials.models import User
+
+# (name, user type, URL name)
+HOT_VIEWS = (
+    ('student dashboard', 'student', 'dashboard'),
+    ('tutor dashboard', 'tutor', 'dashboard'),
+    ('admin dashboard', 'admin', 'dashboard'),
+    ('calendar', 'admin', 'calendar_view'),
+    ('matched requests', 'admin', 'view_matched_requests'),
+    ('requested sessions', 'admin', 'admin_requested_sessions'),
+    ('pending approvals', 'tutor', 'pending_approvals'),
+    ('unmatched requests', 'student', 'student_view_unmatched_requests'),
+)
+
+class Command(BaseCommand):
+    """Build automation command to time the most used pages against the configured database."""
+
+    help = 'Times the hot views against the configured database; run once per DATABASE_URL to compare backends'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per view and thread')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per view and thread')
+        parser.add_argument('--threads', type=int, default=1, help='Clients requesting each view concurrently')
+        parser.add_argument('--host', default='localhost', help='Host header, which must be in ALLOWED_HOSTS')
+
+    def handle(self, *args, **options):
+        """Request each hot view as a user of the right type and report latency, queries and throughput."""
+
+        users = {}
+        for user_type in {user_type for _, user_type, _ in HOT_VIEWS}:
+            users[user_type] = User.objects.filter(user_type=user_type).order_by('pk').first()
+            if users[user_type] is None:
+                raise CommandError(f"No {user_type} users; run the seed command first.")
+
+        self.stdout.write(
+            f"{connection.vendor} {connection.settings_dict['NAME']} "
+            f"sessions={settings.SESSION_ENGINE.rsplit('.', 1)[-1]} "
+            f"threads={options['threads']} iterations={options['iterations']}"
+        )
+        for name, user_type, url_name in HOT_VIEWS:
+            url = reverse(url_name)
+            with ThreadPoolExecutor(max_workers=options['threads']) as executor:
+                started = perf_counter()
+                results = list(executor.map(
+                    lambda _: self.run_client(users[user_type], url, options),
+                    range(options['threads']),
+                ))
+                elapsed = perf_counter() - started
+
+            timings = sorted(timing for thread_timings, _, _ in results for timing in thread_timings)
+            queries = sum(thread_queries for _, thread_queries, _ in results)
+            statuses = set().union(*(thread_statuses for _, _, thread_statuses in results))
+            self.stdout.write(
+                f"{name:<20} median={median(timings) * 1000:7.1f}ms "
+                f"p95={timings[int(len(timings) * 0.95) - 1] * 1000:7.1f}ms "
+                f"mean={mean(timings) * 1000:7.1f}ms "
+                f"queries={queries / len(timings):5.1f} "
+                f"throughput={len(timings) / elapsed:7.1f}/s "
+                f"status={','.join(str(status) for status in sorted(statuses))}"
+            )
+
+    def run_client(self, user, url, options):
+        """Log in a client and time its requests to url; return (timings, queries, statuses)."""
+        client = Client(HTTP_HOST=options['host'])
+        client.force_login(user)
+        for _ in range(options['warmup']):
+            client.get(url)
+
+        timings = []
+        statuses = set()
+        counter = QueryCounter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(counter))
+                for _ in range(options['iterations']):
+                    start = perf_counter()
+                    response = client.get(url)
+                    timings.append(perf_counter() - start)
+                    statuses.add(response.status_code)
+        finally:
+            # Worker threads open their own connections
+            connections.close_all()
+        return timings, counter.count, statuses
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import connections, router, transaction
+from django.db.models import Min
+
+from tutorials.models import RequestSessionDay
+
+class Command(BaseCommand):
+    """Build automation command to remove duplicate request session days."""
+
+    help = 'Removes duplicate RequestSessionDay rows in bulk, keeping the oldest of each'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report how many rows would be removed without deleting them',
+        )
+
+    def handle(self, *args, **options):
+        """Delete every day row that repeats an earlier (request_session, day_of_week) pair."""
+
+        keep = RequestSessionDay.objects.values('request_session_id', 'day_of_week').annotate(
+            keep_id=Min('id')
+        ).values('keep_id')
+        duplicates = RequestSessionDay.objects.exclude(id__in=keep)
+
+        if options['dry_run']:
+            self.stdout.write(f"{duplicates.count()} duplicate day rows found.")
+            return
+
+        # Duplicates never change a session's weekday bitmask, so the rows are removed
+        # with a single DELETE instead of one post_delete signal per row
+        connection = connections[router.db_for_write(RequestSessionDay)]
+        table = connection.ops.quote_name(RequestSessionDay._meta.db_table)
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {table} WHERE id NOT IN ('
+                f'SELECT MIN(id) FROM {table} GROUP BY request_session_id, day_of_week)'
+            )
+            removed = cursor.rowcount
+        self.stdout.write(f"Removed {removed} duplicate day rows.")
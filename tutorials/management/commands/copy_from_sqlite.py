@@ -0,0 +1,116 @@
+import os
+from pathlib import Path
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+SOURCE_ALIAS = 'sqlite_source'
+
+class Command(BaseCommand):
+    """Build automation command to copy the tutorials data of a SQLite file into another database."""
+
+    help = 'Streams every tutorials table from a SQLite file into a migrated, empty database in batches, keeping IDs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('sqlite_path', help='SQLite database file to copy from')
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Database to copy into, which must already be migrated',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rows read and inserted at a time',
+        )
+
+    def handle(self, *args, **options):
+        """Copy each model's rows, parents before children, then reset the target's ID sequences."""
+
+        target = options['database']
+        batch_size = options['batch_size']
+        self.open_source(options['sqlite_path'])
+
+        try:
+            models = self.models_in_dependency_order()
+            for model in models:
+                if model._base_manager.using(target).exists():
+                    raise CommandError(f"{model._meta.db_table} already has rows in '{target}'.")
+
+            with transaction.atomic(using=target):
+                for model in models:
+                    copied = self.copy_model(model, target, batch_size)
+                    self.stdout.write(f"Copied {copied} rows into {model._meta.db_table}.")
+                self.reset_sequences(models, target)
+        finally:
+            connections[SOURCE_ALIAS].close()
+            del connections[SOURCE_ALIAS]
+            del connections.settings[SOURCE_ALIAS]
+
+    def open_source(self, sqlite_path):
+        """Register the SQLite file as a temporary, read-only database connection.
+
+        The SQLite profile is not applied, as its journal mode would be
+        written into the file being copied.
+        """
+        if not os.path.isfile(sqlite_path):
+            raise CommandError(f"No SQLite database at {sqlite_path}.")
+        connections.settings[SOURCE_ALIAS] = connections.configure_settings({
+            DEFAULT_DB_ALIAS: connections.settings[DEFAULT_DB_ALIAS],
+            SOURCE_ALIAS: {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': f'{Path(sqlite_path).resolve().as_uri()}?mode=ro',
+                'OPTIONS': {'uri': True},
+                'SQLITE_PROFILE': False,
+            },
+        })[SOURCE_ALIAS]
+
+    def models_in_dependency_order(self):
+        """Return the tutorials models, each after the models it references.
+
+        Group and permission memberships belong to django.contrib.auth, whose
+        permission IDs differ between databases, so they are not copied.
+        """
+        pending = list(apps.get_app_config('tutorials').get_models())
+        ordered = []
+        while pending:
+            for model in pending:
+                references = {
+                    field.related_model for field in model._meta.concrete_fields
+                    if field.is_relation and field.related_model in pending and field.related_model is not model
+                }
+                if not references:
+                    ordered.append(model)
+                    pending.remove(model)
+                    break
+            else:
+                raise CommandError("Circular foreign keys between tutorials models.")
+        return ordered
+
+    def copy_model(self, model, target, batch_size):
+        """Copy one model's rows in primary key order, batch by batch."""
+        rows = model._base_manager.using(SOURCE_ALIAS).order_by('pk').iterator(chunk_size=batch_size)
+        copied = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == batch_size:
+                model._base_manager.using(target).bulk_create(batch)
+                copied += len(batch)
+                batch = []
+        if batch:
+            model._base_manager.using(target).bulk_create(batch)
+            copied += len(batch)
+        return copied
+
+    def reset_sequences(self, models, target):
+        """Move the target's ID sequences past the copied IDs."""
+        connection = connections[target]
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
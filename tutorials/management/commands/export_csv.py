@@ -0,0 +1,33 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from tutorials.exports import EXPORTS, csv_lines, export_rows
+
+class Command(BaseCommand):
+    """Build automation command to dump an admin listing as CSV, for scheduled exports."""
+
+    help = 'Streams users, matches, requests or invoices as CSV to a file or standard output'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', choices=sorted(EXPORTS), help='Listing to export')
+        parser.add_argument('--search', default='', help='Search filter of the listing')
+        parser.add_argument('--tutor', type=int, help='Tutor ID whose invoices are exported')
+        parser.add_argument('--output', help='File to write instead of standard output')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows fetched from the database at a time')
+
+    def handle(self, *args, **options):
+        """Write the export line by line, so the whole table is never held in memory."""
+
+        rows = export_rows(
+            options['name'],
+            search_query=options['search'].lower(),
+            tutor=options['tutor'],
+            chunk_size=options['chunk_size'],
+        )
+        if options['output']:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as output:
+                output.writelines(csv_lines(rows))
+        else:
+            for line in csv_lines(rows):
+                self.stdout.write(line, ending='')
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from tutorials.imports import IMPORTS, import_rows
+
+class Command(BaseCommand):
+    """Build automation command to bulk import student requests or tutor subjects from a CSV file."""
+
+    help = 'Validates and imports the rows of a CSV file, reporting each rejected row'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', choices=sorted(IMPORTS), help='What the file holds')
+        parser.add_argument('path', help='CSV file with a header row')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows validated and inserted at a time')
+
+    def handle(self, *args, **options):
+        """Import the file and print the rejected rows and the totals."""
+
+        with open(options['path'], newline='', encoding='utf-8-sig') as lines:
+            report = import_rows(options['name'], lines, chunk_size=options['chunk_size'])
+        for error in report.errors:
+            self.stderr.write(f"Line {error.line}: {error.message}")
+        self.stdout.write(f"Imported {report.created} rows, rejected {len(report.errors)}.")
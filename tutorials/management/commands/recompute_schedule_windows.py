@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tutorials.generations import bump_generation
+from tutorials.models import RequestSession
+
+class Command(BaseCommand):
+    """Build automation command to recompute the schedule windows of request sessions."""
+
+    help = 'Recomputes every request\'s schedule_start and schedule_end from the current ACADEMIC_TERMS'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of requests read and updated at a time',
+        )
+
+    def handle(self, *args, **options):
+        """Update the requests whose stored window differs from the one the current terms give."""
+
+        batch_size = options['batch_size']
+        sessions = RequestSession.objects.only('id', 'date_requested', 'schedule_start', 'schedule_end')
+        changed = []
+        updated = 0
+        with transaction.atomic():
+            for session in sessions.order_by('pk').iterator(chunk_size=batch_size):
+                window = (session.schedule_start, session.schedule_end)
+                session.update_schedule_window()
+                if (session.schedule_start, session.schedule_end) != window:
+                    changed.append(session)
+                if len(changed) == batch_size:
+                    RequestSession.objects.bulk_update(changed, ['schedule_start', 'schedule_end'])
+                    updated += len(changed)
+                    changed = []
+            if changed:
+                RequestSession.objects.bulk_update(changed, ['schedule_start', 'schedule_end'])
+                updated += len(changed)
+            if updated:
+                # bulk_update sends no post_save signals
+                bump_generation(RequestSession)
+        self.stdout.write(f"Recomputed the schedule windows of {updated} requests.")
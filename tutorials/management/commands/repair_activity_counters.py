@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tutorials.activity import recompute_activity
+
+class Command(BaseCommand):
+    """Build automation command to rebuild the per-user activity counters."""
+
+    help = 'Recounts every user\'s open requests, pending approvals and active matches in bulk'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of activity rows written per query',
+        )
+
+    def handle(self, *args, **options):
+        """Recompute the counters of all users from the request and match tables."""
+
+        with transaction.atomic():
+            repaired = recompute_activity(batch_size=options['batch_size'])
+        self.stdout.write(f"Recounted activity for {repaired} users.")
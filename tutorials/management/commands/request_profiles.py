@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tutorials.profiling import list_profiles, load_collapsed, load_stats, profile_token
+
+class Command(BaseCommand):
+    """Build automation command to inspect stored request profiles."""
+
+    help = 'Lists stored request profiles, or prints one as collapsed stacks for flame graph tools'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'profile_id',
+            nargs='?',
+            help='Profile to print as collapsed stacks',
+        )
+        parser.add_argument(
+            '--stats',
+            type=int,
+            metavar='N',
+            help='Print the N functions with the most cumulative time instead of collapsed stacks',
+        )
+        parser.add_argument(
+            '--token',
+            action='store_true',
+            help='Print a signed value for the profile query parameter',
+        )
+
+    def handle(self, *args, **options):
+        """List profiles, or print the requested profile."""
+
+        if options['token']:
+            self.stdout.write(profile_token())
+            return
+
+        profile_id = options['profile_id']
+        if profile_id is None:
+            profiles = list_profiles()
+            if not profiles:
+                self.stdout.write("No profiles stored.")
+            for profile in profiles:
+                self.stdout.write(
+                    f"{profile['id']} {profile['mode']} {profile['method']} {profile['path']} "
+                    f"view={profile['view']} status={profile['status']} {profile['duration_ms']}ms"
+                )
+            return
+
+        try:
+            if options['stats']:
+                load_stats(profile_id, stream=self.stdout).sort_stats('cumulative').print_stats(options['stats'])
+            else:
+                self.stdout.write('\n'.join(load_collapsed(profile_id)))
+        except FileNotFoundError as error:
+            raise CommandError(str(error))
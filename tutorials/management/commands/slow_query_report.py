@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tutorials.query_log import aggregate_entries, read_entries
+
+class Command(BaseCommand):
+    """Build automation command to summarise the slow query log."""
+
+    help = 'Ranks the query fingerprints in the slow query log by total time'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--file',
+            default=str(settings.SLOW_QUERY_LOG_FILE),
+            help='Slow query log to read, rotated backups included',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=10,
+            help='Number of fingerprints to report',
+        )
+
+    def handle(self, *args, **options):
+        """Print the worst fingerprints with their counts, views and calling code."""
+
+        report = aggregate_entries(read_entries(options['file']))
+        if not report:
+            self.stdout.write("No slow or repeated queries logged.")
+            return
+
+        for rank, row in enumerate(report[:options['limit']], start=1):
+            self.stdout.write(
+                f"{rank}. {row['fingerprint']} total={row['total_ms']:.1f}ms queries={row['queries']} "
+                f"slow={row['slow']} repeated_in_requests={row['duplicate_requests']}"
+            )
+            self.stdout.write(f"   {row['sql']}")
+            for view, count in sorted(row['views'].items(), key=lambda item: item[1], reverse=True):
+                self.stdout.write(f"   view {view}: {count} queries")
+            for frame, count in sorted(row['frames'].items(), key=lambda item: item[1], reverse=True)[:3]:
+                self.stdout.write(f"   at {frame}")
@@ -0,0 +1,281 @@
+"""Process-local metrics shared between workers through per-process files and exposed in Prometheus text format."""
+import json
+import os
+import tempfile
+import threading
+from functools import wraps
+from time import monotonic, perf_counter
+
+from django.conf import settings
+
+from tutorials.recurrence import occurrence_cache_info
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+COUNTER = 'counter'
+HISTOGRAM = 'histogram'
+
+
+def _label_key(labelnames, labels):
+    """Return the stored key of a label set."""
+    return json.dumps([str(labels[name]) for name in labelnames])
+
+
+class Metric:
+    """Base for a named metric with labelled values."""
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def snapshot(self):
+        """Return a copy of the values, safe to serialise."""
+        with self.lock:
+            return {key: list(value) if isinstance(value, list) else value for key, value in self.values.items()}
+
+
+class Counter(Metric):
+    """Monotonically increasing total."""
+
+    kind = COUNTER
+
+    def inc(self, amount=1, **labels):
+        """Add amount to the total for the labels."""
+        key = _label_key(self.labelnames, labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def set_total(self, value, **labels):
+        """Replace the total for the labels with a process-wide running total kept elsewhere."""
+        key = _label_key(self.labelnames, labels)
+        with self.lock:
+            self.values[key] = value
+
+
+class Histogram(Metric):
+    """Distribution of observations over fixed upper bounds."""
+
+    kind = HISTOGRAM
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        """Record one observation for the labels."""
+        key = _label_key(self.labelnames, labels)
+        with self.lock:
+            # Per bucket counts, then the sum and the number of observations
+            counts = self.values.get(key)
+            if counts is None:
+                counts = self.values[key] = [0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            counts[-2] += value
+            counts[-1] += 1
+
+    def time(self, **labels):
+        """Decorator observing the duration of each call in seconds."""
+
+        def decorator(function):
+            @wraps(function)
+            def timed_function(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.observe(perf_counter() - start, **labels)
+            return timed_function
+        return decorator
+
+
+class Registry:
+    """Metrics of this process, written to a per-process file for aggregation across workers."""
+
+    def __init__(self):
+        self.metrics = {}
+        self.collectors = []
+        self.last_flush = monotonic()
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def collector(self, function):
+        """Register a function called before each flush to update metrics kept elsewhere."""
+        self.collectors.append(function)
+        return function
+
+    def snapshot(self):
+        """Return this process's metrics as plain data."""
+        for collect in self.collectors:
+            collect()
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+    def flush(self, directory=None):
+        """Atomically write this process's metrics to its file in the metrics directory."""
+        directory = directory or metrics_dir()
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(descriptor, 'w') as output:
+            json.dump(self.snapshot(), output)
+        os.replace(temporary, os.path.join(directory, f'{os.getpid()}.json'))
+        self.last_flush = monotonic()
+
+    def maybe_flush(self):
+        """Flush when METRICS_FLUSH_INTERVAL seconds have passed since the last flush."""
+        if monotonic() - self.last_flush >= getattr(settings, 'METRICS_FLUSH_INTERVAL', 5):
+            self.flush()
+
+    def aggregate(self, directory=None):
+        """Return the sum of the metrics of every live process that has flushed to the directory.
+
+        Files of processes that have exited are deleted, so restarted workers'
+        counters are not added up forever. The directory must therefore be
+        local to the host, as process IDs are.
+        """
+        directory = directory or metrics_dir()
+        totals = {name: {} for name in self.metrics}
+        if not os.path.isdir(directory):
+            return totals
+        for filename in os.listdir(directory):
+            if not filename.endswith('.json'):
+                continue
+            if not _process_exists(filename[:-len('.json')]):
+                try:
+                    os.remove(os.path.join(directory, filename))
+                except FileNotFoundError:
+                    pass
+                continue
+            try:
+                with open(os.path.join(directory, filename)) as source:
+                    process = json.load(source)
+            except (OSError, ValueError):
+                continue
+            for name, values in process.items():
+                if name not in totals:
+                    continue
+                merged = totals[name]
+                for key, value in values.items():
+                    if isinstance(value, list):
+                        current = merged.setdefault(key, [0] * len(value))
+                        merged[key] = [left + right for left, right in zip(current, value)]
+                    else:
+                        merged[key] = merged.get(key, 0) + value
+        return totals
+
+    def exposition(self, directory=None):
+        """Return the aggregated metrics in Prometheus text exposition format."""
+        totals = self.aggregate(directory)
+        lines = []
+        for name, metric in sorted(self.metrics.items()):
+            lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric.kind}')
+            for key, value in sorted(totals[name].items()):
+                labels = list(zip(metric.labelnames, json.loads(key)))
+                if metric.kind == HISTOGRAM:
+                    cumulative = 0
+                    for bound, count in zip(metric.buckets, value):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{_format_labels(labels + [("le", _number(bound))])} {cumulative}')
+                    lines.append(f'{name}_bucket{_format_labels(labels + [("le", "+Inf")])} {value[-1]}')
+                    lines.append(f'{name}_sum{_format_labels(labels)} {_number(value[-2])}')
+                    lines.append(f'{name}_count{_format_labels(labels)} {value[-1]}')
+                else:
+                    lines.append(f'{name}{_format_labels(labels)} {_number(value)}')
+        lines.extend(_derived_ratios(totals))
+        return '\n'.join(lines) + '\n'
+
+
+def _process_exists(name):
+    """Return whether the process named by a metrics file, its PID, is still running."""
+    try:
+        pid = int(name)
+    except ValueError:
+        return True
+    if pid <= 0:
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Running as another user
+        return True
+    return True
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _derived_ratios(totals):
+    """Return gauge lines for the hit ratio of each cache counted in cache_requests_total."""
+    by_cache = {}
+    for key, value in totals.get('cache_requests_total', {}).items():
+        cache, result = json.loads(key)
+        by_cache.setdefault(cache, {})[result] = value
+    lines = ['# HELP cache_hit_ratio Share of cache lookups answered from the cache', '# TYPE cache_hit_ratio gauge']
+    for cache, results in sorted(by_cache.items()):
+        lookups = results.get('hit', 0) + results.get('miss', 0)
+        ratio = results.get('hit', 0) / lookups if lookups else 0.0
+        lines.append(f'cache_hit_ratio{_format_labels([("cache", cache)])} {ratio!r}')
+    return lines
+
+
+def metrics_dir():
+    """Return the directory shared by the worker processes."""
+    return str(getattr(settings, 'METRICS_DIR', os.path.join(settings.BASE_DIR, 'metrics')))
+
+
+REGISTRY = Registry()
+
+REQUEST_LATENCY = REGISTRY.histogram(
+    'http_request_duration_seconds', 'Time to handle a request by URL name', ['view']
+)
+REQUEST_QUERIES = REGISTRY.histogram(
+    'http_request_db_queries', 'Database queries issued per request by URL name', ['view'], QUERY_COUNT_BUCKETS
+)
+PDF_RENDER_SECONDS = REGISTRY.histogram(
+    'invoice_pdf_render_seconds', 'Time to render an invoice PDF'
+)
+CALENDAR_EXPANSIONS = REGISTRY.counter(
+    'calendar_expansions_total', 'Month expansions of session schedules by whether they were cached', ['result']
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    'cache_requests_total', 'Cache lookups by cache and result', ['cache', 'result']
+)
+
+
+@REGISTRY.collector
+def collect_recurrence_cache():
+    """Copy the shared schedule expansion cache statistics of this process."""
+    info = occurrence_cache_info()
+    CALENDAR_EXPANSIONS.set_total(info.hits, result='hit')
+    CALENDAR_EXPANSIONS.set_total(info.misses, result='miss')
+    CACHE_REQUESTS.set_total(info.hits, cache='recurrence', result='hit')
+    CACHE_REQUESTS.set_total(info.misses, cache='recurrence', result='miss')
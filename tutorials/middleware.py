@@ -0,0 +1,228 @@
+"""Request middleware for performance diagnostics."""
+import cProfile
+import logging
+from contextlib import ExitStack
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from tutorials.instrumentation import collect_timings, time_query
+from tutorials.metrics import REGISTRY, REQUEST_LATENCY, REQUEST_QUERIES
+from tutorials.profiling import SAMPLING, SamplingProfiler, save_profile, valid_profile_token
+from tutorials.query_log import QueryRecorder, write_entries
+from tutorials.routers import mark_sticky, replica_alias, routing_state
+from tutorials.tracing import end_trace, start_trace
+
+logger = logging.getLogger('tutorials.performance')
+
+
+class ServerTimingMiddleware:
+    """Report SQL, template and service timings as Server-Timing headers and log lines.
+
+    Only installed when settings.SERVER_TIMING is true, so it costs nothing when off.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SERVER_TIMING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with collect_timings() as timings, ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(time_query))
+            response = self.get_response(request)
+            total = timings.elapsed() * 1000
+
+        parts = timings.items()
+        metrics = [f'{name};dur={duration:.1f};desc="{count}"' for name, duration, count in parts]
+        metrics.append(f'total;dur={total:.1f}')
+        response['Server-Timing'] = ', '.join(metrics)
+
+        logger.info(
+            '%s %s %s total=%.1fms %s',
+            request.method,
+            request.path,
+            response.status_code,
+            total,
+            ' '.join(f'{name}={duration:.1f}ms/{count}' for name, duration, count in parts),
+            extra={
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'total_ms': round(total, 1),
+                'timings': {name: {'ms': round(duration, 1), 'count': count} for name, duration, count in parts},
+            },
+        )
+        return response
+
+
+class SlowQueryLogMiddleware:
+    """Log slow queries and repeated query fingerprints of each request to the slow query log.
+
+    Only installed when settings.SLOW_QUERY_LOG is true.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SLOW_QUERY_LOG', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.threshold = getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 100)
+        self.duplicate_threshold = getattr(settings, 'SLOW_QUERY_DUPLICATE_THRESHOLD', 3)
+
+    def __call__(self, request):
+        recorder = QueryRecorder(self.threshold)
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        entries = recorder.entries(self.duplicate_threshold)
+        if entries:
+            match = request.resolver_match
+            write_entries(entries, match.view_name if match else None, request.path)
+        return response
+
+
+class RequestProfilerMiddleware:
+    """Profile requests carrying a profile query parameter and store the profile on disk.
+
+    The parameter is honoured for staff and admin users, or for anyone when its
+    value is a signed token from profile_token(). Only installed when
+    settings.REQUEST_PROFILING is true.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_PROFILING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.mode = getattr(settings, 'REQUEST_PROFILER', 'cprofile')
+        self.interval = getattr(settings, 'REQUEST_PROFILER_INTERVAL', 0.005)
+
+    def should_profile(self, request):
+        """Return whether the request asked for profiling and may have it."""
+        value = request.GET.get('profile')
+        if value is None:
+            return False
+        user = getattr(request, 'user', None)
+        if user is not None and (user.is_staff or getattr(user, 'is_admin', False)):
+            return True
+        return valid_profile_token(value)
+
+    def __call__(self, request):
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        profiler = SamplingProfiler(self.interval) if self.mode == SAMPLING else cProfile.Profile()
+        start = perf_counter()
+        with profiler:
+            response = self.get_response(request)
+        duration = (perf_counter() - start) * 1000
+
+        match = request.resolver_match
+        profile_id = save_profile(profiler, {
+            'method': request.method,
+            'path': request.get_full_path(),
+            'view': match.view_name if match else None,
+            'user': request.user.pk if getattr(request, 'user', None) is not None else None,
+            'status': response.status_code,
+            'duration_ms': round(duration, 1),
+        })
+        response['X-Profile-Id'] = profile_id
+        return response
+
+
+class QueryCounter:
+    """Database execute wrapper counting the queries of one request."""
+
+    __slots__ = ('count',)
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    """Record request latency and query counts by URL name for the metrics endpoint.
+
+    Only installed when settings.METRICS is true.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = QueryCounter()
+        start = perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(queries))
+            response = self.get_response(request)
+        duration = perf_counter() - start
+
+        match = request.resolver_match
+        view = match.url_name or match.view_name if match else 'unmatched'
+        REQUEST_LATENCY.observe(duration, view=view)
+        REQUEST_QUERIES.observe(queries.count, view=view)
+        REGISTRY.maybe_flush()
+        return response
+
+
+class TracingMiddleware:
+    """Open a sampled root span for each request, under which domain spans nest.
+
+    Only installed when settings.TRACING is true.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'TRACING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        root, token = start_trace(request.method, {'http.method': request.method, 'url.path': request.path})
+        if root is None:
+            return self.get_response(request)
+
+        error = None
+        try:
+            response = self.get_response(request)
+            root.set_attribute('http.status_code', response.status_code)
+            return response
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            match = request.resolver_match
+            if match is not None:
+                root.name = f'{request.method} {match.route}'
+                root.set_attribute('http.route', match.route)
+                root.set_attribute('view', match.view_name)
+            end_trace(root, token, error)
+
+
+class ReplicaStickinessMiddleware:
+    """Track each request's writes so read_from_replica views read the user's own writes.
+
+    A request that writes sends the user's reads to the primary for the next
+    REPLICA_STICKY_SECONDS. Only installed when a replica database is configured.
+    """
+
+    def __init__(self, get_response):
+        if replica_alias() is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with routing_state() as state:
+            response = self.get_response(request)
+        if state.wrote:
+            mark_sticky(response)
+        return response
@@ -0,0 +1,73 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:28
+
+from datetime import date
+
+from django.conf import settings
+from django.db import migrations, models
+
+# The term rules of tutorials.academic_calendar when this migration was written,
+# copied so the migration does not change with the app code. Windows of later
+# term settings are recomputed with the recompute_schedule_windows command.
+DEFAULT_ACADEMIC_TERMS = (
+    ('Autumn', (9, 1), (12, 20)),
+    ('Spring', (1, 4), (3, 31)),
+    ('Summer', (4, 15), (7, 20)),
+)
+
+
+def academic_year_terms(term_pattern, academic_year):
+    """Return the (start, end) dates of the terms of the academic year starting in academic_year."""
+    first_start = term_pattern[0][1]
+    terms = []
+    for name, start, end in term_pattern:
+        start_year = academic_year if start >= first_start else academic_year + 1
+        end_year = start_year if end >= start else start_year + 1
+        terms.append((date(start_year, *start), date(end_year, *end)))
+    return sorted(terms)
+
+
+def schedule_window(term_pattern, request_date):
+    """Return the start of the first term on or after request_date and the end of its academic year."""
+    academic_year = request_date.year - 1
+    while True:
+        terms = academic_year_terms(term_pattern, academic_year)
+        upcoming = [start for start, end in terms if start >= request_date]
+        if upcoming:
+            return upcoming[0], terms[-1][1]
+        academic_year += 1
+
+
+def fill_schedule_window(apps, schema_editor):
+    """Derive the schedule window of existing requests from their request date."""
+    db_alias = schema_editor.connection.alias
+    RequestSession = apps.get_model('tutorials', 'RequestSession')
+    term_pattern = getattr(settings, 'ACADEMIC_TERMS', DEFAULT_ACADEMIC_TERMS)
+    sessions = list(RequestSession.objects.using(db_alias).only('id', 'date_requested'))
+    for session in sessions:
+        session.schedule_start, session.schedule_end = schedule_window(term_pattern, session.date_requested)
+    RequestSession.objects.using(db_alias).bulk_update(sessions, ['schedule_start', 'schedule_end'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0021_alter_requestsession_unique_together_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='requestsession',
+            name='schedule_end',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='requestsession',
+            name='schedule_start',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='requestsession',
+            index=models.Index(fields=['schedule_end', 'schedule_start'], name='requestsession_schedule_idx'),
+        ),
+        migrations.RunPython(fill_schedule_window, migrations.RunPython.noop),
+    ]
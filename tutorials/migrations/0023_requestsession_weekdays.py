@@ -0,0 +1,36 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:32
+
+from django.db import migrations, models
+
+from tutorials.recurrence import weekday_mask
+
+
+def fill_weekdays(apps, schema_editor):
+    """Build each request's weekday bitmask from its RequestSessionDay rows."""
+    db_alias = schema_editor.connection.alias
+    RequestSession = apps.get_model('tutorials', 'RequestSession')
+    RequestSessionDay = apps.get_model('tutorials', 'RequestSessionDay')
+    days_by_session = {}
+    for session_id, day_of_week in RequestSessionDay.objects.using(db_alias).values_list('request_session_id', 'day_of_week'):
+        days_by_session.setdefault(session_id, []).append(day_of_week)
+    sessions = [
+        RequestSession(id=session_id, weekdays=weekday_mask(days))
+        for session_id, days in days_by_session.items()
+    ]
+    RequestSession.objects.using(db_alias).bulk_update(sessions, ['weekdays'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0022_requestsession_schedule_window'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='requestsession',
+            name='weekdays',
+            field=models.PositiveSmallIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(fill_weekdays, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:33
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicate_days(apps, schema_editor):
+    """Keep the oldest row of each (request_session, day_of_week) pair so the constraint can be added."""
+    db_alias = schema_editor.connection.alias
+    RequestSessionDay = apps.get_model('tutorials', 'RequestSessionDay')
+    keep = RequestSessionDay.objects.using(db_alias).values('request_session_id', 'day_of_week').annotate(
+        keep_id=Min('id')
+    ).values('keep_id')
+    RequestSessionDay.objects.using(db_alias).exclude(id__in=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0023_requestsession_weekdays'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_days, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='requestsessionday',
+            constraint=models.UniqueConstraint(fields=('request_session', 'day_of_week'), name='unique_day_per_request_session'),
+        ),
+    ]
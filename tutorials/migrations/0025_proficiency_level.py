@@ -0,0 +1,31 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0024_requestsessionday_unique_day'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='requestsession',
+            name='level',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(proficiency='Beginner', then=models.Value(1)), models.When(proficiency='Intermediate', then=models.Value(2)), models.When(proficiency='Advanced', then=models.Value(3)), default=models.Value(0), output_field=models.PositiveSmallIntegerField()), output_field=models.PositiveSmallIntegerField()),
+        ),
+        migrations.AddField(
+            model_name='tutorsubject',
+            name='level',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(proficiency='Beginner', then=models.Value(1)), models.When(proficiency='Intermediate', then=models.Value(2)), models.When(proficiency='Advanced', then=models.Value(3)), default=models.Value(0), output_field=models.PositiveSmallIntegerField()), output_field=models.PositiveSmallIntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='requestsession',
+            index=models.Index(fields=['subject', 'level'], name='requestsession_subj_level_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tutorsubject',
+            index=models.Index(fields=['subject', 'level'], name='tutorsubject_subject_level_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.2 on 2026-10-19 16:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0025_proficiency_level'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserActivity',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='activity', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('open_requests', models.PositiveIntegerField(default=0)),
+                ('pending_approvals', models.PositiveIntegerField(default=0)),
+                ('active_matches', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-19 18:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0026_useractivity'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='requestsession',
+            name='weekdays',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+    ]
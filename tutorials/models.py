@@ -2,8 +2,32 @@
 from django.core.validators import RegexValidator
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import F
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils.functional import cached_property
 from libgravatar import Gravatar
 
+from tutorials.academic_calendar import get_academic_calendar
+from tutorials.generations import bump_generation
+from tutorials.recurrence import Recurrence, weekday_mask, weekday_names
+
+
+PROFICIENCY_LEVELS = {
+    'Beginner': 1,
+    'Intermediate': 2,
+    'Advanced': 3,
+}
+
+
+def proficiency_level_expression():
+    """Return a database expression ranking the proficiency label from 1 (Beginner) upwards."""
+    return models.Case(
+        *[models.When(proficiency=label, then=models.Value(level)) for label, level in PROFICIENCY_LEVELS.items()],
+        default=models.Value(0),
+        output_field=models.PositiveSmallIntegerField(),
+    )
+
 
 class User(AbstractUser):
     """Model used for user authentication, and team member related information."""
@@ -67,6 +91,26 @@ class User(AbstractUser):
 
         return self.gravatar(size=60)
 
+    def get_session_auth_hash(self):
+        """Return the session hash, which cached copies keep in place of the password hash."""
+        if 'password' not in self.__dict__ and 'session_auth_hash' in self.__dict__:
+            return self.session_auth_hash
+        return super().get_session_auth_hash()
+
+
+class UserActivity(models.Model):
+    """Denormalised request and match counters for a user, kept up to date by the views."""
+
+    COUNTER_FIELDS = ('open_requests', 'pending_approvals', 'active_matches')
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='activity')
+    open_requests = models.PositiveIntegerField(default=0)
+    pending_approvals = models.PositiveIntegerField(default=0)
+    active_matches = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Activity of {self.user_id}"
+
 
 class Subject(models.Model):
     """Model used to represent subjects which can be taught"""
@@ -77,6 +121,20 @@ class Subject(models.Model):
         return self.name
 
 
+class RequestSessionQuerySet(models.QuerySet):
+    """Query helpers for request sessions."""
+
+    def on_weekdays(self, *day_names):
+        """Return sessions held on any of the given weekdays."""
+        return self.alias(
+            weekday_overlap=F('weekdays').bitand(weekday_mask(day_names))
+        ).filter(weekday_overlap__gt=0)
+
+    def on_weekday(self, day_name):
+        """Return sessions held on the given weekday, such as 'Tuesday'."""
+        return self.on_weekdays(day_name)
+
+
 class RequestSession(models.Model):
     """Model for a session request made by a student"""
 
@@ -90,27 +148,94 @@ class RequestSession(models.Model):
         (0.25, 'Monthly'),
         (0.5, 'Fortnightly'),
         (1, 'Weekly'),
-        (2, 'Biweekly'), 
+        (2, 'Biweekly'),
     )
 
     student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='requests')
     subject = models.ForeignKey(Subject, on_delete=models.CASCADE)
     frequency = models.DecimalField(max_digits=3, decimal_places=2, default=1.0, choices=FREQUENCY_CHOICES)
     proficiency = models.CharField(max_length=12, choices=PROFICIENCY_TYPES, default='Beginner')
+    # Ordered rank of proficiency kept by the database, for range queries
+    level = models.GeneratedField(
+        expression=proficiency_level_expression(),
+        output_field=models.PositiveSmallIntegerField(),
+        db_persist=True,
+    )
     date_requested = models.DateField(null=False, blank=False)  # Change from DateTimeField to DateField
+    schedule_start = models.DateField(null=True, blank=True, editable=False)
+    schedule_end = models.DateField(null=True, blank=True, editable=False)
+    # Chosen weekdays as a bitmask with bit 0 as Monday, kept in step with RequestSessionDay rows
+    weekdays = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    objects = RequestSessionQuerySet.as_manager()
 
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=['student', 'subject'], name='unique_request_per_student_subject')
         ]
+        indexes = [
+            models.Index(fields=['schedule_end', 'schedule_start'], name='requestsession_schedule_idx'),
+            models.Index(fields=['subject', 'level'], name='requestsession_subj_level_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.username} - {self.subject.name}"
 
+    def save(self, *args, **kwargs):
+        """Keep the stored schedule window in step with the request date.
+
+        Saving a stored request leaves weekdays out unless update_fields names
+        it, as add_weekdays changes the column in the database and this
+        instance may have been loaded before.
+        """
+        self.update_schedule_window()
+        if not self._state.adding and not args and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and not field.generated and field.name != 'weekdays'
+            ]
+        super().save(*args, **kwargs)
+
+    def update_schedule_window(self):
+        """Set schedule_start and schedule_end from the terms the request is scheduled over."""
+        if not self.date_requested:
+            return
+        request_date = self._meta.get_field('date_requested').to_python(self.date_requested)
+        terms = get_academic_calendar().schedule_terms(request_date)
+        self.schedule_start = terms[0].start
+        self.schedule_end = terms[-1].end
+
     def get_frequency_display(self):
         """Return human-readable frequency."""
         return dict(self.FREQUENCY_CHOICES).get(float(self.frequency), "Unknown")
 
+    @property
+    def day_names(self):
+        """Return the names of the chosen weekdays, Monday first."""
+        return weekday_names(self.weekdays)
+
+    def add_weekdays(self, day_names):
+        """Add weekdays to the stored bitmask without reading the days table."""
+        mask = weekday_mask(day_names)
+        self.weekdays |= mask
+        RequestSession.objects.using(self._state.db).filter(pk=self.pk).update(weekdays=F('weekdays').bitor(mask))
+        # Updates send no post_save signal
+        bump_generation(RequestSession, using=self._state.db)
+
+    def set_days(self, day_names):
+        """Store the chosen weekdays as RequestSessionDay rows and in the bitmask."""
+        RequestSessionDay.objects.using(self._state.db).bulk_create(
+            [RequestSessionDay(request_session=self, day_of_week=day) for day in day_names],
+            ignore_conflicts=True
+        )
+        bump_generation(RequestSessionDay, using=self._state.db)
+        self.add_weekdays(day_names)
+
+    @cached_property
+    def recurrence(self):
+        """Return the session's schedule decoded from its frequency and days."""
+        return Recurrence.from_frequency(self.frequency, self.weekdays)
+
 
 class RequestSessionDay(models.Model):
     """Model to represent days associated with a RequestSession."""
@@ -126,9 +251,36 @@ class RequestSessionDay(models.Model):
         ]
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['request_session', 'day_of_week'], name='unique_day_per_request_session')
+        ]
+
     def __str__(self):
         return f"{self.request_session} on {self.day_of_week}"
 
+    def save(self, *args, **kwargs):
+        """Save the day and add it to the session's weekday bitmask."""
+        super().save(*args, **kwargs)
+        self.request_session.add_weekdays([self.day_of_week])
+
+
+@receiver(post_delete, sender=RequestSessionDay)
+def remove_request_session_weekday(sender, instance, using, origin=None, **kwargs):
+    """Rebuild the session's weekday bitmask from its remaining days.
+
+    Days only cascade from their session, so a deletion that did not start
+    from the days themselves is deleting the session too and is skipped.
+    """
+    origin_model = origin.model if isinstance(origin, models.QuerySet) else type(origin)
+    if origin is not None and origin_model is not RequestSessionDay:
+        return
+    remaining = RequestSessionDay.objects.using(using).filter(
+        request_session_id=instance.request_session_id
+    ).values_list('day_of_week', flat=True)
+    RequestSession.objects.using(using).filter(pk=instance.request_session_id).update(weekdays=weekday_mask(remaining))
+    bump_generation(RequestSession, using=using)
+
 
 class Match(models.Model):
     """Model for matching requests to tutors"""
@@ -156,6 +308,18 @@ class Invoice(models.Model):
     bank_transfer = models.CharField(max_length=20, blank=True, null=True)
 
 
+class TutorSubjectQuerySet(models.QuerySet):
+    """Query helpers for tutor subjects."""
+
+    def at_least(self, proficiency):
+        """Return subjects taught at the given proficiency label or above."""
+        return self.filter(level__gte=PROFICIENCY_LEVELS[proficiency.capitalize()])
+
+    def qualified_for(self, subject, proficiency):
+        """Return subjects able to teach a request for subject at the given proficiency."""
+        return self.filter(subject=subject).at_least(proficiency)
+
+
 class TutorSubject(models.Model):
     """Model for tutors and their associated subjects"""
 
@@ -168,12 +332,23 @@ class TutorSubject(models.Model):
     tutor = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tutor_subjects')
     subject = models.ForeignKey(Subject, on_delete=models.CASCADE)
     proficiency = models.CharField(max_length=12, choices=PROFICIENCY_TYPES, default='Beginner')
+    # Ordered rank of proficiency kept by the database, for range queries
+    level = models.GeneratedField(
+        expression=proficiency_level_expression(),
+        output_field=models.PositiveSmallIntegerField(),
+        db_persist=True,
+    )
     price  = models.DecimalField(max_digits=4, decimal_places=2, default=10.00)
 
+    objects = TutorSubjectQuerySet.as_manager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=['tutor', 'subject'], name='unique_tutor_subject')
         ]
+        indexes = [
+            models.Index(fields=['subject', 'level'], name='tutorsubject_subject_level_idx')
+        ]
 
     def __str__(self):
         return f"{self.tutor.username} - {self.subject.name}"
@@ -183,10 +358,7 @@ class Frequency:
     """Utility class to handle frequency conversions."""
 
     FREQUENCY_CHOICES = {
-        0.5: 'Fortnightly',
-        1.0: 'Weekly',
-        2.0: 'Biweekly',
-        4.0: 'Monthly',
+        float(value): label for value, label in RequestSession.FREQUENCY_CHOICES
     }
 
     @classmethod
@@ -0,0 +1,62 @@
+"""Bitmask occupancy of the days in a calendar month."""
+
+
+def day_mask(days):
+    """Return a bitmask with bit (day - 1) set for each day number."""
+    mask = 0
+    for day in days:
+        mask |= 1 << (day - 1)
+    return mask
+
+
+def mask_days(mask):
+    """Return the day numbers set in a bitmask, in order."""
+    days = []
+    day = 1
+    while mask:
+        if mask & 1:
+            days.append(day)
+        mask >>= 1
+        day += 1
+    return days
+
+
+class MonthOccupancy:
+    """Occupied days of a month as a bitmask, with per-day and per-user session counts.
+
+    Supports `day in occupancy` so it can stand in for a set of highlighted days.
+    """
+
+    __slots__ = ('mask', 'counts', 'user_masks')
+
+    def __init__(self):
+        self.mask = 0
+        self.counts = {}
+        self.user_masks = {}
+
+    def add(self, days, user_ids=()):
+        """Record a session on the given days for its users and return the session's mask."""
+        mask = day_mask(days)
+        self.mask |= mask
+        for day in days:
+            self.counts[day] = self.counts.get(day, 0) + 1
+        for user_id in user_ids:
+            self.user_masks[user_id] = self.user_masks.get(user_id, 0) | mask
+        return mask
+
+    def count(self, day):
+        """Return the number of sessions on a day."""
+        return self.counts.get(day, 0)
+
+    def user_days(self, user_id):
+        """Return the days on which a user has sessions."""
+        return mask_days(self.user_masks.get(user_id, 0))
+
+    def __contains__(self, day):
+        return isinstance(day, int) and day > 0 and bool(self.mask >> (day - 1) & 1)
+
+    def __iter__(self):
+        return iter(mask_days(self.mask))
+
+    def __len__(self):
+        return bin(self.mask).count('1')
@@ -4,6 +4,8 @@ from reportlab.pdfgen import canvas
 import os
 import uuid
 
+from tutorials.tracing import span
+
 class PDFUser():
     
     
@@ -14,6 +16,7 @@ class PDFUser():
     #Price3: 460, 348
     #Lesson: 57, 445
 
+    @span('pdf.overlay')
     def createOverlay(student, tutor, price1, price2, price3, subject, freq, prof, bank_transfer):
         packet = BytesIO()
         can = canvas.Canvas(packet)
@@ -48,14 +51,15 @@ class PDFUser():
             overlay = PDFUser.createOverlay(student, tutor, str(price1), str(price2), str(price3),
                                             subject, freq, prof, bank_transfer)
 
-            for page_number, page in enumerate(input_pdf.pages):
-                if page_number == 0:
-                    page.merge_page(overlay.pages[0])
-                writer.add_page(page)
+            with span('pdf.merge'):
+                for page_number, page in enumerate(input_pdf.pages):
+                    if page_number == 0:
+                        page.merge_page(overlay.pages[0])
+                    writer.add_page(page)
 
-            # Write the output to a temporary file
-            with open(temp_path, "wb") as output_file:
-                writer.write(output_file)
+                # Write the output to a temporary file
+                with open(temp_path, "wb") as output_file:
+                    writer.write(output_file)
 
             return temp_path
 
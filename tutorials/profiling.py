@@ -0,0 +1,176 @@
+"""On-demand profiling of single requests, stored on disk for later inspection."""
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import uuid
+from collections import defaultdict
+
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+
+CPROFILE = 'cprofile'
+SAMPLING = 'sampling'
+
+_TOKEN_SALT = 'tutorials.profiling'
+_TOKEN_VALUE = 'profile'
+
+# Edges of the call graph contributing less than this many seconds are not expanded
+_MIN_SHARE = 1e-6
+
+
+def profile_token():
+    """Return a signed value for the profile query parameter, valid for REQUEST_PROFILING_TOKEN_AGE seconds."""
+    return signing.TimestampSigner(salt=_TOKEN_SALT).sign(_TOKEN_VALUE)
+
+
+def valid_profile_token(value):
+    """Return whether value is an unexpired token from profile_token()."""
+    try:
+        unsigned = signing.TimestampSigner(salt=_TOKEN_SALT).unsign(
+            value, max_age=getattr(settings, 'REQUEST_PROFILING_TOKEN_AGE', 3600)
+        )
+    except signing.BadSignature:
+        return False
+    return unsigned == _TOKEN_VALUE
+
+
+def frame_label(filename, line, function):
+    """Return a flame graph frame name for a function."""
+    base_dir = str(settings.BASE_DIR) + os.sep
+    if filename.startswith(base_dir):
+        filename = filename[len(base_dir):]
+    return f"{function} ({filename}:{line})".replace(';', ',')
+
+
+class SamplingProfiler:
+    """Context manager sampling the calling thread's stack every interval seconds."""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.samples = defaultdict(int)
+        self._stopped = threading.Event()
+        self._thread = None
+        self._target = None
+
+    def __enter__(self):
+        self._target = threading.get_ident()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        self._thread.join()
+
+    def _sample(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(frame_label(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def collapsed(self):
+        """Return the samples as collapsed stack lines."""
+        return [f"{stack} {count}" for stack, count in sorted(self.samples.items())]
+
+
+def pstats_collapsed(stats):
+    """Return collapsed stack lines, weighted in microseconds, approximated from a pstats call graph.
+
+    The time of a function called from several places is split between its
+    callers in proportion to the time each call site accounts for.
+    """
+    callees = defaultdict(list)
+    roots = []
+    for function, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            roots.append(function)
+        for caller, edge in callers.items():
+            callees[caller].append((function, edge[3]))
+
+    weights = defaultdict(float)
+
+    def walk(function, path, seen, share):
+        _, _, own_time, _, _ = stats[function]
+        path = path + (frame_label(*function),)
+        if own_time * share > 0:
+            weights[';'.join(path)] += own_time * share
+        for callee, edge_time in callees.get(function, ()):
+            callee_time = stats[callee][3]
+            child_share = share * edge_time / callee_time if callee_time else 0
+            if callee in seen or child_share * callee_time < _MIN_SHARE:
+                continue
+            walk(callee, path, seen | {callee}, child_share)
+
+    for root in roots:
+        walk(root, (), frozenset((root,)), 1.0)
+    return [
+        f"{stack} {round(weight * 1_000_000)}"
+        for stack, weight in sorted(weights.items())
+        if round(weight * 1_000_000)
+    ]
+
+
+def profile_dir():
+    """Return the directory profiles are stored in."""
+    return str(getattr(settings, 'REQUEST_PROFILE_DIR', os.path.join(settings.BASE_DIR, 'profiles')))
+
+
+def save_profile(profiler, metadata):
+    """Store a finished profiler with its request metadata and return the profile id."""
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    started = timezone.now()
+    profile_id = f"{started:%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+    base = os.path.join(directory, profile_id)
+    if isinstance(profiler, cProfile.Profile):
+        profiler.dump_stats(f'{base}.prof')
+        mode = CPROFILE
+    else:
+        with open(f'{base}.collapsed', 'w', encoding='utf-8') as output:
+            output.write('\n'.join(profiler.collapsed()) + '\n')
+        mode = SAMPLING
+    metadata = dict(metadata, id=profile_id, mode=mode, time=started.isoformat())
+    with open(f'{base}.json', 'w', encoding='utf-8') as output:
+        json.dump(metadata, output)
+    return profile_id
+
+
+def list_profiles():
+    """Return the metadata of every stored profile, newest first."""
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for filename in os.listdir(directory):
+        if filename.endswith('.json'):
+            with open(os.path.join(directory, filename), encoding='utf-8') as metadata:
+                profiles.append(json.load(metadata))
+    return sorted(profiles, key=lambda profile: profile['id'], reverse=True)
+
+
+def load_collapsed(profile_id):
+    """Return the collapsed stack lines of a stored profile."""
+    base = os.path.join(profile_dir(), os.path.basename(profile_id))
+    if os.path.exists(f'{base}.collapsed'):
+        with open(f'{base}.collapsed', encoding='utf-8') as collapsed:
+            return [line.rstrip('\n') for line in collapsed if line.strip()]
+    if os.path.exists(f'{base}.prof'):
+        return pstats_collapsed(pstats.Stats(f'{base}.prof').stats)
+    raise FileNotFoundError(f"No profile named {profile_id}")
+
+
+def load_stats(profile_id, stream=None):
+    """Return the pstats.Stats of a stored deterministic profile, printing to stream."""
+    path = os.path.join(profile_dir(), f'{os.path.basename(profile_id)}.prof')
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No deterministic profile named {profile_id}")
+    return pstats.Stats(path, stream=stream)
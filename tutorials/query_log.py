@@ -0,0 +1,186 @@
+"""Capture of slow and repeated SQL queries, grouped by a normalised fingerprint."""
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+from time import perf_counter
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger('tutorials.slow_queries')
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*(?:(?:%s|\?)\s*,\s*)+(?:%s|\?)\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+# Frames in these directories are framework code, not the code that issued the query
+_LIBRARY_PATHS = tuple(
+    os.path.normpath(path) + os.sep
+    for path in {sys.prefix, sys.base_prefix, os.path.dirname(os.__file__)}
+)
+_IGNORED_FILES = (os.path.normpath(__file__),)
+
+
+def normalise_sql(sql):
+    """Return SQL with literals and placeholder lists replaced, so similar queries compare equal."""
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _PLACEHOLDER_LIST.sub('(...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def fingerprint(sql):
+    """Return (fingerprint, normalised SQL) for a query."""
+    normalised = normalise_sql(sql)
+    return hashlib.sha1(normalised.encode()).hexdigest()[:12], normalised
+
+
+def calling_frame():
+    """Return 'file:line in function' for the innermost project frame on the stack."""
+    base_dir = os.path.normpath(str(settings.BASE_DIR)) + os.sep
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = os.path.normpath(frame.f_code.co_filename)
+        if (
+            filename.startswith(base_dir)
+            and not filename.startswith(_LIBRARY_PATHS)
+            and filename not in _IGNORED_FILES
+        ):
+            return f"{os.path.relpath(filename, base_dir)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+class QueryRecorder:
+    """Database execute wrapper collecting the queries of one request by fingerprint."""
+
+    __slots__ = ('threshold', 'queries')
+
+    def __init__(self, threshold_ms):
+        self.threshold = threshold_ms
+        # fingerprint -> [normalised sql, count, total ms, slowest ms, frame of first call, slow calls]
+        self.queries = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (perf_counter() - start) * 1000
+            self.record(sql, duration)
+
+    def record(self, sql, duration):
+        """Add one executed query taking duration milliseconds."""
+        key, normalised = fingerprint(sql)
+        entry = self.queries.get(key)
+        if entry is None:
+            entry = self.queries[key] = [normalised, 0, 0.0, 0.0, calling_frame(), []]
+        entry[1] += 1
+        entry[2] += duration
+        entry[3] = max(entry[3], duration)
+        if duration >= self.threshold:
+            entry[5].append((duration, calling_frame()))
+
+    def entries(self, duplicate_threshold):
+        """Return log entries for slow queries and for fingerprints repeated duplicate_threshold times.
+
+        Slow entries of a repeated fingerprint are marked repeated, as its
+        duplicate entry already counts them.
+        """
+        entries = []
+        for key, (sql, count, total, slowest, frame, slow_calls) in self.queries.items():
+            repeated = count >= duplicate_threshold
+            for duration, slow_frame in slow_calls:
+                entries.append({
+                    'kind': 'slow',
+                    'fingerprint': key,
+                    'sql': sql,
+                    'count': 1,
+                    'duration_ms': round(duration, 3),
+                    'frame': slow_frame,
+                    'repeated': repeated,
+                })
+            if repeated:
+                entries.append({
+                    'kind': 'duplicate',
+                    'fingerprint': key,
+                    'sql': sql,
+                    'count': count,
+                    'duration_ms': round(total, 3),
+                    'frame': frame,
+                })
+        return entries
+
+
+def write_entries(entries, view, path):
+    """Write entries as JSON lines to the slow query log."""
+    logged_at = timezone.now().isoformat()
+    for entry in entries:
+        entry.update({'time': logged_at, 'view': view, 'path': path})
+        logger.warning(json.dumps(entry))
+
+
+def read_entries(log_file):
+    """Yield the entries of a slow query log and its rotated backups, oldest file first."""
+    log_file = str(log_file)
+    backups = []
+    index = 1
+    while os.path.exists(f'{log_file}.{index}'):
+        backups.append(f'{log_file}.{index}')
+        index += 1
+    for filename in reversed(backups):
+        yield from _read_file(filename)
+    if os.path.exists(log_file):
+        yield from _read_file(log_file)
+
+
+def _read_file(filename):
+    with open(filename, encoding='utf-8') as log:
+        for line in log:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def aggregate_entries(entries):
+    """Group entries by fingerprint and rank them by total time, worst first.
+
+    Each query is counted once: a slow entry marked repeated only adds to
+    the slow count, as the duplicate entry of its request holds its time.
+    """
+    report = {}
+    for entry in entries:
+        row = report.get(entry['fingerprint'])
+        if row is None:
+            row = report[entry['fingerprint']] = {
+                'fingerprint': entry['fingerprint'],
+                'sql': entry['sql'],
+                'total_ms': 0.0,
+                'queries': 0,
+                'slow': 0,
+                'duplicate_requests': 0,
+                'views': {},
+                'frames': {},
+            }
+        if entry['kind'] == 'slow':
+            row['slow'] += 1
+            if entry.get('repeated'):
+                continue
+        else:
+            row['duplicate_requests'] += 1
+        row['total_ms'] += entry['duration_ms']
+        row['queries'] += entry['count']
+        view = entry.get('view') or entry.get('path')
+        row['views'][view] = row['views'].get(view, 0) + entry['count']
+        if entry.get('frame'):
+            row['frames'][entry['frame']] = row['frames'].get(entry['frame'], 0) + entry['count']
+    return sorted(report.values(), key=lambda row: row['total_ms'], reverse=True)
@@ -0,0 +1,59 @@
+"""Slim, read-only rows for the listing pages, fetched with values_list() in one query."""
+from collections import namedtuple
+
+from tutorials.models import Frequency
+from tutorials.recurrence import weekday_names
+
+
+class MatchRow(namedtuple('MatchRow', [
+    'id', 'tutor', 'student', 'subject', 'proficiency', 'date_requested', 'frequency', 'weekdays',
+])):
+    """The fields of a match shown in the matched request and pending approval tables."""
+
+    __slots__ = ()
+
+    FIELDS = (
+        'id',
+        'tutor__username',
+        'request_session__student__username',
+        'request_session__subject__name',
+        'request_session__proficiency',
+        'request_session__date_requested',
+        'request_session__frequency',
+        'request_session__weekdays',
+    )
+
+    @property
+    def days(self):
+        return weekday_names(self.weekdays)
+
+
+class RequestRow(namedtuple('RequestRow', [
+    'id', 'student', 'subject', 'subject_id', 'proficiency', 'date_requested',
+])):
+    """The fields of an unmatched request shown on the requested sessions page.
+
+    It has the subject_id and proficiency TutorMatchForm reads from a request.
+    """
+
+    __slots__ = ()
+
+    FIELDS = ('id', 'student__username', 'subject__name', 'subject_id', 'proficiency', 'date_requested')
+
+
+def match_rows(matches):
+    """Return a MatchRow for each match of the queryset, with the frequency as its label."""
+    return [
+        MatchRow(*row[:6], Frequency.to_string(row[6]), row[7])
+        for row in matches.values_list(*MatchRow.FIELDS)
+    ]
+
+
+def request_values(requests):
+    """Return the requests queryset as RequestRow.FIELDS tuples, which can be paginated."""
+    return requests.values_list(*RequestRow.FIELDS)
+
+
+def request_rows(values):
+    """Return a RequestRow for each tuple of request_values."""
+    return [RequestRow._make(row) for row in values]
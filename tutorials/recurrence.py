@@ -0,0 +1,165 @@
+"""Decoded session schedules: how often a request session meets and on which weekdays."""
+from collections import namedtuple
+from datetime import date, timedelta
+from functools import lru_cache
+import calendar as pycalendar
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from tutorials.academic_calendar import get_academic_calendar
+from tutorials.tracing import set_attribute, span
+
+WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday')
+
+MONTHLY = 'monthly'
+FORTNIGHTLY = 'fortnightly'
+WEEKLY = 'weekly'
+TWICE_WEEKLY = 'twice_weekly'
+
+# Maps a RequestSession frequency (sessions per week) to a recurrence kind
+FREQUENCY_KINDS = {
+    0.25: MONTHLY,
+    0.5: FORTNIGHTLY,
+    1.0: WEEKLY,
+    2.0: TWICE_WEEKLY,
+}
+
+# Kind -> (sessions in a week it meets, weeks between meetings)
+WEEKLY_RULES = {
+    FORTNIGHTLY: (1, 2),
+    WEEKLY: (1, 1),
+    TWICE_WEEKLY: (2, 1),
+}
+
+
+def weekday_mask(day_names):
+    """Return a bitmask of weekdays (bit 0 is Monday) from day names.
+
+    Combined values such as 'Wednesday, Thursday' are split into single days.
+    """
+    mask = 0
+    for value in day_names:
+        for name in str(value).split(','):
+            name = name.strip().capitalize()
+            if name in WEEKDAYS:
+                mask |= 1 << WEEKDAYS.index(name)
+    return mask
+
+
+def weekday_names(mask):
+    """Return the names of the weekdays in a bitmask, Monday first."""
+    return [name for index, name in enumerate(WEEKDAYS) if mask & (1 << index)]
+
+
+class Recurrence(namedtuple('Recurrence', ['kind', 'weekdays'])):
+    """Compact, hashable schedule decoded from a session's frequency and days.
+
+    kind is one of MONTHLY, FORTNIGHTLY, WEEKLY or TWICE_WEEKLY and weekdays
+    is a bitmask of the chosen days with bit 0 as Monday. Sessions with the
+    same frequency and days share an equal Recurrence.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_frequency(cls, frequency, days):
+        """Decode a frequency value and the chosen days, given as names or a weekday bitmask."""
+        kind = FREQUENCY_KINDS.get(float(frequency)) if frequency is not None else None
+        if kind is None:
+            raise ValueError(f"Unknown session frequency: {frequency}")
+        return cls(kind, days if isinstance(days, int) else weekday_mask(days))
+
+    def day_numbers(self):
+        """Return the chosen weekdays as numbers, Monday being 0."""
+        return [index for index in range(len(WEEKDAYS)) if self.weekdays & (1 << index)]
+
+    def day_names(self):
+        """Return the chosen weekdays as names."""
+        return [WEEKDAYS[index] for index in self.day_numbers()]
+
+    @span('recurrence.expand')
+    def occurrences(self, terms, year, month):
+        """Return the session dates within the given month for a schedule over terms."""
+        set_attribute('recurrence.kind', self.kind)
+        set_attribute('recurrence.month', f'{year}-{month:02d}')
+        if not terms or not self.weekdays:
+            return []
+        window_start = terms[0].start
+        window_end = terms[-1].end
+        month_start = date(year, month, 1)
+        month_end = date(year, month, pycalendar.monthrange(year, month)[1])
+        if month_end < window_start or month_start > window_end:
+            return []
+
+        academic_calendar = get_academic_calendar()
+        day_numbers = self.day_numbers()
+
+        def slots(monday):
+            """Return the teaching days in the week starting on monday which match the chosen days."""
+            for number in day_numbers:
+                day = monday + timedelta(days=number)
+                if window_start <= day <= window_end and academic_calendar.is_teaching_day(day):
+                    yield day
+
+        first_monday = month_start - timedelta(days=month_start.weekday())
+        weeks = range(0, (month_end - first_monday).days + 1, 7)
+
+        if self.kind == MONTHLY:
+            for offset in weeks:
+                for day in slots(first_monday + timedelta(days=offset)):
+                    if month_start <= day <= month_end:
+                        return [day]
+            return []
+
+        per_week, every = WEEKLY_RULES[self.kind]
+        anchor = window_start - timedelta(days=window_start.weekday())
+        dates = []
+        for offset in weeks:
+            monday = first_monday + timedelta(days=offset)
+            if ((monday - anchor).days // 7) % every:
+                continue
+            for count, day in enumerate(slots(monday)):
+                if count == per_week:
+                    break
+                if month_start <= day <= month_end:
+                    dates.append(day)
+        return dates
+
+
+def _expand_occurrences(recurrence, terms, year, month):
+    return tuple(recurrence.occurrences(terms, year, month))
+
+
+@lru_cache(maxsize=None)
+def _occurrence_cache():
+    """Return the shared expansion cache, sized from RECURRENCE_CACHE_SIZE."""
+    return lru_cache(maxsize=getattr(settings, 'RECURRENCE_CACHE_SIZE', 1024))(_expand_occurrences)
+
+
+def expand_occurrences(recurrence, terms, year, month):
+    """Return the session dates of a month, shared by every session with the same schedule.
+
+    Results are kept in a bounded LRU cache keyed by recurrence, term window
+    and month, so the work done scales with distinct schedules rather than
+    with sessions.
+    """
+    return _occurrence_cache()(recurrence, terms, year, month)
+
+
+def occurrence_cache_info():
+    """Return hit, miss and size statistics of the shared expansion cache."""
+    return _occurrence_cache().cache_info()
+
+
+def clear_occurrence_cache():
+    """Drop every cached expansion."""
+    _occurrence_cache().cache_clear()
+
+
+@receiver(setting_changed)
+def reset_occurrence_cache(sender, setting, **kwargs):
+    """Rebuild the expansion cache when its size or the academic calendar settings change."""
+    if setting in ('RECURRENCE_CACHE_SIZE', 'ACADEMIC_TERMS', 'ACADEMIC_HOLIDAYS'):
+        _occurrence_cache.cache_clear()
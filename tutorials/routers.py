@@ -0,0 +1,137 @@
+"""Routing of read-only view queries to a replica database, with read-your-writes stickiness."""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+STICKY_COOKIE = 'primary_reads'
+_STICKY_SALT = 'tutorials.routers'
+
+_routing = ContextVar('database_routing', default=None)
+
+
+class RoutingState:
+    """Whether the current request may read from the replica and whether it has written."""
+
+    __slots__ = ('use_replica', 'wrote', 'read_replica', 'atomic_depth')
+
+    def __init__(self):
+        self.use_replica = False
+        self.wrote = False
+        self.read_replica = False
+        # Primary transactions already open when the view started, e.g. ATOMIC_REQUESTS
+        self.atomic_depth = 0
+
+
+def replica_alias():
+    """Return the configured replica alias, or None when there is no replica."""
+    alias = getattr(settings, 'DATABASE_REPLICA_ALIAS', 'replica')
+    return alias if alias in connections.settings else None
+
+
+def used_replica():
+    """Return whether the current request has read from the replica."""
+    state = _routing.get()
+    return state is not None and state.read_replica
+
+
+def sticky_seconds():
+    return getattr(settings, 'REPLICA_STICKY_SECONDS', 10)
+
+
+@contextmanager
+def routing_state():
+    """Track the writes of the code run inside the block, such as one request."""
+    state = RoutingState()
+    token = _routing.set(state)
+    try:
+        yield state
+    finally:
+        _routing.reset(token)
+
+
+@contextmanager
+def writes_ignored():
+    """Leave the writes of the block, such as logging in, out of the request's stickiness."""
+    state = _routing.get()
+    wrote = state is not None and state.wrote
+    try:
+        yield
+    finally:
+        if state is not None:
+            state.wrote = wrote
+
+
+def is_sticky(request):
+    """Return whether the user wrote recently enough that they must read from the primary."""
+    return request.get_signed_cookie(STICKY_COOKIE, default=None, salt=_STICKY_SALT, max_age=sticky_seconds()) is not None
+
+
+def mark_sticky(response):
+    """Send the user's reads to the primary for the next REPLICA_STICKY_SECONDS."""
+    response.set_signed_cookie(
+        STICKY_COOKIE, '1', salt=_STICKY_SALT, max_age=sticky_seconds(), httponly=True, samesite='Lax'
+    )
+
+
+def read_from_replica(view_function):
+    """Decorator sending a view's reads to the replica unless the user wrote recently."""
+
+    @wraps(view_function)
+    def modified_view_function(request, *args, **kwargs):
+        state = _routing.get()
+        if state is None or is_sticky(request):
+            return view_function(request, *args, **kwargs)
+        state.use_replica = True
+        state.atomic_depth = len(connections[DEFAULT_DB_ALIAS].atomic_blocks)
+        try:
+            return view_function(request, *args, **kwargs)
+        finally:
+            state.use_replica = False
+    return modified_view_function
+
+
+class ReplicaRouter:
+    """Send reads inside read_from_replica views to the replica and every write to the primary.
+
+    Reads stay on the primary once the request has written or while the
+    view has a transaction open on the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        state = _routing.get()
+        if state is None or not state.use_replica or state.wrote:
+            return None
+        if len(connections[DEFAULT_DB_ALIAS].atomic_blocks) > state.atomic_depth:
+            return None
+        alias = replica_alias()
+        if alias is not None:
+            state.read_replica = True
+        return alias
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        # Session rows are not read through the replica, so saving them needs no stickiness
+        if state is not None and model._meta.app_label != 'sessions':
+            state.wrote = True
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db and instance._state.db != replica_alias():
+            return instance._state.db
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        primary_and_replica = {DEFAULT_DB_ALIAS, replica_alias()}
+        if obj1._state.db in primary_and_replica and obj2._state.db in primary_and_replica:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is copied from the primary, never migrated directly
+        if db == replica_alias():
+            return False
+        return None
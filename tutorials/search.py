@@ -0,0 +1,32 @@
+"""Search filters shared by the listing pages and their CSV exports."""
+from django.db.models import Q
+
+
+def user_search(search_query):
+    """Return the filter of the users listing for a search."""
+    return (
+        Q(first_name__icontains=search_query) |
+        Q(last_name__icontains=search_query) |
+        Q(username__icontains=search_query) |
+        Q(email__icontains=search_query) |
+        Q(user_type__icontains=search_query)
+    )
+
+
+def matched_request_search(search_query):
+    """Return the filter of the matched requests listing for a search."""
+    return (
+        Q(tutor__username__icontains=search_query) |
+        Q(request_session__student__username__icontains=search_query) |
+        Q(request_session__subject__name__icontains=search_query) |
+        Q(request_session__proficiency__icontains=search_query)
+    )
+
+
+def requested_session_search(search_query):
+    """Return the filter of the requested sessions listing for a search."""
+    return (
+        Q(student__username__icontains=search_query) |
+        Q(subject__name__icontains=search_query) |
+        Q(proficiency__icontains=search_query)
+    )
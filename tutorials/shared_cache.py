@@ -0,0 +1,218 @@
+"""Cache backend shared by every worker process on a host, stored in a SQLite file."""
+import os
+import pickle
+import sqlite3
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS cache ('
+    ' key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL, accessed REAL NOT NULL'
+    ') WITHOUT ROWID',
+    'CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)',
+    'CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires)',
+)
+
+
+class SQLiteCache(BaseCache):
+    """Cache kept in the SQLite file named by LOCATION, in write-ahead logging mode.
+
+    Integers are stored as SQLite integers so incr() is a single atomic
+    UPDATE; other values are pickled. Reads record when an entry was last
+    used at most once every TOUCH_INTERVAL seconds, so most reads do not
+    write. Every CULL_CHECK_INTERVAL writes of a process, expired entries
+    are deleted and, above MAX_ENTRIES, the least recently used
+    1/CULL_FREQUENCY of the entries are evicted.
+    """
+
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = str(location)
+        options = params.get('OPTIONS', {})
+        self._touch_interval = float(options.get('TOUCH_INTERVAL', 1))
+        self._cull_check_interval = int(options.get('CULL_CHECK_INTERVAL', 100))
+        self._busy_timeout = float(options.get('BUSY_TIMEOUT', 5))
+        self._pid = None
+        self._connection = None
+        self._writes = 0
+
+    def _cursor(self):
+        # Connections must not cross a fork, so each process opens its own
+        if self._pid != os.getpid():
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self._path, timeout=self._busy_timeout, isolation_level=None)
+            connection.execute('PRAGMA journal_mode = WAL')
+            connection.execute('PRAGMA synchronous = NORMAL')
+            for statement in SCHEMA:
+                connection.execute(statement)
+            self._connection = connection
+            self._pid = os.getpid()
+            self._writes = 0
+        return self._connection
+
+    def _encode(self, value):
+        if type(value) is int:
+            return value
+        return pickle.dumps(value, self.pickle_protocol)
+
+    def _decode(self, value):
+        if isinstance(value, int):
+            return value
+        return pickle.loads(value)
+
+    def _wrote(self, connection, count=1):
+        self._writes += count
+        if self._writes >= self._cull_check_interval:
+            self._writes = 0
+            self._cull(connection)
+
+    def _cull(self, connection):
+        now = time.time()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.execute('DELETE FROM cache WHERE expires <= ?', (now,))
+            (count,) = connection.execute('SELECT COUNT(*) FROM cache').fetchone()
+            if count > self._max_entries:
+                evicted = count if self._cull_frequency == 0 else max(
+                    count - self._max_entries, count // self._cull_frequency
+                )
+                connection.execute(
+                    'DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed LIMIT ?)', (evicted,)
+                )
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+
+    def get(self, key, default=None, version=None):
+        return self.get_many([key], version=version).get(key, default)
+
+    def get_many(self, keys, version=None):
+        made_keys = {}
+        for key in keys:
+            made_key = self.make_and_validate_key(key, version=version)
+            made_keys[made_key] = key
+        if not made_keys:
+            return {}
+        connection = self._cursor()
+        now = time.time()
+        rows = connection.execute(
+            f'SELECT key, value, expires, accessed FROM cache WHERE key IN ({", ".join("?" * len(made_keys))})',
+            list(made_keys),
+        ).fetchall()
+        found = {}
+        stale = []
+        for made_key, value, expires, accessed in rows:
+            if expires is not None and expires <= now:
+                continue
+            found[made_keys[made_key]] = self._decode(value)
+            if now - accessed > self._touch_interval:
+                stale.append((now, made_key))
+        if stale:
+            connection.executemany('UPDATE cache SET accessed = ? WHERE key = ?', stale)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.set_many({key: value}, timeout=timeout, version=version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        expires = self.get_backend_timeout(timeout)
+        now = time.time()
+        rows = [
+            (self.make_and_validate_key(key, version=version), self._encode(value), expires, now)
+            for key, value in data.items()
+        ]
+        if not rows:
+            return []
+        connection = self._cursor()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.executemany('INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)', rows)
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        self._wrote(connection, len(rows))
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        connection = self._cursor()
+        # Only an expired entry may be replaced, in the same statement that checks it
+        added = connection.execute(
+            'INSERT INTO cache VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires, '
+            'accessed = excluded.accessed WHERE cache.expires <= ?',
+            (key, self._encode(value), self.get_backend_timeout(timeout), now, now),
+        ).rowcount == 1
+        if added:
+            self._wrote(connection)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        return self._cursor().execute(
+            'UPDATE cache SET expires = ?, accessed = ? WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (self.get_backend_timeout(timeout), now, key, now),
+        ).rowcount == 1
+
+    def incr(self, key, delta=1, version=None):
+        made_key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        connection = self._cursor()
+        # Fetching every row finishes the statement, which commits it
+        rows = connection.execute(
+            "UPDATE cache SET value = value + ?, accessed = ? "
+            "WHERE key = ? AND typeof(value) = 'integer' AND (expires IS NULL OR expires > ?) RETURNING value",
+            (delta, now, made_key, now),
+        ).fetchall()
+        if rows:
+            return rows[0][0]
+        # Missing, expired, or a pickled value such as a float
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute(
+                'SELECT value FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)', (made_key, now)
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Key '{key}' not found")
+            new_value = self._decode(row[0]) + delta
+            connection.execute(
+                'UPDATE cache SET value = ?, accessed = ? WHERE key = ?', (self._encode(new_value), now, made_key)
+            )
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        return new_value
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._cursor().execute(
+            'SELECT 1 FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)', (key, time.time())
+        ).fetchone() is not None
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._cursor().execute('DELETE FROM cache WHERE key = ?', (key,)).rowcount == 1
+
+    def delete_many(self, keys, version=None):
+        made_keys = [(self.make_and_validate_key(key, version=version),) for key in keys]
+        connection = self._cursor()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.executemany('DELETE FROM cache WHERE key = ?', made_keys)
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+
+    def clear(self):
+        self._cursor().execute('DELETE FROM cache')
@@ -0,0 +1,19 @@
+"""Performance profile applied to new SQLite connections."""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+def profile_statements():
+    """Return the PRAGMA statements of the configured SQLite profile."""
+    return [f'PRAGMA {name} = {value}' for name, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items()]
+
+
+@receiver(connection_created)
+def apply_sqlite_profile(sender, connection, **kwargs):
+    """Apply SQLITE_PRAGMAS to each SQLite connection whose database does not set SQLITE_PROFILE to False."""
+    if connection.vendor != 'sqlite' or not connection.settings_dict.get('SQLITE_PROFILE', True):
+        return
+    with connection.cursor() as cursor:
+        for statement in profile_statements():
+            cursor.execute(statement)
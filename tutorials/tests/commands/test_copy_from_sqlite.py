@@ -0,0 +1,114 @@
+import os
+import sqlite3
+import tempfile
+from datetime import date
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import TestCase
+from tutorials.management.commands.copy_from_sqlite import SOURCE_ALIAS
+from tutorials.models import Invoice, Match, RequestSession, RequestSessionDay, Subject, User
+
+SEEDED_ALIAS = 'seeded_sqlite'
+
+class CopyFromSQLiteTestCase(TestCase):
+    """Tests of the copy_from_sqlite command copying a seeded SQLite file into the test database."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Seeded before the test case starts refusing connections to other aliases
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, 'seeded.sqlite3')
+        connections.settings[SEEDED_ALIAS] = connections.configure_settings({
+            DEFAULT_DB_ALIAS: connections.settings[DEFAULT_DB_ALIAS],
+            SEEDED_ALIAS: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': cls.path, 'SQLITE_PROFILE': False},
+        })[SEEDED_ALIAS]
+        try:
+            call_command('migrate', database=SEEDED_ALIAS, verbosity=0)
+            cls.seed()
+        finally:
+            connections[SEEDED_ALIAS].close()
+            del connections[SEEDED_ALIAS]
+            del connections.settings[SEEDED_ALIAS]
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+        super().tearDownClass()
+
+    @classmethod
+    def seed(cls):
+        """Fill the SQLite file with related rows whose IDs have gaps."""
+        users = User.objects.using(SEEDED_ALIAS)
+        student = users.create(
+            id=5, username='@seededstudent', email='student@example.org',
+            first_name='Seeded', last_name='Student', user_type='student'
+        )
+        tutor = users.create(
+            id=9, username='@seededtutor', email='tutor@example.org',
+            first_name='Seeded', last_name='Tutor', user_type='tutor'
+        )
+        subjects = Subject.objects.using(SEEDED_ALIAS)
+        subjects.create(id=3, name='Python')
+        subject = subjects.create(id=7, name='Rust')
+        request_session = RequestSession.objects.using(SEEDED_ALIAS).create(
+            id=12, student=student, subject=subject, date_requested=date(2025, 1, 1)
+        )
+        request_session.set_days(['Monday', 'Thursday'])
+        match = Match.objects.using(SEEDED_ALIAS).create(
+            id=4, request_session=request_session, tutor=tutor, tutor_approved=True
+        )
+        Invoice.objects.using(SEEDED_ALIAS).create(id=2, match=match, payment='30.00')
+
+    def copy(self, *args):
+        """Run copy_from_sqlite on the seeded file, allowing the connection it opens to it."""
+        out = StringIO()
+        with patch.object(type(self), 'databases', self.databases | {SOURCE_ALIAS}):
+            call_command('copy_from_sqlite', *args, stdout=out)
+        return out.getvalue()
+
+    def test_rows_and_ids_are_copied(self):
+        """Test every row is copied with its primary key and relations."""
+        out = self.copy(self.path, '--batch-size', '1')
+        self.assertIn('Copied 2 rows into tutorials_user.', out)
+        self.assertEqual(sorted(User.objects.values_list('id', flat=True)), [5, 9])
+        self.assertEqual(sorted(Subject.objects.values_list('id', flat=True)), [3, 7])
+        self.assertEqual(RequestSessionDay.objects.count(), 2)
+        request_session = RequestSession.objects.get(pk=12)
+        self.assertEqual(request_session.student.username, '@seededstudent')
+        self.assertEqual(request_session.day_names, ['Monday', 'Thursday'])
+        self.assertEqual(request_session.schedule_start, date(2025, 1, 4))
+        invoice = Invoice.objects.get(pk=2)
+        self.assertEqual(invoice.match_id, 4)
+        self.assertEqual(invoice.match.tutor.username, '@seededtutor')
+
+    def test_sequences_continue_after_copied_ids(self):
+        """Test rows created after the copy get IDs above the copied ones."""
+        self.copy(self.path)
+        self.assertEqual(Subject.objects.create(name='Java').id, 8)
+        user = User.objects.create_user('@newuser', email='newuser@example.org', password='Password123')
+        self.assertEqual(user.id, 10)
+
+    def test_source_file_is_left_unchanged(self):
+        """Test copying neither switches the source file to WAL nor leaves journal files beside it."""
+        self.copy(self.path)
+        with sqlite3.connect(self.path) as source:
+            self.assertEqual(source.execute('PRAGMA journal_mode').fetchone()[0], 'delete')
+        source.close()
+        self.assertFalse(os.path.exists(f'{self.path}-wal'))
+        self.assertFalse(os.path.exists(f'{self.path}-shm'))
+
+    def test_target_with_rows_is_refused(self):
+        """Test nothing is copied into a database that already has tutorials rows."""
+        Subject.objects.create(name='Existing')
+        with self.assertRaises(CommandError):
+            self.copy(self.path)
+        self.assertFalse(User.objects.exists())
+
+    def test_missing_file_is_refused(self):
+        """Test a path without a SQLite file is reported."""
+        with self.assertRaises(CommandError):
+            self.copy(os.path.join(self.directory.name, 'missing.sqlite3'))
@@ -10,11 +10,12 @@ class FrequencyTestCase(TestCase):
         self.assertEqual(Frequency.to_string(0.5), 'Fortnightly')
         self.assertEqual(Frequency.to_string(1.0), 'Weekly')
         self.assertEqual(Frequency.to_string(2.0), 'Biweekly')
-        self.assertEqual(Frequency.to_string(4.0), 'Monthly')
+        self.assertEqual(Frequency.to_string(0.25), 'Monthly')
 
     def test_to_string_invalid_value(self):
         """Test that invalid numeric values return 'Unknown'."""
         self.assertEqual(Frequency.to_string(3.0), 'Unknown')
+        self.assertEqual(Frequency.to_string(4.0), 'Unknown')
         self.assertEqual(Frequency.to_string(None), 'Unknown')
 
     def test_to_numeric_valid_labels(self):
@@ -22,7 +23,7 @@ class FrequencyTestCase(TestCase):
         self.assertEqual(Frequency.to_numeric('fortnightly'), 0.5)
         self.assertEqual(Frequency.to_numeric('weekly'), 1.0)
         self.assertEqual(Frequency.to_numeric('biweekly'), 2.0)
-        self.assertEqual(Frequency.to_numeric('monthly'), 4.0)
+        self.assertEqual(Frequency.to_numeric('monthly'), 0.25)
 
     def test_to_numeric_invalid_label(self):
         """Test that invalid string labels return None."""
@@ -36,4 +37,4 @@ class FrequencyTestCase(TestCase):
         self.assertEqual(Frequency.to_numeric('Fortnightly'), 0.5)
         self.assertEqual(Frequency.to_numeric('WEEKLY'), 1.0)
         self.assertEqual(Frequency.to_numeric('BiWeekly'), 2.0)
-        self.assertEqual(Frequency.to_numeric('monthly'), 4.0)
\ No newline at end of file
+        self.assertEqual(Frequency.to_numeric('monthly'), 0.25)
\ No newline at end of file
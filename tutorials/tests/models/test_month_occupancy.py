@@ -0,0 +1,32 @@
+from django.test import TestCase
+from tutorials.occupancy import MonthOccupancy, day_mask, mask_days
+
+class MonthOccupancyTestCase(TestCase):
+    """Unit tests for the MonthOccupancy bitmask."""
+
+    def test_day_mask_round_trip(self):
+        """Test day numbers survive conversion to a mask and back."""
+        self.assertEqual(day_mask([1, 3]), 0b101)
+        self.assertEqual(mask_days(day_mask([31, 2, 7])), [2, 7, 31])
+
+    def test_add_combines_sessions(self):
+        """Test sessions are combined with bitwise OR and counted per day."""
+        occupancy = MonthOccupancy()
+        first = occupancy.add([7, 14], user_ids=(1, 2))
+        occupancy.add([14, 21], user_ids=(3, 2))
+        self.assertEqual(first, day_mask([7, 14]))
+        self.assertEqual(list(occupancy), [7, 14, 21])
+        self.assertEqual(len(occupancy), 3)
+        self.assertEqual(occupancy.count(14), 2)
+        self.assertEqual(occupancy.count(8), 0)
+        self.assertEqual(occupancy.user_days(2), [7, 14, 21])
+        self.assertEqual(occupancy.user_days(1), [7, 14])
+
+    def test_contains(self):
+        """Test membership checks behave like a set of days."""
+        occupancy = MonthOccupancy()
+        occupancy.add([7])
+        self.assertIn(7, occupancy)
+        self.assertNotIn(8, occupancy)
+        self.assertNotIn(0, occupancy)
+        self.assertNotIn('7', occupancy)
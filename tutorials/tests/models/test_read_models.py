@@ -0,0 +1,46 @@
+from datetime import date
+from django.test import TestCase
+from tutorials.models import Match, RequestSession, User
+from tutorials.read_models import match_rows, request_rows, request_values
+
+class ReadModelsTestCase(TestCase):
+    """Unit tests for the listing read models."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json',
+        'tutorials/tests/fixtures/subjects.json',
+        'tutorials/tests/fixtures/request_session.json'
+    ]
+
+    def setUp(self):
+        self.request_session = RequestSession.objects.get(pk=1)
+        self.request_session.set_days(['Monday', 'Thursday'])
+        self.tutor = User.objects.get(username='@janedoe')
+
+    def test_match_rows_are_built_in_one_query(self):
+        Match.objects.create(request_session=self.request_session, tutor=self.tutor, tutor_approved=True)
+        with self.assertNumQueries(1):
+            rows = match_rows(Match.objects.all())
+        row = rows[0]
+        self.assertEqual(row.tutor, '@janedoe')
+        self.assertEqual(row.student, self.request_session.student.username)
+        self.assertEqual(row.subject, 'linear algebra')
+        self.assertEqual(row.proficiency, 'Intermediate')
+        self.assertEqual(row.date_requested, date(2025, 1, 1))
+        self.assertEqual(row.frequency, 'Weekly')
+        self.assertEqual(row.days, ['Monday', 'Thursday'])
+
+    def test_rows_have_no_instance_dict(self):
+        Match.objects.create(request_session=self.request_session, tutor=self.tutor)
+        row = match_rows(Match.objects.all())[0]
+        with self.assertRaises(AttributeError):
+            row.extra = 1
+
+    def test_request_rows(self):
+        with self.assertNumQueries(1):
+            rows = request_rows(request_values(RequestSession.objects.filter(match__isnull=True)))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0].id, self.request_session.id)
+        self.assertEqual(rows[0].subject_id, self.request_session.subject_id)
+        self.assertEqual(rows[0].subject, 'linear algebra')
@@ -0,0 +1,104 @@
+from django.test import TestCase, override_settings
+from tutorials.academic_calendar import get_academic_calendar
+from tutorials.models import User, RequestSession, Subject, RequestSessionDay
+from tutorials.recurrence import Recurrence, weekday_mask, clear_occurrence_cache, expand_occurrences, occurrence_cache_info, MONTHLY, FORTNIGHTLY, WEEKLY, TWICE_WEEKLY
+from datetime import date
+from decimal import Decimal
+
+class RecurrenceTestCase(TestCase):
+    """Unit tests for the Recurrence schedule."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/other_users.json',
+        'tutorials/tests/fixtures/subjects.json'
+    ]
+
+    def setUp(self):
+        self.terms = get_academic_calendar().schedule_terms(date(2024, 8, 10))
+
+    def test_from_frequency_decodes_every_choice(self):
+        """Test each frequency choice decodes to its recurrence kind."""
+        self.assertEqual(Recurrence.from_frequency(Decimal('0.25'), ['Monday']).kind, MONTHLY)
+        self.assertEqual(Recurrence.from_frequency(Decimal('0.50'), ['Monday']).kind, FORTNIGHTLY)
+        self.assertEqual(Recurrence.from_frequency(Decimal('1.00'), ['Monday']).kind, WEEKLY)
+        self.assertEqual(Recurrence.from_frequency(Decimal('2.00'), ['Monday']).kind, TWICE_WEEKLY)
+
+    def test_from_frequency_rejects_unknown_frequency(self):
+        """Test an unknown frequency raises an error."""
+        with self.assertRaises(ValueError):
+            Recurrence.from_frequency(4.0, ['Monday'])
+
+    def test_weekday_mask_splits_combined_days(self):
+        """Test combined day values are split into single weekdays."""
+        self.assertEqual(weekday_mask(['Wednesday, Thursday']), weekday_mask(['Wednesday', 'Thursday']))
+        self.assertEqual(weekday_mask(['Monday', 'Monday']), 0b1)
+
+    def test_equal_schedules_are_equal_and_hashable(self):
+        """Test identical frequency and days give the same hashable recurrence."""
+        first = Recurrence.from_frequency(1.0, ['Thursday', 'Monday'])
+        second = Recurrence.from_frequency(Decimal('1.00'), ['Monday', 'Thursday'])
+        self.assertEqual(first, second)
+        self.assertEqual(len({first, second}), 1)
+
+    def test_weekly_uses_first_chosen_day_each_week(self):
+        """Test weekly sessions meet once a week."""
+        recurrence = Recurrence.from_frequency(1.0, ['Monday', 'Thursday'])
+        self.assertEqual(
+            [day.day for day in recurrence.occurrences(self.terms, 2025, 1)],
+            [6, 13, 20, 27]
+        )
+
+    def test_twice_weekly_uses_both_days(self):
+        """Test twice weekly sessions meet on both chosen days."""
+        recurrence = Recurrence.from_frequency(2.0, ['Monday', 'Thursday'])
+        self.assertEqual(
+            [day.day for day in recurrence.occurrences(self.terms, 2025, 1)],
+            [6, 9, 13, 16, 20, 23, 27, 30]
+        )
+
+    def test_fortnightly_alternates_weeks_across_months(self):
+        """Test fortnightly sessions keep alternating from the schedule start."""
+        recurrence = Recurrence.from_frequency(0.5, ['Monday'])
+        january = recurrence.occurrences(self.terms, 2025, 1)
+        february = recurrence.occurrences(self.terms, 2025, 2)
+        self.assertEqual([day.day for day in january], [13, 27])
+        self.assertEqual([day.day for day in february], [10, 24])
+
+    def test_monthly_meets_once_a_month(self):
+        """Test monthly sessions meet on the first chosen teaching day."""
+        recurrence = Recurrence.from_frequency(0.25, ['Wednesday'])
+        self.assertEqual(recurrence.occurrences(self.terms, 2025, 1), [date(2025, 1, 8)])
+        self.assertEqual(recurrence.occurrences(self.terms, 2024, 8), [])
+
+    def test_session_recurrence_uses_days(self):
+        """Test a request session decodes its recurrence from its days."""
+        request_session = RequestSession.objects.create(
+            student=User.objects.filter(user_type='student').first(),
+            subject=Subject.objects.first(),
+            frequency=2.0,
+            date_requested=date(2024, 8, 10)
+        )
+        RequestSessionDay.objects.create(request_session=request_session, day_of_week='Tuesday')
+        self.assertEqual(request_session.recurrence, Recurrence(TWICE_WEEKLY, 0b10))
+
+    def test_expand_occurrences_shares_equal_schedules(self):
+        """Test equal schedules reuse one cached expansion."""
+        clear_occurrence_cache()
+        first = Recurrence.from_frequency(1.0, ['Monday'])
+        second = Recurrence.from_frequency(Decimal('1.00'), ['Monday'])
+        dates = expand_occurrences(first, self.terms, 2025, 1)
+        self.assertIs(expand_occurrences(second, self.terms, 2025, 1), dates)
+        info = occurrence_cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 1)
+
+    def test_expansion_cache_follows_size_setting(self):
+        """Test the expansion cache is rebuilt with an overridden RECURRENCE_CACHE_SIZE."""
+        recurrence = Recurrence.from_frequency(1.0, ['Monday'])
+        expand_occurrences(recurrence, self.terms, 2025, 1)
+        with override_settings(RECURRENCE_CACHE_SIZE=2):
+            self.assertEqual(occurrence_cache_info().maxsize, 2)
+            for month in (1, 2, 3):
+                expand_occurrences(recurrence, self.terms, 2025, month)
+            self.assertEqual(occurrence_cache_info().currsize, 2)
+        self.assertEqual(occurrence_cache_info().maxsize, 1024)
@@ -1,7 +1,12 @@
 """Unit tests for the RequestSession model."""
-from django.test import TestCase
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.core.exceptions import ValidationError
-from tutorials.models import User, Subject, RequestSession
+from tutorials.models import User, Subject, RequestSession, RequestSessionDay
 from datetime import date
 
 class RequestSessionModelTestCase(TestCase):
@@ -79,4 +84,139 @@ class RequestSessionModelTestCase(TestCase):
         """Test that an invalid student raises a validation error."""
         with self.assertRaises(ValidationError):
             self.request_session.student = None
-            self.request_session.full_clean()
\ No newline at end of file
+            self.request_session.full_clean()
+
+    def test_set_days_updates_weekday_bitmask(self):
+        """Test chosen days are stored in the weekday bitmask."""
+        self.request_session.set_days(['Tuesday', 'Friday'])
+        self.request_session.refresh_from_db()
+        self.assertEqual(self.request_session.weekdays, 0b10010)
+        self.assertEqual(self.request_session.day_names, ['Tuesday', 'Friday'])
+
+    def test_day_rows_keep_weekday_bitmask_in_step(self):
+        """Test adding and deleting day rows updates the bitmask."""
+        RequestSessionDay.objects.create(request_session=self.request_session, day_of_week='Monday')
+        wednesday = RequestSessionDay.objects.create(request_session=self.request_session, day_of_week='Wednesday')
+        self.assertEqual(self.request_session.day_names, ['Monday', 'Wednesday'])
+        wednesday.delete()
+        self.request_session.refresh_from_db()
+        self.assertEqual(self.request_session.day_names, ['Monday'])
+
+    def test_deleting_session_skips_weekday_rebuild(self):
+        """Test cascading to the day rows of a deleted session does not rebuild its bitmask."""
+        self.request_session.set_days(['Monday', 'Wednesday', 'Friday'])
+        with CaptureQueriesContext(connection) as queries:
+            self.request_session.delete()
+        self.assertFalse([query for query in queries if query['sql'].startswith('UPDATE')])
+        self.assertFalse(RequestSessionDay.objects.exists())
+
+    def test_deleting_days_in_bulk_rebuilds_bitmask(self):
+        """Test deleting day rows through a queryset keeps the bitmask in step."""
+        self.request_session.set_days(['Monday', 'Wednesday', 'Friday'])
+        self.request_session.days.filter(day_of_week__in=['Monday', 'Friday']).delete()
+        self.request_session.refresh_from_db()
+        self.assertEqual(self.request_session.day_names, ['Wednesday'])
+
+    def test_saving_stale_session_keeps_new_days(self):
+        """Test saving an instance loaded before its days were added does not erase them."""
+        stale = RequestSession.objects.get(pk=self.request_session.pk)
+        self.request_session.set_days(['Monday', 'Thursday'])
+        stale.proficiency = 'Advanced'
+        stale.save()
+        stale.refresh_from_db()
+        self.assertEqual(stale.proficiency, 'Advanced')
+        self.assertEqual(stale.day_names, ['Monday', 'Thursday'])
+
+    def test_on_weekday_filters_sessions(self):
+        """Test sessions can be queried by weekday."""
+        self.request_session.set_days(['Tuesday'])
+        self.assertIn(self.request_session, RequestSession.objects.on_weekday('Tuesday'))
+        self.assertNotIn(self.request_session, RequestSession.objects.on_weekday('Monday'))
+        self.assertIn(self.request_session, RequestSession.objects.on_weekdays('Monday', 'Tuesday'))
+
+    def test_set_days_ignores_existing_days(self):
+        """Test setting days twice does not duplicate day rows."""
+        self.request_session.set_days(['Monday', 'Tuesday'])
+        self.request_session.set_days(['Monday', 'Tuesday'])
+        self.assertEqual(self.request_session.days.count(), 2)
+
+    def test_duplicate_day_rows_rejected(self):
+        """Test a day cannot be stored twice for one session."""
+        RequestSessionDay.objects.create(request_session=self.request_session, day_of_week='Monday')
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                RequestSessionDay.objects.create(request_session=self.request_session, day_of_week='Monday')
+
+    def test_compact_request_days_command(self):
+        """Test the compaction command keeps one row per day."""
+        self.request_session.set_days(['Monday'])
+        out = StringIO()
+        call_command('compact_request_days', stdout=out)
+        self.assertIn('Removed 0 duplicate day rows.', out.getvalue())
+        self.assertEqual(self.request_session.days.count(), 1)
+
+    def test_recompute_schedule_windows_command(self):
+        """Test the command moves stored schedule windows to changed term settings."""
+        self.request_session.date_requested = date(2024, 8, 10)
+        self.request_session.save()
+        self.assertEqual(self.request_session.schedule_start, date(2024, 9, 1))
+        out = StringIO()
+        with override_settings(ACADEMIC_TERMS=(('Autumn', (10, 1), (12, 1)), ('Spring', (2, 1), (5, 1)))):
+            call_command('recompute_schedule_windows', stdout=out)
+            self.assertIn('Recomputed the schedule windows of 1 requests.', out.getvalue())
+            self.request_session.refresh_from_db()
+            self.assertEqual(self.request_session.schedule_start, date(2024, 10, 1))
+            self.assertEqual(self.request_session.schedule_end, date(2025, 5, 1))
+            call_command('recompute_schedule_windows', stdout=out)
+            self.assertIn('Recomputed the schedule windows of 0 requests.', out.getvalue())
+
+
+class CompactRequestDaysTestCase(TransactionTestCase):
+    """Tests of the compact_request_days command against a table holding duplicate days."""
+
+    def setUp(self):
+        student = User.objects.create_user(
+            '@duplicatedays', email='duplicatedays@example.org', password='Password123', user_type='student'
+        )
+        subject = Subject.objects.create(name='Duplicates')
+        self.request_session = RequestSession.objects.create(
+            student=student, subject=subject, date_requested=date(2025, 1, 1)
+        )
+        # The constraint now keeps duplicates out; drop it as the table was before
+        self.constraint = RequestSessionDay._meta.constraints[0]
+        with patch.object(RequestSessionDay._meta, 'constraints', []), connection.schema_editor() as editor:
+            editor.remove_constraint(RequestSessionDay, self.constraint)
+        self.addCleanup(self.restore_constraint)
+        self.kept = [
+            RequestSessionDay.objects.create(request_session=self.request_session, day_of_week=day)
+            for day in ('Monday', 'Tuesday')
+        ]
+        for _ in range(2):
+            RequestSessionDay.objects.create(request_session=self.request_session, day_of_week='Monday')
+        RequestSessionDay.objects.create(request_session=self.request_session, day_of_week='Tuesday')
+
+    def restore_constraint(self):
+        RequestSessionDay.objects.all().delete()
+        with connection.schema_editor() as editor:
+            editor.add_constraint(RequestSessionDay, self.constraint)
+
+    def test_dry_run_counts_duplicates(self):
+        """Test a dry run reports the duplicates and deletes nothing."""
+        out = StringIO()
+        call_command('compact_request_days', '--dry-run', stdout=out)
+        self.assertIn('3 duplicate day rows found.', out.getvalue())
+        self.assertEqual(RequestSessionDay.objects.count(), 5)
+
+    def test_duplicates_are_removed(self):
+        """Test the oldest row of each day is kept and the session's bitmask is unchanged."""
+        self.request_session.refresh_from_db()
+        weekdays = self.request_session.weekdays
+        out = StringIO()
+        call_command('compact_request_days', stdout=out)
+        self.assertIn('Removed 3 duplicate day rows.', out.getvalue())
+        self.assertEqual(
+            list(RequestSessionDay.objects.order_by('id').values_list('id', flat=True)),
+            [day.id for day in self.kept]
+        )
+        self.request_session.refresh_from_db()
+        self.assertEqual(self.request_session.weekdays, weekdays)
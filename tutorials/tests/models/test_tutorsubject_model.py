@@ -50,4 +50,22 @@ class TutorSubjectModelTestCase(TestCase):
         """Test that an invalid proficiency level raises a validation error."""
         with self.assertRaises(ValidationError):
             self.tutor_subject.proficiency = "Expert"
-            self.tutor_subject.full_clean()
\ No newline at end of file
+            self.tutor_subject.full_clean()
+
+    def test_level_follows_proficiency(self):
+        """Test the stored level ranks the proficiency label."""
+        self.tutor_subject.refresh_from_db()
+        self.assertEqual(self.tutor_subject.level, 3)
+        self.tutor_subject.proficiency = 'Beginner'
+        self.tutor_subject.save()
+        self.tutor_subject.refresh_from_db()
+        self.assertEqual(self.tutor_subject.level, 1)
+        self.assertEqual(self.tutor_subject.get_proficiency_display(), 'Beginner')
+
+    def test_at_least_filters_by_level(self):
+        """Test subjects can be filtered to a minimum proficiency."""
+        self.assertIn(self.tutor_subject, TutorSubject.objects.at_least('Intermediate'))
+        self.assertIn(self.tutor_subject, TutorSubject.objects.qualified_for(self.subject, 'advanced'))
+        self.tutor_subject.proficiency = 'Beginner'
+        self.tutor_subject.save()
+        self.assertNotIn(self.tutor_subject, TutorSubject.objects.at_least('Intermediate'))
@@ -0,0 +1,68 @@
+"""Unit tests for the UserActivity counters."""
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from tutorials.activity import adjust_activity, get_activity, recompute_activity
+from tutorials.models import User, Match, RequestSession, TutorSubject, UserActivity
+
+class UserActivityTestCase(TestCase):
+    """Unit tests for the UserActivity counters."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json',
+        'tutorials/tests/fixtures/subjects.json',
+        'tutorials/tests/fixtures/tutor_subjects.json',
+        'tutorials/tests/fixtures/request_session.json'
+    ]
+
+    def setUp(self):
+        self.tutor = TutorSubject.objects.first().tutor
+        self.session = RequestSession.objects.first()
+        self.student = self.session.student
+
+    def test_get_activity_counts_on_first_use(self):
+        """Test a user without counters has them counted from their requests."""
+        self.assertFalse(UserActivity.objects.filter(pk=self.student.pk).exists())
+        activity = get_activity(self.student)
+        self.assertEqual(activity.open_requests, RequestSession.objects.filter(student=self.student).count())
+        self.assertEqual(activity.pending_approvals, 0)
+        self.assertEqual(activity.active_matches, 0)
+
+    def test_recompute_counts_both_sides_of_a_match(self):
+        """Test matches count for both the tutor and the student."""
+        Match.objects.create(request_session=self.session, tutor=self.tutor, tutor_approved=True)
+        recompute_activity([self.student.pk, self.tutor.pk])
+        self.assertEqual(UserActivity.objects.get(pk=self.tutor.pk).active_matches, 1)
+        self.assertEqual(UserActivity.objects.get(pk=self.student.pk).active_matches, 1)
+        self.assertEqual(
+            UserActivity.objects.get(pk=self.student.pk).open_requests,
+            RequestSession.objects.filter(student=self.student, match__isnull=True).count()
+        )
+
+    def test_adjust_updates_existing_counters(self):
+        """Test adjusting applies the deltas to stored counters."""
+        get_activity(self.tutor)
+        adjust_activity(self.tutor.pk, pending_approvals=2)
+        adjust_activity(self.tutor.pk, pending_approvals=-1, active_matches=1)
+        activity = UserActivity.objects.get(pk=self.tutor.pk)
+        self.assertEqual(activity.pending_approvals, 1)
+        self.assertEqual(activity.active_matches, 1)
+
+    def test_adjust_never_goes_negative(self):
+        """Test counters stop at zero."""
+        get_activity(self.tutor)
+        adjust_activity(self.tutor.pk, active_matches=-1)
+        self.assertEqual(UserActivity.objects.get(pk=self.tutor.pk).active_matches, 0)
+
+    def test_repair_command_recounts_stale_counters(self):
+        """Test the repair command overwrites drifted counters."""
+        UserActivity.objects.create(user=self.student, open_requests=42)
+        out = StringIO()
+        call_command('repair_activity_counters', stdout=out)
+        self.assertEqual(
+            UserActivity.objects.get(pk=self.student.pk).open_requests,
+            RequestSession.objects.filter(student=self.student).count()
+        )
+        self.assertEqual(UserActivity.objects.count(), User.objects.count())
+        self.assertIn(f"{User.objects.count()} users", out.getvalue())
@@ -0,0 +1,79 @@
+from django.test import TestCase, override_settings
+from tutorials.academic_calendar import DEFAULT_ACADEMIC_TERMS, AcademicCalendar, get_academic_calendar
+from datetime import date
+
+class AcademicCalendarTestCase(TestCase):
+    """Unit tests for the AcademicCalendar utility class."""
+
+    def setUp(self):
+        self.calendar = AcademicCalendar()
+
+    def test_term_containing_date_in_term(self):
+        """Test a date in term time returns its term."""
+        term = self.calendar.term_containing(date(2025, 2, 10))
+        self.assertEqual(term.name, 'Spring')
+        self.assertEqual(term.start, date(2025, 1, 4))
+        self.assertEqual(term.end, date(2025, 3, 31))
+
+    def test_term_containing_term_boundaries(self):
+        """Test the first and last day of a term are in term time."""
+        self.assertEqual(self.calendar.term_containing(date(2024, 9, 1)).name, 'Autumn')
+        self.assertEqual(self.calendar.term_containing(date(2024, 12, 20)).name, 'Autumn')
+
+    def test_term_containing_date_in_holidays(self):
+        """Test a date outside term time returns None."""
+        self.assertIsNone(self.calendar.term_containing(date(2024, 12, 25)))
+        self.assertIsNone(self.calendar.term_containing(date(2024, 8, 1)))
+
+    def test_next_term_start(self):
+        """Test the next term start is found from any date."""
+        self.assertEqual(self.calendar.next_term_start(date(2024, 8, 10)), date(2024, 9, 1))
+        self.assertEqual(self.calendar.next_term_start(date(2024, 10, 10)), date(2025, 1, 4))
+        self.assertEqual(self.calendar.next_term_start(date(2025, 1, 4)), date(2025, 1, 4))
+
+    def test_schedule_terms_before_academic_year(self):
+        """Test a request before the academic year covers every term."""
+        terms = self.calendar.schedule_terms(date(2024, 8, 10))
+        self.assertEqual([term.name for term in terms], ['Autumn', 'Spring', 'Summer'])
+        self.assertEqual(terms[-1].end, date(2025, 7, 20))
+
+    def test_schedule_terms_during_academic_year(self):
+        """Test a request during term only covers the remaining terms."""
+        terms = self.calendar.schedule_terms(date(2024, 10, 10))
+        self.assertEqual([term.name for term in terms], ['Spring', 'Summer'])
+        self.assertEqual(terms[0].start, date(2025, 1, 4))
+
+    def test_is_late(self):
+        """Test requests within two weeks of a term start are late."""
+        self.assertTrue(self.calendar.is_late(date(2024, 8, 29)))
+        self.assertTrue(self.calendar.is_late(date(2025, 1, 1)))
+        self.assertFalse(self.calendar.is_late(date(2024, 8, 10)))
+
+    def test_teaching_days_between(self):
+        """Test teaching days only count term time weekdays."""
+        # Mon 16 Dec to Sun 5 Jan: five days before the break, Friday 3 Jan is before term
+        self.assertEqual(self.calendar.teaching_days_between(date(2024, 12, 16), date(2025, 1, 5)), 5)
+        self.assertEqual(self.calendar.teaching_days_between(date(2024, 8, 1), date(2024, 8, 31)), 0)
+
+    def test_teaching_days_between_excludes_holidays(self):
+        """Test configured holidays are not teaching days."""
+        calendar = AcademicCalendar(holidays=[date(2024, 12, 16), date(2024, 12, 21)])
+        self.assertEqual(calendar.teaching_days_between(date(2024, 12, 16), date(2024, 12, 20)), 4)
+        self.assertFalse(calendar.is_teaching_day(date(2024, 12, 16)))
+        self.assertTrue(calendar.is_teaching_day(date(2024, 12, 17)))
+
+    @override_settings(ACADEMIC_TERMS=(('Autumn', (10, 1), (12, 1)),))
+    def test_calendar_uses_settings(self):
+        """Test the shared calendar is rebuilt from overridden settings."""
+        self.assertEqual(get_academic_calendar().next_term_start(date(2024, 9, 1)), date(2024, 10, 1))
+
+    def test_calendar_defaults_to_default_terms(self):
+        """Test the shared calendar uses the default terms when the settings do not override them."""
+        self.assertEqual(get_academic_calendar().term_pattern, DEFAULT_ACADEMIC_TERMS)
+
+    def test_index_grows_without_losing_earlier_years(self):
+        """Test lookups outside the indexed years extend the index for both old and new dates."""
+        self.assertEqual(self.calendar.term_containing(date(2024, 10, 1)).start, date(2024, 9, 1))
+        self.assertEqual(self.calendar.term_containing(date(2030, 5, 1)).start, date(2030, 4, 15))
+        self.assertEqual(self.calendar.term_containing(date(2024, 10, 1)).start, date(2024, 9, 1))
+        self.assertEqual(self.calendar.academic_year_terms(2027)[1].start, date(2028, 1, 4))
@@ -0,0 +1,107 @@
+import os
+import shutil
+import tempfile
+import time
+from django.test import SimpleTestCase
+from tutorials.shared_cache import SQLiteCache
+
+def increment(path, times):
+    """Increment the shared counter from a separate process."""
+    cache = SQLiteCache(path, {})
+    for _ in range(times):
+        cache.incr('counter')
+
+class SQLiteCacheTestCase(SimpleTestCase):
+    """Unit tests for the SQLite cache shared between processes."""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.path = os.path.join(directory, 'cache.sqlite3')
+        self.cache = self.open_cache()
+
+    def open_cache(self, **options):
+        return SQLiteCache(self.path, {'OPTIONS': options})
+
+    def test_values_round_trip(self):
+        """Test stored values and integers are read back unchanged."""
+        self.cache.set('page', {'content': b'<html>', 'status': 200})
+        self.cache.set('count', 3)
+        self.assertEqual(self.cache.get('page'), {'content': b'<html>', 'status': 200})
+        self.assertEqual(self.cache.get('count'), 3)
+        self.assertIsNone(self.cache.get('missing'))
+        self.assertEqual(self.cache.get_many(['page', 'missing']), {'page': {'content': b'<html>', 'status': 200}})
+
+    def test_entries_are_shared_between_instances(self):
+        """Test a second cache on the same file sees the first one's entries."""
+        self.cache.set('key', 'value')
+        self.assertEqual(self.open_cache().get('key'), 'value')
+
+    def test_entries_expire(self):
+        """Test expired entries are missed and can be added again."""
+        self.cache.set('key', 'value', 0.05)
+        self.assertTrue(self.cache.has_key('key'))
+        time.sleep(0.1)
+        self.assertIsNone(self.cache.get('key'))
+        self.assertTrue(self.cache.add('key', 'new value'))
+        self.assertEqual(self.cache.get('key'), 'new value')
+
+    def test_add_keeps_live_entries(self):
+        """Test add() does not overwrite a live entry."""
+        self.assertTrue(self.cache.add('key', 1))
+        self.assertFalse(self.cache.add('key', 2))
+        self.assertEqual(self.cache.get('key'), 1)
+
+    def test_incr(self):
+        """Test incr() and decr() update integers and floats and reject missing keys."""
+        self.cache.set('count', 1)
+        self.assertEqual(self.cache.incr('count'), 2)
+        self.assertEqual(self.cache.decr('count', 5), -3)
+        self.cache.set('ratio', 0.5)
+        self.assertEqual(self.cache.incr('ratio'), 1.5)
+        with self.assertRaises(ValueError):
+            self.cache.incr('missing')
+
+    def test_incr_is_atomic_across_processes(self):
+        """Test concurrent increments from several processes are all counted."""
+        self.cache.set('counter', 0)
+        # os.fork rather than multiprocessing, which cannot start children from
+        # the daemonic worker processes of a parallel test run
+        pids = []
+        for _ in range(4):
+            pid = os.fork()
+            if pid == 0:
+                try:
+                    increment(self.path, 50)
+                finally:
+                    os._exit(0)
+            pids.append(pid)
+        for pid in pids:
+            os.waitpid(pid, 0)
+        self.assertEqual(self.cache.get('counter'), 200)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        """Test culling removes the least recently read entries first."""
+        cache = self.open_cache(MAX_ENTRIES=10, CULL_FREQUENCY=2, CULL_CHECK_INTERVAL=1, TOUCH_INTERVAL=0)
+        cache.set('kept', 'value')
+        for index in range(20):
+            time.sleep(0.001)
+            cache.get('kept')
+            cache.set(f'key:{index}', index)
+        self.assertLessEqual(cache._cursor().execute('SELECT COUNT(*) FROM cache').fetchone()[0], 10)
+        self.assertEqual(cache.get('kept'), 'value')
+        self.assertIsNone(cache.get('key:0'))
+
+    def test_touch_delete_and_clear(self):
+        """Test touch(), delete(), delete_many() and clear()."""
+        self.cache.set('key', 'value', 0.05)
+        self.assertTrue(self.cache.touch('key', None))
+        time.sleep(0.1)
+        self.assertEqual(self.cache.get('key'), 'value')
+        self.assertTrue(self.cache.delete('key'))
+        self.assertFalse(self.cache.delete('key'))
+        self.cache.set_many({'a': 1, 'b': 2})
+        self.cache.delete_many(['a'])
+        self.assertEqual(self.cache.get_many(['a', 'b']), {'b': 2})
+        self.cache.clear()
+        self.assertIsNone(self.cache.get('b'))
@@ -0,0 +1,91 @@
+"""Tests of the cached authentication backend."""
+import pickle
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from tutorials.auth import CachedModelBackend, user_cache_key
+from tutorials.models import User
+
+class CachedAuthTestCase(TestCase):
+    """Tests that request.user comes from the cache and is invalidated on changes."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.get(username='@johndoe')
+        self.user = User.objects.get(username='@janedoe')
+        self.backend = CachedModelBackend()
+
+    def test_get_user_is_cached(self):
+        """Test the backend serves a user it has loaded from the cache."""
+        self.assertEqual(self.backend.get_user(self.user.pk), self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.backend.get_user(self.user.pk).username, '@janedoe')
+
+    def test_cached_user_has_no_password_hash(self):
+        """Test the cached copy of a user leaves out the password hash but still checks passwords."""
+        self.backend.get_user(self.user.pk)
+        cached = cache.get(user_cache_key(self.user.pk))
+        self.assertNotIn('password', cached.__dict__)
+        self.assertNotIn(self.user.password.encode(), pickle.dumps(cached))
+        self.assertEqual(cached.get_session_auth_hash(), self.user.get_session_auth_hash())
+        self.assertTrue(cached.check_password('Password123'))
+
+    def test_logged_in_requests_do_not_load_the_user(self):
+        """Test requests of a logged in user make no query to load request.user."""
+        self.client.login(username=self.user.username, password='Password123')
+        url = reverse('profile')
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.context['user'], self.user)
+
+    def test_inactive_cached_user_is_rejected(self):
+        """Test a cached user who is no longer active is not returned."""
+        self.backend.get_user(self.user.pk)
+        cached = cache.get(user_cache_key(self.user.pk))
+        cached.is_active = False
+        cache.set(user_cache_key(self.user.pk), cached)
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+
+    def test_profile_update_invalidates_cached_user(self):
+        """Test updating the profile removes the cached user."""
+        self.client.login(username=self.user.username, password='Password123')
+        self.client.get(reverse('profile'))
+        self.client.post(reverse('profile'), {
+            'first_name': 'Janet',
+            'last_name': 'Doe',
+            'username': '@janetdoe',
+            'email': 'janetdoe@example.org',
+        })
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+        response = self.client.get(reverse('profile'))
+        self.assertEqual(response.context['user'].username, '@janetdoe')
+
+    def test_password_change_invalidates_cached_user(self):
+        """Test changing the password is seen by the next request."""
+        self.client.login(username=self.user.username, password='Password123')
+        self.client.get(reverse('profile'))
+        self.client.post(reverse('password'), {
+            'password': 'Password123',
+            'new_password': 'NewPassword123',
+            'password_confirmation': 'NewPassword123',
+        })
+        response = self.client.get(reverse('profile'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['user'].check_password('NewPassword123'))
+
+    def test_deleted_user_is_logged_out(self):
+        """Test a deleted user is removed from the cache and logged out."""
+        user_client = self.client_class()
+        user_client.login(username=self.user.username, password='Password123')
+        user_client.get(reverse('profile'))
+        self.client.login(username=self.admin.username, password='Password123')
+        self.client.post(reverse('delete_user', args=[self.user.pk]))
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+        response = user_client.get(reverse('profile'))
+        self.assertEqual(response.status_code, 302)
@@ -89,19 +89,20 @@ class CalendarViewTestCase(TestCase):
         )
 
         self.client.force_login(self.admin)
-        
+        month = '&month=2&year=2024'
+
         # Search by student username
-        response = self.client.get(self.url + f'?search={self.student.username}')
+        response = self.client.get(self.url + f'?search={self.student.username}' + month)
         self.assertEqual(len(response.context['sessions']), 1)
         self.assertEqual(response.context['sessions'][0].student, self.student)
         
         # Search by subject
-        response = self.client.get(self.url + '?search=Physics')
+        response = self.client.get(self.url + '?search=Physics' + month)
         self.assertEqual(len(response.context['sessions']), 1)
         self.assertEqual(response.context['sessions'][0].subject.name, 'Physics')
         
         # Search by proficiency
-        response = self.client.get(self.url + '?search=Advanced')
+        response = self.client.get(self.url + '?search=Advanced' + month)
         self.assertEqual(len(response.context['sessions']), 1)
         self.assertEqual(response.context['sessions'][0].proficiency, 'Advanced')
 
@@ -129,9 +130,56 @@ class CalendarViewTestCase(TestCase):
             date in calendar_context['highlighted_dates'] 
             for date in session.recurring_dates
         ))
-        expected_dates = [7, 14, 21, 28]
+        expected_dates = [6, 13, 20, 27]
         self.assertEqual(sorted(session.recurring_dates), expected_dates)
 
+    def test_get_calendar_context_sessions_by_day(self):
+        """Test each calendar cell carries the sessions on that day."""
+        request_session = RequestSession.objects.create(
+            student=self.student,
+            subject=self.subject,
+            frequency=1.0,
+            date_requested=date(2024, 8, 10)
+        )
+        RequestSessionDay.objects.create(
+            request_session=request_session,
+            day_of_week='Monday'
+        )
+        Match.objects.create(
+            request_session=request_session,
+            tutor=self.tutor,
+            tutor_approved=True
+        )
+        calendar_context = get_calendar_context(self.admin, month=1, year=2025)
+        cells = dict(cell for week in calendar_context['calendar_weeks'] for cell in week)
+        self.assertEqual([session.id for session in cells[6]], [request_session.id])
+        self.assertEqual(cells[7], [])
+        self.assertEqual(calendar_context['occupancy'].user_days(self.tutor.id), [6, 13, 20, 27])
+        summary = calendar_context['sessions_by_day'][6][0]
+        self.assertEqual(summary.subject, self.subject.name)
+        self.assertEqual(summary.tutor, self.tutor.username)
+        self.assertEqual(summary.frequency, 'Weekly')
+        self.assertNotIn(7, calendar_context['sessions_by_day'])
+
+    def test_get_calendar_context_skips_inactive_sessions(self):
+        """Test sessions outside their schedule window are not loaded."""
+        request_session = RequestSession.objects.create(
+            student=self.student,
+            subject=self.subject,
+            frequency=1.0,
+            date_requested=date(2024, 8, 10)
+        )
+        self.assertEqual(request_session.schedule_start, date(2024, 9, 1))
+        self.assertEqual(request_session.schedule_end, date(2025, 7, 20))
+        Match.objects.create(
+            request_session=request_session,
+            tutor=self.tutor,
+            tutor_approved=True
+        )
+        self.assertEqual(len(get_calendar_context(self.admin, month=1, year=2025)['sessions']), 1)
+        self.assertEqual(len(get_calendar_context(self.admin, month=8, year=2025)['sessions']), 0)
+        self.assertEqual(len(get_calendar_context(self.tutor, month=8, year=2024)['sessions']), 0)
+
     def test_get_recurring_dates(self):
         """Test recurring dates are calculated correctly."""
         request_session = RequestSession.objects.create(
@@ -148,7 +196,7 @@ class CalendarViewTestCase(TestCase):
         
         dates = get_recurring_dates(request_session, 2025, 1)
         
-        expected_dates = [7, 14, 21, 28] 
+        expected_dates = [6, 13, 20, 27] 
         self.assertEqual(sorted(dates), expected_dates)
         
     def test_biweekly_recurring_dates(self):
@@ -170,7 +218,7 @@ class CalendarViewTestCase(TestCase):
         )
         
         dates = get_recurring_dates(request_session, 2025, 1)
-        expected_dates = [7, 10, 14, 17, 21, 24, 28, 31] 
+        expected_dates = [6, 9, 13, 16, 20, 23, 27, 30] 
         self.assertEqual(sorted(dates), expected_dates)
 
     def test_term_boundaries(self):
@@ -0,0 +1,92 @@
+import csv
+import io
+from django.core.management import call_command
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from django.urls import reverse
+from tutorials.models import Invoice, Match, RequestSession, User
+
+class CsvExportTestCase(TestCase):
+    """Tests of the streamed CSV exports and the export_csv command."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json',
+        'tutorials/tests/fixtures/subjects.json',
+        'tutorials/tests/fixtures/request_session.json'
+    ]
+
+    def setUp(self):
+        self.admin = User.objects.get(username='@johndoe')
+        self.tutor = User.objects.get(username='@janedoe')
+        self.request_session = RequestSession.objects.get(pk=1)
+        self.request_session.set_days(['Monday', 'Thursday'])
+
+    def export(self, name, **params):
+        response = self.client.get(reverse('export_csv', args=[name]), params)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        content = b''.join(response.streaming_content).decode()
+        return response, list(csv.reader(io.StringIO(content)))
+
+    def test_users_export_is_streamed_with_a_header(self):
+        self.client.force_login(self.admin)
+        response, rows = self.export('users')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('attachment; filename="users-', response['Content-Disposition'])
+        self.assertEqual(rows[0], ['id', 'username', 'first_name', 'last_name', 'email', 'user_type', 'date_joined'])
+        self.assertEqual(len(rows) - 1, User.objects.count())
+        self.assertEqual(rows[1][1], "'@johndoe")
+
+    def test_export_honours_the_search(self):
+        self.client.force_login(self.admin)
+        _, rows = self.export('users', search='JANE')
+        self.assertEqual([row[1] for row in rows[1:]], ["'@janedoe"])
+
+    def test_requests_and_matches_exports(self):
+        self.client.force_login(self.admin)
+        _, rows = self.export('requests')
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][2], 'linear algebra')
+        self.assertEqual(rows[1][-1], 'Monday, Thursday')
+
+        Match.objects.create(request_session=self.request_session, tutor=self.tutor, tutor_approved=True)
+        _, rows = self.export('matches')
+        self.assertEqual(rows[1][1:3], ["'@janedoe", "'" + self.request_session.student.username])
+        self.assertEqual(rows[1][6], 'Weekly')
+
+    def test_invoices_export_filters_by_tutor(self):
+        match = Match.objects.create(request_session=self.request_session, tutor=self.tutor, tutor_approved=True)
+        Invoice.objects.create(match=match, payment='25.00')
+        self.client.force_login(self.admin)
+        _, rows = self.export('invoices', tutor=self.tutor.pk)
+        self.assertEqual(rows[1][2], "'@janedoe")
+        self.assertEqual(rows[1][5], '25.00')
+        _, rows = self.export('invoices', tutor=self.admin.pk)
+        self.assertEqual(len(rows), 1)
+
+    def test_formulas_are_neutralised(self):
+        """Test text a spreadsheet would evaluate is exported with a leading quote."""
+        self.tutor.first_name = '=HYPERLINK("http://example.org")'
+        self.tutor.last_name = '-1+2'
+        self.tutor.save()
+        self.client.force_login(self.admin)
+        _, rows = self.export('users', search='jane')
+        self.assertEqual(rows[1][1:4], ["'@janedoe", '\'=HYPERLINK("http://example.org")', "'-1+2"])
+        self.assertEqual(rows[1][4], 'janedoe@example.org')
+
+    def test_unknown_export_and_bad_tutor_are_not_found(self):
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get(reverse('export_csv', args=['passwords'])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('export_csv', args=['invoices']), {'tutor': 'x'}).status_code, 404)
+
+    def test_non_admins_are_redirected(self):
+        self.client.force_login(self.tutor)
+        response = self.client.get(reverse('export_csv', args=['users']))
+        self.assertRedirects(response, reverse('dashboard'), fetch_redirect_response=False)
+
+    def test_command_writes_the_export(self):
+        output = io.StringIO()
+        call_command('export_csv', 'users', '--search', 'jane', '--chunk-size', '1', stdout=output)
+        rows = list(csv.reader(io.StringIO(output.getvalue())))
+        self.assertEqual(rows[0][1], 'username')
+        self.assertEqual([row[1] for row in rows[1:]], ["'@janedoe"])
@@ -0,0 +1,157 @@
+import io
+import os
+import tempfile
+from decimal import Decimal
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from tutorials.activity import get_activity
+from tutorials.generations import get_generations
+from tutorials.imports import import_rows
+from tutorials.models import RequestSession, RequestSessionDay, TutorSubject, User
+
+REQUESTS_CSV = """student,subject,proficiency,frequency,days,date_requested
+@petrapickles,Python,beginner,Weekly,"Monday, Thursday",2025-03-01
+@peterpickles,sql,Advanced,Fortnightly,Friday,
+@petrapickles,python,Advanced,Weekly,Tuesday,
+@janedoe,Python,Beginner,Weekly,Monday,
+@nobody,Python,Beginner,Weekly,Monday,
+@peterpickles,Latin,Beginner,Weekly,Monday,
+@peterpickles,Java,Expert,Weekly,Monday,
+@peterpickles,Rust,Beginner,Daily,Monday,
+@peterpickles,C,Beginner,Weekly,Sunday,
+@peterpickles,C++,Beginner,Weekly,Monday,2025-13-01
+"""
+
+class CsvImportTestCase(TestCase):
+    """Tests of the bulk CSV imports, their view and the import_csv command."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json',
+        'tutorials/tests/fixtures/subjects.json'
+    ]
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.get(username='@johndoe')
+        self.tutor = User.objects.get(username='@janedoe')
+        self.student = User.objects.get(username='@petrapickles')
+
+    def test_valid_requests_are_imported_and_others_reported(self):
+        """Test valid request rows are imported and every other row is reported with its reason."""
+        generations = get_generations(RequestSession, RequestSessionDay)
+        report = import_rows('requests', io.StringIO(REQUESTS_CSV), chunk_size=3)
+        self.assertEqual(report.created, 2)
+        self.assertEqual([error.line for error in report.errors], [4, 5, 6, 7, 8, 9, 10, 11])
+        self.assertEqual(report.errors[0].message, '@petrapickles already has python.')
+        self.assertEqual(report.errors[1].message, "Unknown student '@janedoe'.")
+        self.assertIn("Unknown subject 'Latin'", report.errors[3].message)
+        self.assertIn("Unknown days: Sunday", report.errors[6].message)
+        self.assertIn("Invalid date_requested '2025-13-01'", report.errors[7].message)
+
+        request_session = RequestSession.objects.get(student=self.student)
+        self.assertEqual(request_session.subject.name, 'Python')
+        self.assertEqual(request_session.proficiency, 'Beginner')
+        self.assertEqual(request_session.day_names, ['Monday', 'Thursday'])
+        self.assertEqual(
+            sorted(request_session.days.values_list('day_of_week', flat=True)), ['Monday', 'Thursday']
+        )
+        self.assertIsNotNone(request_session.schedule_start)
+        self.assertEqual(request_session.level, 1)
+        self.assertEqual(get_activity(self.student).open_requests, 1)
+        self.assertNotEqual(get_generations(RequestSession, RequestSessionDay), generations)
+
+    def test_existing_requests_are_duplicates(self):
+        """Test a request for a subject the student already requested is rejected."""
+        RequestSession.objects.create(student=self.student, subject_id=7, date_requested='2025-01-01')
+        report = import_rows('requests', io.StringIO(REQUESTS_CSV))
+        self.assertEqual(report.errors[0].line, 2)
+        self.assertEqual(report.errors[0].message, '@petrapickles already has Python.')
+
+    def test_queries_do_not_grow_with_the_rows(self):
+        """Test the number of queries does not depend on the number of rows."""
+        header = 'student,subject,proficiency,frequency,days\n'
+        counts = []
+        for student, subjects in (('@petrapickles', ['Python']), ('@peterpickles', ['Python', 'Java', 'C', 'SQL'])):
+            rows = ''.join(f'{student},{subject},Beginner,Weekly,Monday\n' for subject in subjects)
+            with CaptureQueriesContext(connection) as queries:
+                report = import_rows('requests', io.StringIO(header + rows))
+            self.assertEqual(report.created, len(subjects))
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_tutor_subjects_are_imported(self):
+        """Test tutor subject rows are imported with their prices."""
+        csv_text = 'tutor,subject,proficiency,price\n@janedoe,Rust,advanced,25.50\n@janedoe,Java,Beginner,\n@janedoe,SQL,Beginner,1000\n'
+        report = import_rows('tutor_subjects', io.StringIO(csv_text))
+        self.assertEqual(report.created, 2)
+        self.assertEqual(report.errors[0].line, 4)
+        self.assertIn("Invalid price '1000'", report.errors[0].message)
+        tutor_subjects = {ts.subject.name: ts for ts in TutorSubject.objects.filter(tutor=self.tutor)}
+        self.assertEqual(tutor_subjects['Rust'].price, Decimal('25.50'))
+        self.assertEqual(tutor_subjects['Rust'].proficiency, 'Advanced')
+        self.assertEqual(tutor_subjects['Java'].price, Decimal('10.00'))
+
+    def test_missing_columns_are_reported(self):
+        """Test a header without a required column is reported."""
+        report = import_rows('tutor_subjects', io.StringIO('tutor,subject\n@janedoe,Rust\n'))
+        self.assertEqual(report.created, 0)
+        self.assertEqual(report.errors[0].message, 'Missing columns: proficiency.')
+
+    def test_view_imports_the_upload(self):
+        """Test the view imports an uploaded file and shows the report."""
+        self.client.force_login(self.admin)
+        url = reverse('import_csv', args=['requests'])
+        self.assertEqual(self.client.get(url).status_code, 200)
+        upload = SimpleUploadedFile('requests.csv', REQUESTS_CSV.encode('utf-8-sig'), content_type='text/csv')
+        response = self.client.post(url, {'file': upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['report'].created, 2)
+        self.assertContains(response, 'Imported 2 rows, rejected 8')
+        self.assertContains(response, "Unknown student &#x27;@janedoe&#x27;.")
+
+    def test_view_rejects_files_that_are_not_utf8(self):
+        """Test the view reports an upload that is not UTF-8 encoded as a form error."""
+        self.client.force_login(self.admin)
+        upload = SimpleUploadedFile('requests.csv', b'\xff\xfe\x00', content_type='text/csv')
+        response = self.client.post(reverse('import_csv', args=['requests']), {'file': upload})
+        self.assertIsNone(response.context['report'])
+        self.assertTrue(response.context['form'].errors)
+
+    def test_view_reports_rows_imported_before_a_line_that_is_not_utf8(self):
+        """Test the rows before an undecodable line are imported and reported with that line."""
+        self.client.force_login(self.admin)
+        rejected = '@nobody,Python,Beginner,Weekly,Monday,\n' * 300
+        content = REQUESTS_CSV.encode('utf-8-sig') + rejected.encode() + b'@nobody,\xff\n'
+        upload = SimpleUploadedFile('requests.csv', content, content_type='text/csv')
+        response = self.client.post(reverse('import_csv', args=['requests']), {'file': upload})
+        report = response.context['report']
+        self.assertEqual(report.created, 2)
+        self.assertEqual(RequestSession.objects.count(), 2)
+        self.assertFalse(response.context['form'].errors)
+        self.assertIn('were not imported', report.errors[-1].message)
+        self.assertContains(response, f'Imported 2 rows, rejected {len(report.errors)}')
+
+    def test_view_is_for_admins_only(self):
+        """Test only admins can import and only known imports exist."""
+        self.assertEqual(self.client.get(reverse('import_csv', args=['passwords'])).status_code, 302)
+        self.client.force_login(self.tutor)
+        response = self.client.get(reverse('import_csv', args=['requests']))
+        self.assertRedirects(response, reverse('dashboard'), fetch_redirect_response=False)
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get(reverse('import_csv', args=['passwords'])).status_code, 404)
+
+    def test_command_imports_the_file(self):
+        """Test the import_csv command imports a file and prints the rejected rows."""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as file:
+            file.write(REQUESTS_CSV)
+        self.addCleanup(os.remove, file.name)
+        output, errors = io.StringIO(), io.StringIO()
+        call_command('import_csv', 'requests', file.name, stdout=output, stderr=errors)
+        self.assertIn('Imported 2 rows, rejected 8.', output.getvalue())
+        self.assertIn('Line 5: Unknown student', errors.getvalue())
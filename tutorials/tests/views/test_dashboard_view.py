@@ -53,4 +53,13 @@ class DashboardViewTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'dashboard.html')
         self.assertNotIn('is_admin_view', response.context)
-        self.assertNotIn('unmatched_count', response.context)
\ No newline at end of file
+        self.assertNotIn('unmatched_count', response.context)
+
+    def test_dashboard_counts_follow_request_changes(self):
+        """Test the student counters are kept up to date by request views."""
+        self.client.force_login(self.student)
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['unmatched_student_requests'], 1)
+        self.client.post(reverse('delete_request', args=[self.request.id]))
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['unmatched_student_requests'], 0)
@@ -0,0 +1,71 @@
+from datetime import date
+from django.core.cache import cache
+from django.template import engines
+from django.template.loaders.cached import Loader as CachedLoader
+from django.test import TestCase
+from django.urls import reverse
+from tutorials.fragments import calendar_version
+from tutorials.generations import bump_generation, generation_key
+from tutorials.models import Match, RequestSession, RequestSessionDay, Subject, User
+
+class FragmentCacheTestCase(TestCase):
+    """Tests of the cached navbar, menu and calendar fragments."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json',
+        'tutorials/tests/fixtures/subjects.json'
+    ]
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.get(username='@johndoe')
+        self.tutor = User.objects.get(username='@janedoe')
+        self.student = User.objects.get(username='@petrapickles')
+        self.subject = Subject.objects.first()
+        self.calendar_url = reverse('calendar_view') + '?month=2&year=2024'
+
+    def test_navbar_is_cached_per_role(self):
+        """Test each role is served its own cached navbar."""
+        self.client.force_login(self.admin)
+        self.assertContains(self.client.get(reverse('dashboard')), 'Requested Sessions')
+        self.client.force_login(self.student)
+        response = self.client.get(reverse('dashboard'))
+        self.assertNotContains(response, 'Requested Sessions')
+        self.assertNotContains(response, 'Create new admin')
+        self.assertContains(response, 'Make Request')
+
+    def test_calendar_grid_is_refreshed_when_its_data_changes(self):
+        """Test a change to a session shown in the calendar is not hidden by the cache."""
+        request_session = RequestSession.objects.create(
+            student=self.student,
+            subject=self.subject,
+            frequency=1.0,
+            date_requested=date(2024, 1, 1)
+        )
+        RequestSessionDay.objects.create(request_session=request_session, day_of_week='Monday')
+        Match.objects.create(request_session=request_session, tutor=self.tutor, tutor_approved=True)
+        self.client.force_login(self.admin)
+        self.assertContains(self.client.get(self.calendar_url), self.subject.name)
+
+        self.subject.name = 'Renamed subject'
+        self.subject.save()
+        self.assertContains(self.client.get(self.calendar_url), 'Renamed subject')
+
+    def test_logins_do_not_change_calendar_version(self):
+        """Test logging in, which saves last_login and rehashes the fixture password, keeps the calendar fragments."""
+        version = calendar_version()
+        self.client.login(username=self.student.username, password='Password123')
+        self.assertEqual(calendar_version(), version)
+
+    def test_calendar_version_after_eviction_is_new(self):
+        """Test an evicted version counter restarts at an unused value."""
+        version = calendar_version()
+        cache.delete(generation_key(RequestSession))
+        bump_generation(RequestSession)
+        self.assertNotEqual(calendar_version(), version)
+
+    def test_templates_use_cached_loader(self):
+        """Test compiled templates are kept between requests."""
+        loader = engines.all()[0].engine.template_loaders[0]
+        self.assertIsInstance(loader, CachedLoader)
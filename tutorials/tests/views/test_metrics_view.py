@@ -0,0 +1,90 @@
+import os
+import tempfile
+from unittest.mock import patch
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from tutorials.metrics import Registry
+from tutorials.models import User
+
+class MetricsViewTestCase(TestCase):
+    """Unit tests for the metrics endpoint and registry."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        self.url = reverse('metrics')
+        self.student = User.objects.filter(user_type='student').first()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_metrics_url(self):
+        self.assertEqual(self.url, '/metrics/')
+
+    def test_not_found_when_disabled(self):
+        """Test the endpoint is hidden when metrics are off."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 404)
+
+    def test_requests_are_recorded_by_url_name(self):
+        """Test latency and query histograms are reported per URL name."""
+        self.client.force_login(self.student)
+        with override_settings(METRICS=True, METRICS_DIR=self.directory.name, METRICS_TOKEN='secret'):
+            self.client.get(reverse('dashboard'))
+            response = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('# TYPE http_request_duration_seconds histogram', body)
+        self.assertIn('http_request_duration_seconds_bucket{view="dashboard",le="+Inf"}', body)
+        self.assertIn('http_request_db_queries_count{view="dashboard"}', body)
+        self.assertIn('calendar_expansions_total{result="miss"}', body)
+        self.assertIn('cache_hit_ratio{cache="recurrence"}', body)
+
+    def test_forbidden_without_token(self):
+        """Test only admins and scrapers with the token may read the metrics, whatever their address."""
+        self.client.force_login(self.student)
+        with override_settings(METRICS=True, METRICS_DIR=self.directory.name, METRICS_TOKEN='secret'):
+            self.assertEqual(self.client.get(self.url, REMOTE_ADDR='127.0.0.1').status_code, 403)
+            response = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer wrong')
+            self.assertEqual(response.status_code, 403)
+
+    def test_token_grants_access(self):
+        """Test a scraper sending the bearer token may read the metrics."""
+        with override_settings(METRICS=True, METRICS_DIR=self.directory.name, METRICS_TOKEN='secret'):
+            response = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+
+    def test_empty_token_grants_nothing(self):
+        """Test an unset token does not let a request sending an empty bearer token in."""
+        with override_settings(METRICS=True, METRICS_DIR=self.directory.name, METRICS_TOKEN=''):
+            response = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer ')
+        self.assertEqual(response.status_code, 403)
+
+    def test_processes_are_aggregated(self):
+        """Test the metrics flushed by several processes are summed."""
+        first, second = Registry(), Registry()
+        for registry in (first, second):
+            registry.counter('jobs_total', 'Jobs', ['kind']).inc(2, kind='pdf')
+            registry.histogram('job_seconds', 'Jobs', buckets=(1, 5)).observe(3)
+        first.flush(self.directory.name)
+        # A second, running worker writes to its own file
+        with patch.object(os, 'getpid', return_value=os.getppid()):
+            second.flush(self.directory.name)
+        body = first.exposition(self.directory.name)
+        self.assertIn('jobs_total{kind="pdf"} 4', body)
+        self.assertIn('job_seconds_bucket{le="1"} 0', body)
+        self.assertIn('job_seconds_bucket{le="5"} 2', body)
+        self.assertIn('job_seconds_count 2', body)
+
+    def test_files_of_exited_processes_are_removed(self):
+        """Test the metrics of a process that is no longer running are dropped and its file deleted."""
+        registry = Registry()
+        registry.counter('jobs_total', 'Jobs').inc(3)
+        registry.flush(self.directory.name)
+        # Above the largest process ID Linux hands out
+        with patch.object(os, 'getpid', return_value=2 ** 22 + 1):
+            registry.flush(self.directory.name)
+        self.assertIn('jobs_total 3', registry.exposition(self.directory.name))
+        self.assertEqual(os.listdir(self.directory.name), [f'{os.getpid()}.json'])
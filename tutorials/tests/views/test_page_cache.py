@@ -0,0 +1,115 @@
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from tutorials.generations import bump_generation, cache_page_by_generations, generation_key, get_generations
+from tutorials.models import Match, RequestSession, Subject, User
+
+class PageCacheTestCase(TestCase):
+    """Tests of the table generations and the admin listing pages cached on them."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.get(username='@johndoe')
+        self.student = User.objects.get(username='@petrapickles')
+        self.url = reverse('view_all_users')
+
+    def warm_up(self, url):
+        """Request url until the client has a CSRF cookie and the page is cached."""
+        self.client.get(url)
+        self.client.get(url)
+
+    def test_saves_and_deletes_bump_the_table_generation(self):
+        """Test writes through the ORM start a new generation of their table only."""
+        user_generation, subject_generation = get_generations(User, Subject)
+        self.student.save()
+        self.assertNotEqual(get_generations(User), (user_generation,))
+        user_generation = get_generations(User)
+        self.student.delete()
+        self.assertNotEqual(get_generations(User), user_generation)
+        self.assertEqual(get_generations(Subject), (subject_generation,))
+
+    def test_last_login_saves_keep_the_generation(self):
+        """Test logging in, including the rehash of an old password, does not make the user listings stale."""
+        generations = get_generations(User)
+        self.client.login(username=self.student.username, password='Password123')
+        self.assertEqual(get_generations(User), generations)
+
+    def test_generation_is_bumped_again_on_commit(self):
+        """Test a write bumps its table when saved and again when its transaction commits."""
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.student.save()
+            generation = get_generations(User)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(get_generations(User), generation)
+
+    def test_evicted_generation_restarts_at_an_unused_value(self):
+        """Test a counter recreated after eviction does not revisit old generations."""
+        generations = get_generations(Match, RequestSession)
+        cache.delete(generation_key(Match))
+        bump_generation(Match)
+        self.assertNotEqual(get_generations(Match)[0], generations[0])
+        self.assertEqual(get_generations(RequestSession), generations[1:])
+
+    def test_repeated_browsing_is_served_from_cache(self):
+        """Test an unchanged listing is served without database queries."""
+        self.client.force_login(self.admin)
+        self.warm_up(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertContains(response, '@petrapickles')
+
+    def test_cached_pages_keep_status_and_headers(self):
+        """Test a page served from the cache has the headers of the rendered page."""
+        @cache_page_by_generations(User)
+        def view(request):
+            response = HttpResponse('<p>users</p>', content_type='text/html; charset=utf-8')
+            response['Content-Language'] = 'en-gb'
+            return response
+
+        request = RequestFactory().get('/users/')
+        request.user = self.admin
+        request.META['CSRF_COOKIE'] = 'secret'
+        rendered = view(request)
+        cached = view(request)
+        self.assertIsNot(cached, rendered)
+        self.assertEqual(cached.status_code, 200)
+        self.assertEqual(cached.content, rendered.content)
+        self.assertEqual(dict(cached.items()), dict(rendered.items()))
+
+    def test_search_and_page_are_part_of_the_key(self):
+        """Test different searches of the same listing are cached apart."""
+        self.client.force_login(self.admin)
+        self.warm_up(self.url + '?search=petra')
+        self.assertNotContains(self.client.get(self.url + '?search=petra'), '@janedoe')
+        self.assertContains(self.client.get(self.url + '?search=jane'), '@janedoe')
+
+    def test_write_makes_listing_stale(self):
+        """Test a new user appears on the next request."""
+        self.client.force_login(self.admin)
+        self.warm_up(self.url)
+        User.objects.create_user('@newstudent', email='newstudent@example.org', password='Password123')
+        self.assertContains(self.client.get(self.url), '@newstudent')
+
+    def test_pages_are_cached_per_user(self):
+        """Test users are never served each other's pages."""
+        self.client.force_login(self.admin)
+        self.warm_up(reverse('pending_approvals'))
+        self.client.force_login(self.student)
+        response = self.client.get(reverse('pending_approvals'))
+        self.assertEqual(response.context['user'], self.student)
+
+    def test_pages_with_messages_are_not_cached(self):
+        """Test flash messages are shown once and never cached."""
+        self.client.force_login(User.objects.get(username='@janedoe'))
+        url = reverse('pending_approvals')
+        self.warm_up(url)
+        response = self.client.get(reverse('reject_match', args=[999]), follow=True)
+        self.assertContains(response, 'Match not found')
+        self.assertNotContains(self.client.get(url), 'Match not found')
@@ -0,0 +1,95 @@
+from django.db import DEFAULT_DB_ALIAS, connections, router, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from tutorials.middleware import ReplicaStickinessMiddleware
+from tutorials.models import User
+from tutorials.routers import STICKY_COOKIE, read_from_replica, routing_state, used_replica
+
+@read_from_replica
+def read_view(request):
+    return HttpResponse(User.objects.all().db)
+
+def write_view(request):
+    return HttpResponse(router.db_for_write(User))
+
+class ReplicaRouterTestCase(TestCase):
+    """Unit tests for the replica router, view decorator and stickiness middleware."""
+
+    def setUp(self):
+        connections.settings['replica'] = connections.configure_settings({
+            DEFAULT_DB_ALIAS: connections.settings[DEFAULT_DB_ALIAS],
+            'replica': dict(connections.settings[DEFAULT_DB_ALIAS]),
+        })['replica']
+        self.addCleanup(connections.settings.pop, 'replica')
+        self.factory = RequestFactory()
+
+    def handle(self, view, cookies=None):
+        request = self.factory.get('/')
+        request.COOKIES.update(cookies or {})
+        return ReplicaStickinessMiddleware(view)(request)
+
+    def test_reads_outside_decorated_views_use_primary(self):
+        """Test undecorated code reads from the primary."""
+        self.assertEqual(User.objects.all().db, DEFAULT_DB_ALIAS)
+        with routing_state():
+            self.assertEqual(User.objects.all().db, DEFAULT_DB_ALIAS)
+
+    def test_decorated_view_reads_from_replica(self):
+        """Test read_from_replica views send reads to the replica."""
+        self.assertEqual(self.handle(read_view).content, b'replica')
+
+    def test_writes_go_to_primary_and_make_reads_sticky(self):
+        """Test a write sets the sticky cookie which keeps reads on the primary."""
+        response = self.handle(write_view)
+        self.assertEqual(response.content, DEFAULT_DB_ALIAS.encode())
+        self.assertIn(STICKY_COOKIE, response.cookies)
+        sticky_cookie = {STICKY_COOKIE: response.cookies[STICKY_COOKIE].value}
+        self.assertEqual(self.handle(read_view, sticky_cookie).content, DEFAULT_DB_ALIAS.encode())
+
+    def test_replica_reads_are_recorded(self):
+        """Test the request remembers it read from the replica, so its pages are not cached."""
+        @read_from_replica
+        def view(request):
+            User.objects.all().db
+            return HttpResponse(str(used_replica()))
+        self.assertEqual(self.handle(view).content, b'True')
+        self.assertEqual(self.handle(write_view).content, DEFAULT_DB_ALIAS.encode())
+        self.assertFalse(used_replica())
+
+    def test_forged_sticky_cookie_is_ignored(self):
+        """Test only signed sticky cookies are honoured."""
+        self.assertEqual(self.handle(read_view, {STICKY_COOKIE: '1'}).content, b'replica')
+
+    def test_reads_after_a_write_in_the_same_request_use_primary(self):
+        """Test a request reads its own writes."""
+        @read_from_replica
+        def view(request):
+            router.db_for_write(User)
+            return HttpResponse(User.objects.all().db)
+        self.assertEqual(self.handle(view).content, DEFAULT_DB_ALIAS.encode())
+
+    def test_reads_in_a_transaction_use_primary(self):
+        """Test reads inside an atomic block on the primary are not sent to the replica."""
+        @read_from_replica
+        def view(request):
+            with transaction.atomic():
+                return HttpResponse(User.objects.all().db)
+        self.assertEqual(self.handle(view).content, DEFAULT_DB_ALIAS.encode())
+
+    def test_logging_in_does_not_make_reads_sticky(self):
+        """Test the session and last_login writes of a plain login do not set the sticky cookie."""
+        User.objects.create_user('@stickyuser', email='stickyuser@example.org', password='Password123')
+        response = self.client.post(reverse('log_in'), {'username': '@stickyuser', 'password': 'Password123'})
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('sessionid', response.cookies)
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+        response = self.client.post(reverse('profile'), {
+            'first_name': 'Sticky', 'last_name': 'User', 'username': '@stickyuser', 'email': 'sticky@example.org',
+        })
+        self.assertIn(STICKY_COOKIE, response.cookies)
+
+    def test_replica_is_never_migrated(self):
+        """Test migrations skip the replica."""
+        self.assertFalse(router.allow_migrate('replica', 'tutorials'))
+        self.assertTrue(router.allow_migrate(DEFAULT_DB_ALIAS, 'tutorials'))
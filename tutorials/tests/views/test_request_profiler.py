@@ -0,0 +1,91 @@
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from tutorials.models import User
+from tutorials.profiling import list_profiles, load_collapsed, profile_token, valid_profile_token
+
+class RequestProfilerTestCase(TestCase):
+    """Unit tests for the on-demand request profiler."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        self.url = reverse('calendar_view')
+        self.admin = User.objects.filter(user_type='admin').first()
+        self.student = User.objects.filter(user_type='student').first()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def profile_settings(self, **kwargs):
+        return override_settings(REQUEST_PROFILING=True, REQUEST_PROFILE_DIR=self.directory.name, **kwargs)
+
+    def test_dormant_by_default(self):
+        """Test nothing is profiled when profiling is off."""
+        self.client.force_login(self.admin)
+        response = self.client.get(self.url, {'profile': '1'})
+        self.assertNotIn('X-Profile-Id', response)
+
+    def test_admin_request_is_profiled(self):
+        """Test an admin asking for a profile gets one stored with its metadata."""
+        self.client.force_login(self.admin)
+        with self.profile_settings():
+            response = self.client.get(self.url, {'profile': '1'})
+            profiles = list_profiles()
+            stacks = load_collapsed(response['X-Profile-Id'])
+        self.assertEqual(len(profiles), 1)
+        self.assertEqual(profiles[0]['view'], 'calendar_view')
+        self.assertEqual(profiles[0]['user'], self.admin.pk)
+        self.assertTrue(any('calendar_view' in line for line in stacks))
+
+    def test_student_needs_signed_token(self):
+        """Test other users are only profiled with a valid signed token."""
+        self.client.force_login(self.student)
+        with self.profile_settings():
+            response = self.client.get(self.url, {'profile': '1'})
+            self.assertNotIn('X-Profile-Id', response)
+            response = self.client.get(self.url, {'profile': profile_token()})
+            self.assertIn('X-Profile-Id', response)
+
+    def test_unprofiled_request_is_untouched(self):
+        """Test requests without the parameter are not profiled."""
+        self.client.force_login(self.admin)
+        with self.profile_settings():
+            response = self.client.get(self.url)
+            self.assertEqual(list_profiles(), [])
+        self.assertNotIn('X-Profile-Id', response)
+
+    def test_sampling_profiler_stores_collapsed_stacks(self):
+        """Test the sampling profiler stores collapsed stacks."""
+        self.client.force_login(self.admin)
+        with self.profile_settings(REQUEST_PROFILER='sampling', REQUEST_PROFILER_INTERVAL=0.0001):
+            response = self.client.get(self.url, {'profile': '1'})
+            self.assertEqual(list_profiles()[0]['mode'], 'sampling')
+            load_collapsed(response['X-Profile-Id'])
+
+    def test_token_validation(self):
+        """Test tampered tokens are rejected."""
+        self.assertTrue(valid_profile_token(profile_token()))
+        self.assertFalse(valid_profile_token(profile_token() + 'x'))
+        self.assertFalse(valid_profile_token('1'))
+
+    def test_command_lists_and_prints_profiles(self):
+        """Test the command lists profiles and prints collapsed stacks and stats."""
+        self.client.force_login(self.admin)
+        with self.profile_settings():
+            profile_id = self.client.get(self.url, {'profile': '1'})['X-Profile-Id']
+            listing = StringIO()
+            call_command('request_profiles', stdout=listing)
+            stacks = StringIO()
+            call_command('request_profiles', profile_id, stdout=stacks)
+            stats = StringIO()
+            call_command('request_profiles', profile_id, stats=5, stdout=stats)
+        self.assertIn(profile_id, listing.getvalue())
+        self.assertIn('/calendar/', listing.getvalue())
+        line = stacks.getvalue().splitlines()[0]
+        self.assertTrue(line.rsplit(' ', 1)[1].isdigit())
+        self.assertIn('cumulative', stats.getvalue())
@@ -82,7 +82,7 @@ class AdminRequestedSessionsViewTestCase(TestCase):
         
         requests_with_forms = response.context['requests_with_forms']
         self.assertEqual(len(requests_with_forms), 1)
-        self.assertEqual(requests_with_forms[0]['request'], self.request)
+        self.assertEqual(requests_with_forms[0]['request'].id, self.request.id)
 
     def test_creates_form_for_each_request(self):
         """Test view creates a form for each unmatched request."""
@@ -0,0 +1,50 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from tutorials.instrumentation import collect_timings, current_timings, timed, timing
+from tutorials.models import User
+
+class ServerTimingMiddlewareTestCase(TestCase):
+    """Unit tests for the Server-Timing middleware."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        self.url = reverse('dashboard')
+        self.student = User.objects.filter(user_type='student').first()
+
+    def test_no_header_when_disabled(self):
+        """Test responses carry no Server-Timing header by default."""
+        self.client.force_login(self.student)
+        response = self.client.get(self.url)
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(SERVER_TIMING=True)
+    def test_header_reports_request_parts(self):
+        """Test the header reports SQL, template, service and total timings."""
+        self.client.force_login(self.student)
+        with self.assertLogs('tutorials.performance', level='INFO') as logs:
+            response = self.client.get(self.url)
+        names = [metric.split(';')[0].strip() for metric in response['Server-Timing'].split(',')]
+        for name in ('db', 'template', 'calendar', 'total'):
+            self.assertIn(name, names)
+        self.assertIn('GET /dashboard/ 200', logs.output[0])
+        self.assertIn('calendar', logs.records[0].timings)
+
+    def test_timing_is_a_no_op_outside_requests(self):
+        """Test timed code runs normally when no request is being timed."""
+        self.assertIsNone(current_timings())
+        with timing('work'):
+            pass
+        self.assertEqual(timed('work')(lambda: 3)(), 3)
+
+    def test_timed_accumulates_calls(self):
+        """Test repeated calls add up under one name."""
+        work = timed('work')(lambda: None)
+        with collect_timings() as timings:
+            work()
+            work()
+        self.assertEqual(timings.counts['work'], 2)
+        self.assertIsNone(current_timings())
@@ -0,0 +1,105 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from tutorials.models import User, Match, RequestSession, Subject
+from tutorials.query_log import QueryRecorder, aggregate_entries, fingerprint
+
+class SlowQueryLogTestCase(TestCase):
+    """Unit tests for the slow query log and its report."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json',
+        'tutorials/tests/fixtures/subjects.json'
+    ]
+
+    def setUp(self):
+        self.admin = User.objects.filter(user_type='admin').first()
+        tutor = User.objects.filter(user_type='tutor').first()
+        for student, subject in zip(User.objects.filter(user_type='student')[:3], Subject.objects.all()[:3]):
+            request_session = RequestSession.objects.create(
+                student=student,
+                subject=subject,
+                proficiency='Beginner',
+                frequency=1.0,
+                date_requested='2024-08-10'
+            )
+            Match.objects.create(request_session=request_session, tutor=tutor, tutor_approved=True)
+
+    def test_fingerprint_ignores_literals_and_list_lengths(self):
+        """Test queries differing only in values share a fingerprint."""
+        first = fingerprint("SELECT * FROM t WHERE id IN (%s, %s) AND name = 'a' LIMIT 21")
+        second = fingerprint("SELECT *  FROM t WHERE id IN (%s, %s, %s) AND name = 'bob' LIMIT 5")
+        self.assertEqual(first, second)
+        self.assertEqual(first[1], "SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?")
+
+    def test_recorder_reports_slow_and_repeated_queries(self):
+        """Test the recorder flags queries over the threshold and repeated fingerprints."""
+        recorder = QueryRecorder(threshold_ms=50)
+        recorder.record('SELECT 1 FROM a WHERE id = %s', 80)
+        for _ in range(3):
+            recorder.record('SELECT 1 FROM b WHERE id = %s', 1)
+        entries = recorder.entries(duplicate_threshold=3)
+        self.assertEqual(sorted(entry['kind'] for entry in entries), ['duplicate', 'slow'])
+        self.assertTrue(entries[0]['frame'].startswith('tutorials/tests/'))
+
+    @override_settings(SLOW_QUERY_LOG=True, SLOW_QUERY_DUPLICATE_THRESHOLD=2)
+    def test_middleware_catches_repeated_queries_in_view(self):
+        """Test the per-request tutor choices of admin_requested_sessions are logged as repeated."""
+        Match.objects.all().delete()
+        self.client.force_login(self.admin)
+        with self.assertLogs('tutorials.slow_queries', level='WARNING') as logs:
+            self.client.get(reverse('admin_requested_sessions'))
+        entries = [json.loads(record.getMessage()) for record in logs.records]
+        duplicates = [entry for entry in entries if entry['kind'] == 'duplicate']
+        self.assertTrue(duplicates)
+        self.assertEqual(duplicates[0]['view'], 'admin_requested_sessions')
+        self.assertGreaterEqual(duplicates[0]['count'], 2)
+
+    def test_aggregate_ranks_by_total_time(self):
+        """Test fingerprints are ranked by total time across entries."""
+        entries = [
+            {'kind': 'slow', 'fingerprint': 'a', 'sql': 'A', 'count': 1, 'duration_ms': 150, 'view': 'one', 'frame': None},
+            {'kind': 'duplicate', 'fingerprint': 'b', 'sql': 'B', 'count': 10, 'duration_ms': 90, 'view': 'two', 'frame': None},
+            {'kind': 'duplicate', 'fingerprint': 'b', 'sql': 'B', 'count': 10, 'duration_ms': 90, 'view': 'three', 'frame': None},
+        ]
+        report = aggregate_entries(entries)
+        self.assertEqual([row['fingerprint'] for row in report], ['b', 'a'])
+        self.assertEqual(report[0]['queries'], 20)
+        self.assertEqual(set(report[0]['views']), {'two', 'three'})
+
+    def test_aggregate_counts_slow_repeated_queries_once(self):
+        """Test a query that is both slow and repeated in a request adds its time and count once."""
+        recorder = QueryRecorder(threshold_ms=50)
+        recorder.record('SELECT 1 FROM a WHERE id = %s', 80)
+        recorder.record('SELECT 1 FROM a WHERE id = %s', 10)
+        recorder.record('SELECT 1 FROM b WHERE id = %s', 60)
+        report = {row['sql']: row for row in aggregate_entries(recorder.entries(duplicate_threshold=2))}
+        repeated = report['SELECT ? FROM a WHERE id = ?']
+        self.assertEqual(repeated['total_ms'], 90)
+        self.assertEqual(repeated['queries'], 2)
+        self.assertEqual(repeated['slow'], 1)
+        self.assertEqual(repeated['duplicate_requests'], 1)
+        slow = report['SELECT ? FROM b WHERE id = ?']
+        self.assertEqual((slow['total_ms'], slow['queries'], slow['slow']), (60, 1, 1))
+
+    def test_report_command_reads_rotated_logs(self):
+        """Test the report command includes rotated backups."""
+        with tempfile.TemporaryDirectory() as directory:
+            log_file = os.path.join(directory, 'slow.jsonl')
+            for filename, view in ((log_file, 'current'), (f'{log_file}.1', 'rotated')):
+                with open(filename, 'w') as log:
+                    log.write(json.dumps({
+                        'kind': 'slow', 'fingerprint': 'abc', 'sql': 'SELECT ?', 'count': 1,
+                        'duration_ms': 120, 'view': view, 'frame': 'tutorials/views.py:1 in f'
+                    }) + '\n')
+            out = StringIO()
+            call_command('slow_query_report', file=log_file, stdout=out)
+        output = out.getvalue()
+        self.assertIn('abc total=240.0ms queries=2', output)
+        self.assertIn('view rotated', output)
+        self.assertIn('at tutorials/views.py:1 in f', output)
@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+from datetime import date
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from tutorials.models import User, RequestSession, Subject, Match
+from tutorials.recurrence import clear_occurrence_cache
+from tutorials.tracing import current_span, end_trace, span, start_trace
+
+class TracingTestCase(TestCase):
+    """Unit tests for request tracing and the OTLP JSON exporter."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json',
+        'tutorials/tests/fixtures/subjects.json'
+    ]
+
+    def setUp(self):
+        self.admin = User.objects.filter(user_type='admin').first()
+        request_session = RequestSession.objects.create(
+            student=User.objects.filter(user_type='student').first(),
+            subject=Subject.objects.first(),
+            frequency=1.0,
+            date_requested=date(2024, 8, 10)
+        )
+        request_session.set_days(['Monday'])
+        Match.objects.create(
+            request_session=request_session,
+            tutor=User.objects.filter(user_type='tutor').first(),
+            tutor_approved=True
+        )
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.trace_file = os.path.join(directory.name, 'traces.jsonl')
+        clear_occurrence_cache()
+
+    def read_spans(self):
+        with open(self.trace_file) as traces:
+            exports = [json.loads(line) for line in traces]
+        return [
+            exported_span
+            for export in exports
+            for exported_span in export['resourceSpans'][0]['scopeSpans'][0]['spans']
+        ]
+
+    def test_domain_spans_nest_under_request_span(self):
+        """Test recurrence expansion is traced as a child of the request span."""
+        self.client.force_login(self.admin)
+        with override_settings(TRACING=True, TRACING_SAMPLE_RATE=1.0, TRACING_FILE=self.trace_file):
+            self.client.get(reverse('calendar_view'), {'month': 1, 'year': 2025})
+        spans = {exported_span['name']: exported_span for exported_span in self.read_spans()}
+        root = spans['GET calendar/']
+        expansion = spans['recurrence.expand']
+        self.assertNotIn('parentSpanId', root)
+        self.assertEqual(expansion['parentSpanId'], root['spanId'])
+        self.assertEqual(expansion['traceId'], root['traceId'])
+        self.assertEqual(len(root['traceId']), 32)
+        self.assertIn({'key': 'http.status_code', 'value': {'intValue': '200'}}, root['attributes'])
+        self.assertIn({'key': 'recurrence.kind', 'value': {'stringValue': 'weekly'}}, expansion['attributes'])
+
+    def test_unsampled_requests_are_not_exported(self):
+        """Test a zero sample rate writes no traces."""
+        self.client.force_login(self.admin)
+        with override_settings(TRACING=True, TRACING_SAMPLE_RATE=0.0, TRACING_FILE=self.trace_file):
+            self.client.get(reverse('calendar_view'))
+        self.assertFalse(os.path.exists(self.trace_file))
+
+    def test_span_is_a_no_op_without_a_trace(self):
+        """Test spans outside a trace record nothing."""
+        with span('work') as active:
+            self.assertIsNone(active)
+        self.assertIsNone(current_span())
+
+    def test_failed_span_records_error_status(self):
+        """Test an exception marks the span as failed."""
+        with override_settings(TRACING_SAMPLE_RATE=1.0, TRACING_FILE=self.trace_file):
+            root, token = start_trace('job')
+            with self.assertRaises(ValueError):
+                with span('step'):
+                    raise ValueError('bad')
+            end_trace(root, token)
+        step = [exported_span for exported_span in self.read_spans() if exported_span['name'] == 'step'][0]
+        self.assertEqual(step['status'], {'code': 2, 'message': 'ValueError: bad'})
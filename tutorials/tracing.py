@@ -0,0 +1,173 @@
+"""Sampled tracing spans around domain operations, exported as OTLP JSON lines."""
+import json
+import os
+import random
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+STATUS_ERROR = 2
+
+_current_span = ContextVar('current_span', default=None)
+_export_lock = threading.Lock()
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = ('trace', 'span_id', 'parent_id', 'name', 'kind', 'attributes', 'start', 'end', 'error')
+
+    def __init__(self, trace, name, parent_id=None, kind=SPAN_KIND_INTERNAL, attributes=None):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.start = time.time_ns()
+        self.end = None
+        self.error = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def finish(self, error=None):
+        self.end = time.time_ns()
+        if error is not None:
+            self.error = f'{type(error).__name__}: {error}'
+        self.trace.spans.append(self)
+
+    def to_otlp(self):
+        """Return the span in the OTLP JSON encoding."""
+        encoded = {
+            'traceId': self.trace.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start),
+            'endTimeUnixNano': str(self.end),
+            'attributes': _otlp_attributes(self.attributes),
+        }
+        if self.parent_id:
+            encoded['parentSpanId'] = self.parent_id
+        if self.error:
+            encoded['status'] = {'code': STATUS_ERROR, 'message': self.error}
+        return encoded
+
+
+class Trace:
+    """Finished spans of one sampled request."""
+
+    __slots__ = ('trace_id', 'spans')
+
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans = []
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _otlp_attributes(attributes):
+    return [{'key': key, 'value': _otlp_value(value)} for key, value in attributes.items()]
+
+
+class span:
+    """Context manager and decorator recording a span under the current one.
+
+    Does nothing unless a sampled trace is active, so it is safe to use
+    anywhere, including outside requests.
+    """
+
+    __slots__ = ('name', 'attributes', 'kind', '_span', '_token')
+
+    def __init__(self, name, kind=SPAN_KIND_INTERNAL, **attributes):
+        self.name = name
+        self.attributes = attributes
+        self.kind = kind
+        self._span = None
+        self._token = None
+
+    def __enter__(self):
+        parent = _current_span.get()
+        if parent is None:
+            return None
+        self._span = Span(parent.trace, self.name, parent.span_id, self.kind, self.attributes)
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, traceback):
+        if self._span is not None:
+            _current_span.reset(self._token)
+            self._span.finish(exc)
+            self._span = self._token = None
+        return False
+
+    def __call__(self, function):
+        name, kind, attributes = self.name, self.kind, self.attributes
+
+        @wraps(function)
+        def traced_function(*args, **kwargs):
+            if _current_span.get() is None:
+                return function(*args, **kwargs)
+            with span(name, kind, **attributes):
+                return function(*args, **kwargs)
+        return traced_function
+
+
+def current_span():
+    """Return the active span, or None when the current code is not traced."""
+    return _current_span.get()
+
+
+def set_attribute(key, value):
+    """Set an attribute on the active span, if any."""
+    active = _current_span.get()
+    if active is not None:
+        active.set_attribute(key, value)
+
+
+def start_trace(name, attributes=None):
+    """Start a trace with a root span when sampled and return (root span, context token), or (None, None)."""
+    if random.random() >= getattr(settings, 'TRACING_SAMPLE_RATE', 1.0):
+        return None, None
+    root = Span(Trace(), name, kind=SPAN_KIND_SERVER, attributes=attributes)
+    return root, _current_span.set(root)
+
+
+def end_trace(root, token, error=None):
+    """Finish the root span and export its trace."""
+    _current_span.reset(token)
+    root.finish(error)
+    export(root.trace)
+
+
+def export(trace):
+    """Append a trace to TRACING_FILE as one OTLP JSON export request per line."""
+    payload = {
+        'resourceSpans': [{
+            'resource': {'attributes': _otlp_attributes({
+                'service.name': getattr(settings, 'TRACING_SERVICE_NAME', 'code_tutors'),
+                'process.pid': os.getpid(),
+            })},
+            'scopeSpans': [{
+                'scope': {'name': 'tutorials'},
+                'spans': [finished.to_otlp() for finished in trace.spans],
+            }],
+        }],
+    }
+    line = json.dumps(payload, separators=(',', ':')) + '\n'
+    with _export_lock, open(settings.TRACING_FILE, 'a', encoding='utf-8') as output:
+        output.write(line)
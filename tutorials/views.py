@@ -4,7 +4,7 @@ from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import ImproperlyConfigured
-from django.http import HttpResponseRedirect, FileResponse
+from django.http import HttpResponseRedirect, FileResponse, HttpResponse, Http404, StreamingHttpResponse
 from django.shortcuts import redirect, render, get_object_or_404
 from django.views import View
 from django.views.generic.edit import FormView, UpdateView
@@ -13,23 +13,41 @@ from django.db.models import Q
 
 from tutorials.forms import LogInForm, PasswordForm, UserForm, SignUpForm, TutorMatchForm, NewAdminForm,RequestSessionForm, SelectTutorForInvoice, UpdateProficiencyForm
 
+from tutorials.academic_calendar import get_academic_calendar
+from tutorials.exports import EXPORTS, csv_lines, export_rows
+from tutorials.imports import IMPORTS, import_rows
+from tutorials.generations import cache_page_by_generations
+from tutorials.activity import adjust_activity, get_activity, recompute_activity
 from tutorials.helpers import InvoiceService, login_prohibited
-
-from tutorials.models import RequestSession, TutorSubject, User, Match, RequestSessionDay, Frequency, Invoice
-from datetime import date, timedelta
+from tutorials.instrumentation import timed
+from tutorials.metrics import REGISTRY
+from tutorials.routers import read_from_replica, writes_ignored
+from tutorials.search import matched_request_search, requested_session_search, user_search
+from tutorials.tracing import span
+from tutorials.occupancy import MonthOccupancy
+from tutorials.read_models import match_rows, request_rows, request_values
+from tutorials.recurrence import expand_occurrences
+
+from tutorials.models import RequestSession, TutorSubject, User, Match, Invoice, Subject
+from collections import namedtuple
+from datetime import date
 
 import calendar as pycalendar
-from .forms import AddTutorSubjectForm, PayInvoice
+from .forms import AddTutorSubjectForm, CsvImportForm, PayInvoice
+from django.utils.crypto import constant_time_compare
 from django.utils.timezone import now
 from django.db import IntegrityError,transaction
 
 from django.core.paginator import Paginator
 
+import csv
+import io
 import os
 
 
 
 @login_required
+@read_from_replica
 def dashboard(request):
     """Display dashboard based on user type."""
     current_user = request.user
@@ -51,42 +69,33 @@ def dashboard(request):
 
     elif current_user.is_tutor:
         total_subjects_count = TutorSubject.objects.filter(tutor=current_user).count()
-        matched_requests_count = Match.objects.filter(tutor=current_user, tutor_approved=True).count()
-        pending_approvals_count = Match.objects.filter(tutor=current_user, tutor_approved=False).count()
+        activity = get_activity(current_user)
 
         context.update(get_calendar_context(current_user))
         context.update({
             'total_subjects_count': total_subjects_count,
             'is_tutor_view': True,
-            'matched_requests_count': matched_requests_count,
-            'pending_approvals_count': pending_approvals_count,
+            'matched_requests_count': activity.active_matches,
+            'pending_approvals_count': activity.pending_approvals,
         })
 
     else:
         # Student view context
-        unmatched_student_requests = RequestSession.objects.filter(
-            student=current_user,
-            match__isnull=True
-        ).count()
-
-        pending_approvals_count = Match.objects.filter(
-            request_session__student=current_user,  
-            tutor_approved=False  
-        ).count()
-
-        matched_requests_count = Match.objects.filter(request_session__student=current_user, tutor_approved=True).count()
+        activity = get_activity(current_user)
 
         context.update(get_calendar_context(current_user))
         context.update({
-            'unmatched_student_requests': unmatched_student_requests,
+            'unmatched_student_requests': activity.open_requests,
             'is_student_view': True,
-            'matched_requests_count': matched_requests_count,
-            'pending_approvals_count': pending_approvals_count,
+            'matched_requests_count': activity.active_matches,
+            'pending_approvals_count': activity.pending_approvals,
         })
 
     return render(request, 'dashboard.html', context)
 
 @login_required
+@cache_page_by_generations(Match, RequestSession, Subject, User)
+@read_from_replica
 def view_matched_requests(request):
     """Display a table of matched requests for a tutor, student, or admin."""
     
@@ -101,27 +110,10 @@ def view_matched_requests(request):
     # Handle search functionality
     search_query = request.GET.get('search', '').lower()
     if search_query:
-        matched_requests = matched_requests.filter(
-            Q(tutor__username__icontains=search_query) |
-            Q(request_session__student__username__icontains=search_query) |
-            Q(request_session__subject__name__icontains=search_query) |
-            Q(request_session__proficiency__icontains=search_query)
-        )
+        matched_requests = matched_requests.filter(matched_request_search(search_query))
     
-    # Prepare data for rendering
-    matched_requests_data = [
-        {
-            'id': match.id,
-            'tutor': match.tutor.username,
-            'student': match.request_session.student.username,
-            'subject': match.request_session.subject.name,
-            'student_proficiency': match.request_session.proficiency,
-            'date_requested': match.request_session.date_requested,
-            'frequency': Frequency.to_string(match.request_session.frequency),
-            'days': [day.get_day_of_week_display() for day in match.request_session.days.all()]
-        }
-        for match in matched_requests
-    ]
+    # Only the shown fields, joined in one query
+    matched_requests_data = match_rows(matched_requests)
     
     return render(
         request,
@@ -216,6 +208,8 @@ def add_new_subject(request):
     return render(request, 'add_new_subject.html', context)
 
 @login_required
+@cache_page_by_generations(User)
+@read_from_replica
 def view_all_users(request):
     """Display all users in a separate page."""
     current_user = request.user
@@ -226,13 +220,7 @@ def view_all_users(request):
     search_query = request.GET.get('search', '').lower()
     all_users = User.objects.all()
     if search_query:
-        all_users = all_users.filter(
-            Q(first_name__icontains=search_query) |
-            Q(last_name__icontains=search_query) |
-            Q(username__icontains=search_query) |
-            Q(email__icontains=search_query) |
-            Q(user_type__icontains=search_query)
-        )
+        all_users = all_users.filter(user_search(search_query))
 
     context = {
         'all_users': all_users,
@@ -252,22 +240,31 @@ def delete_user(request, user_id):
         # Delete related data
         from .models import RequestSession, Match, Invoice
 
-        # Delete all RequestSessions where the user is the student
-        RequestSession.objects.filter(student=user_to_delete).delete()
+        with span('delete.user', **{'user.id': user_to_delete.id}), transaction.atomic():
+            # Matches where the user is the tutor or matches associated with the user's RequestSessions
+            matches_to_delete = Match.objects.filter(
+                Q(tutor=user_to_delete) | Q(request_session__student=user_to_delete)
+            )
+
+            # Remember the other side of each match so their counters can be recounted
+            counterpart_ids = set()
+            for tutor_id, student_id in matches_to_delete.values_list('tutor_id', 'request_session__student_id'):
+                counterpart_ids.update((tutor_id, student_id))
+            counterpart_ids.discard(user_to_delete.id)
 
-        # Delete all Matches where the user is the tutor or matches associated with the user's RequestSessions
-        matches_to_delete = Match.objects.filter(
-            Q(tutor=user_to_delete) | Q(request_session__student=user_to_delete)
-        )
+            # Delete all RequestSessions where the user is the student
+            RequestSession.objects.filter(student=user_to_delete).delete()
+
+            # Delete related Invoices for those matches
+            Invoice.objects.filter(match__in=matches_to_delete).delete()
 
-        # Delete related Invoices for those matches
-        Invoice.objects.filter(match__in=matches_to_delete).delete()
+            # Delete the matches
+            matches_to_delete.delete()
 
-        # Delete the matches
-        matches_to_delete.delete()
+            # Finally, delete the user
+            user_to_delete.delete()
 
-        # Finally, delete the user
-        user_to_delete.delete()
+            recompute_activity(counterpart_ids)
 
         return redirect('view_all_users')
 
@@ -290,20 +287,12 @@ def delete_tutor_subject(request, subject_id):
     return redirect('view_all_tutor_subjects')
 
 def is_request_late(request_date):
-    """Check if a request was made after the academic year started."""
-    term_dates = [
-            (date(request_date.year, 9, 1), date(request_date.year, 12, 20)),  # Autumn
-            (date(request_date.year + 1, 1, 4), date(request_date.year + 1, 3, 31)),  # Spring
-            (date(request_date.year + 1, 4, 15), date(request_date.year + 1, 7, 20))  # Summer
-        ]
-    
-    for term_start, _ in term_dates:
-        if request_date >= term_start - timedelta(weeks=2) and request_date <= term_start:
-            return True
-        
-    return False
+    """Check if a request was made within two weeks of the next term starting."""
+    return get_academic_calendar().is_late(request_date)
 
 @login_required
+@cache_page_by_generations(Match, RequestSession, Subject, User)
+@read_from_replica
 def pending_approvals(request):
     """List pending matches for tutors or admins."""
     current_user = request.user
@@ -329,19 +318,7 @@ def pending_approvals(request):
             Q(tutor__username__icontains=search_query)
         )
 
-    matches_data = [
-        {
-            'id': match.id,
-            'student': match.request_session.student.username,
-            'tutor_username': match.tutor.username,
-            'subject': match.request_session.subject.name,
-            'proficiency': match.request_session.proficiency,
-            'frequency': Frequency.to_string(match.request_session.frequency),
-            'date_requested': match.request_session.date_requested,
-            'days': match.request_session.days.all(),
-        }
-        for match in matches
-    ]
+    matches_data = match_rows(matches)
 
     return render(
         request,
@@ -366,19 +343,20 @@ def approve_match(request, match_id):
         return redirect('pending_approvals')
 
     if request.method == "POST":
-        match.tutor_approved = True
-        match.save()
-
         request_session = match.request_session
-        
-        if not request_session.days.exists():  
-            days_of_week = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']  
-            # Loop through the days and create RequestSessionDay objects
-            for day in days_of_week:
-                RequestSessionDay.objects.create(
-                    request_session=request_session,
-                    day_of_week=day
-                )
+
+        with transaction.atomic():
+            was_approved = match.tutor_approved
+            match.tutor_approved = True
+            match.save()
+
+            if not was_approved:
+                for user_id in (match.tutor_id, request_session.student_id):
+                    adjust_activity(user_id, pending_approvals=-1, active_matches=1)
+
+            if not request_session.weekdays:
+                # No days chosen, so the session can run on any weekday
+                request_session.set_days(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday'])
 
         generateInvoice(match)
         messages.success(request, "Match approved successfully.")
@@ -400,14 +378,20 @@ def reject_match(request, match_id):
         return redirect('pending_approvals')
 
     if request.method == "POST":
-        # Delete the match
-        match.delete()
+        # Delete the match, returning the request to the student's open requests
+        counter = 'active_matches' if match.tutor_approved else 'pending_approvals'
+        with transaction.atomic():
+            student_id = match.request_session.student_id
+            match.delete()
+            adjust_activity(match.tutor_id, **{counter: -1})
+            adjust_activity(student_id, open_requests=1, **{counter: -1})
         messages.success(request, "Match rejected successfully.")
         return redirect('pending_approvals')
 
     return redirect('dashboard')
 
 @login_required
+@cache_page_by_generations(RequestSession, Match, Subject, TutorSubject, User)
 def admin_requested_sessions(request):
     if not request.user.is_admin:
         return redirect('dashboard')
@@ -416,18 +400,14 @@ def admin_requested_sessions(request):
     
     search_query = request.GET.get('search', '').lower()
     if search_query:
-        requests = requests.filter(
-            Q(student__username__icontains=search_query) |
-            Q(subject__name__icontains=search_query) |
-            Q(proficiency__icontains=search_query)
-        )
+        requests = requests.filter(requested_session_search(search_query))
 
-    paginator = Paginator(requests, 6)
+    paginator = Paginator(request_values(requests), 6)
     page = request.GET.get('page')
     requests_page = paginator.get_page(page)
     
     requests_with_forms = []
-    for req in requests_page:
+    for req in request_rows(requests_page):
         requests_with_forms.append({
             'request': req,
             'form': TutorMatchForm(req),
@@ -456,30 +436,13 @@ def admin_requested_session_highlighted(request, request_id):
         selected_tutor = form.cleaned_data['tutor']
     
     request_date = session_request.date_requested
-    if 4 <= request_date.month < 9:
-        academic_year_start = date(request_date.year, 9, 1)
-        term_dates = [
-            (date(request_date.year, 9, 1), date(request_date.year, 12, 20)),  # Autumn
-            (date(request_date.year + 1, 1, 4), date(request_date.year + 1, 3, 31)),  # Spring
-            (date(request_date.year + 1, 4, 15), date(request_date.year + 1, 7, 20))  # Summer
-        ]
-    elif 9 <= request_date.month <= 12:
-        academic_year_start = date(request_date.year, 1, 4)
-        term_dates = [
-            (date(request_date.year, 1, 4), date(request_date.year, 3, 31)),  # Spring
-            (date(request_date.year, 4, 15), date(request_date.year, 7, 20))  # Summer
-        ]
-    else:
-        academic_year_start = date(request_date.year, 4, 15)
-        term_dates = [
-            (date(request_date.year, 4, 15), date(request_date.year, 7, 20))  # Summer
-        ]
+    term_dates = get_academic_calendar().schedule_terms(request_date)
 
     return render(request, 'admin_requested_session_highlighted.html', {
         'request': session_request,
         'form': form,
         'selected_tutor': selected_tutor,
-        'academic_year_start': academic_year_start,
+        'academic_year_start': term_dates[0].start,
         'term_dates': term_dates,
         'late': is_request_late(request_date)
     })
@@ -493,17 +456,20 @@ def delete_matched_request(request, match_id):
 
     try:
         # Wrap the deletion logic in a transaction
-        with transaction.atomic():
+        with span('delete.matched_request', **{'match.id': match_id}), transaction.atomic():
             # Fetch the match and related objects
             match = Match.objects.get(id=match_id)
             student_request = match.request_session
 
             # Delete related records
             Invoice.objects.filter(match=match).delete()       # Delete invoice
-            student_request.days.all().delete()               # Delete request days
             student_request.delete()                          # Delete the student's request
             match.delete()                                    # Delete the match itself
 
+            counter = 'active_matches' if match.tutor_approved else 'pending_approvals'
+            adjust_activity(match.tutor_id, **{counter: -1})
+            adjust_activity(student_request.student_id, **{counter: -1})
+
         messages.success(request, "Matched request deleted successfully.")
     except Match.DoesNotExist:
         messages.error(request, "Matched request not found.")
@@ -524,7 +490,10 @@ def create_match(request, request_id):
         form = TutorMatchForm(session, request.POST)
         if form.is_valid():
             try:
-                tempMatch = form.save(request_session=session)
+                with transaction.atomic():
+                    tempMatch = form.save(request_session=session)
+                    adjust_activity(tempMatch.tutor_id, pending_approvals=1)
+                    adjust_activity(session.student_id, open_requests=-1, pending_approvals=1)
                 messages.success(request, 'Match created successfully')
                 return redirect('admin_requested_sessions')
             except Exception as e:
@@ -617,6 +586,7 @@ def invoice(request):
     else:
         return handle_student_view()
     
+@span('invoice.pricing')
 def generateInvoice(session_match: Match):
     if not session_match.tutor_approved:
         return
@@ -686,7 +656,9 @@ class LogInView(LoginProhibitedMixin, View):
         self.next = request.POST.get('next') or settings.REDIRECT_URL_WHEN_LOGGED_IN
         user = form.get_user()
         if user is not None:
-            login(request, user)
+            # Updating last_login should not keep the user's reads off the replica
+            with writes_ignored():
+                login(request, user)
             return redirect(self.next)
         messages.add_message(request, messages.ERROR, "The credentials provided were invalid!")
         return self.render()
@@ -803,7 +775,7 @@ def student_view_unmatched_requests(request):
     unmatched_requests = RequestSession.objects.filter(
         student=current_user,
         match__isnull=True
-    ).prefetch_related('days')
+    ).select_related('subject')
 
     context = {
         'unmatched_requests': unmatched_requests
@@ -826,15 +798,12 @@ def student_submits_request(request):
                 # Set additional fields
                 new_request.student = request.user  # Assign the logged-in student
                 new_request.date_requested = now().date()  # Set the current date
-                new_request.save()  # Save the RequestSession
+                with transaction.atomic():
+                    new_request.save()  # Save the RequestSession
 
-                # Handle selected days for the session
-                days_selected = request.POST.getlist('days')  # Get the selected days from the form
-                for day in days_selected:
-                    RequestSessionDay.objects.create(
-                        request_session=new_request,
-                        day_of_week=day
-                    )
+                    # Handle selected days for the session
+                    new_request.set_days(request.POST.getlist('days'))
+                    adjust_activity(request.user.id, open_requests=1)
 
                 # Redirect to a success page or the student's unmatched requests
                 return redirect('student_view_unmatched_requests')
@@ -852,7 +821,9 @@ def delete_request(request, request_id):
     """Delete a request session for the logged-in student."""
     try:
         unmatched_request = RequestSession.objects.get(id=request_id, student=request.user, match__isnull=True)
-        unmatched_request.delete()
+        with span('delete.request', **{'request.id': request_id}), transaction.atomic():
+            unmatched_request.delete()
+            adjust_activity(request.user.id, open_requests=-1)
         messages.success(request, "Request deleted successfully.")
     except RequestSession.DoesNotExist:
         messages.error(request, "Request not found or you do not have permission to delete it.")
@@ -875,7 +846,9 @@ def modify_request(request, request_id):
 
     if request.method == 'POST':
         # Delete the old request
-        unmatched_request.delete()
+        with transaction.atomic():
+            unmatched_request.delete()
+            adjust_activity(request.user.id, open_requests=-1)
 
         # Process the submitted form as a new request
         form = RequestSessionForm(request.POST, student=request.user)
@@ -883,15 +856,12 @@ def modify_request(request, request_id):
             new_request = form.save(commit=False)
             new_request.student = request.user
             new_request.date_requested = now().date()
-            new_request.save()
-
-            # Handle selected days for the session
-            days_selected = request.POST.getlist('days')
-            for day in days_selected:
-                RequestSessionDay.objects.create(
-                    request_session=new_request,
-                    day_of_week=day
-                )
+            with transaction.atomic():
+                new_request.save()
+
+                # Handle selected days for the session
+                new_request.set_days(request.POST.getlist('days'))
+                adjust_activity(request.user.id, open_requests=1)
 
             messages.success(request, "Request modified successfully.")
             return redirect('student_view_unmatched_requests')
@@ -901,7 +871,7 @@ def modify_request(request, request_id):
             'subject': unmatched_request.subject,
             'proficiency': unmatched_request.proficiency,
             'frequency': unmatched_request.frequency,
-            'days': [day.day_of_week for day in unmatched_request.days.all()],
+            'days': unmatched_request.day_names,
         }
         form = RequestSessionForm(initial=initial_data, student=request.user)
 
@@ -910,6 +880,7 @@ def modify_request(request, request_id):
 """CALENDER STUFF"""  
 
 @login_required
+@read_from_replica
 def calendar_view(request):
     current_user = request.user
     search_query = request.GET.get('search', '') # get the current search query
@@ -942,52 +913,20 @@ def calendar_view(request):
 
 def get_recurring_dates(session, year, month):
     """Generate recurring dates based on session frequency and term."""
-    dates = []
+    terms = get_academic_calendar().schedule_terms(session.date_requested)
+    dates = [day.day for day in expand_occurrences(session.recurrence, terms, year, month)]
 
-    request_date = session.date_requested
-    if(session.frequency == 2.0):
-        interlude = 1
-    else:
-        interlude = int(7 / session.frequency)
-
-    if 7 <= request_date.month <= 9:
-        academic_year_start = date(request_date.year, 9, 1)
-        academic_year_end = date(request_date.year + 1, 7, 20)
-        term_dates = [
-            (date(request_date.year, 9, 1), date(request_date.year, 12, 20)),  # Autumn
-            (date(request_date.year + 1, 1, 4), date(request_date.year + 1, 3, 31)),  # Spring
-            (date(request_date.year + 1, 4, 15), date(request_date.year + 1, 7, 20))  # Summer
-        ]
-    elif 9 < request_date.month <= 12:
-        academic_year_start = date(request_date.year + 1, 1, 4)
-        academic_year_end = date(request_date.year + 1, 7, 20)
-        term_dates = [
-            (date(request_date.year + 1, 1, 4), date(request_date.year + 1, 3, 31)),  # Spring
-            (date(request_date.year + 1, 4, 15), date(request_date.year + 1, 7, 20))  # Summer
-        ]
-    else:
-        academic_year_start = date(request_date.year, 4, 15)
-        academic_year_end = date(request_date.year, 7, 20)
-        term_dates = [
-            (date(request_date.year, 4, 15), date(request_date.year, 7, 20))  # Summer
-        ]
-
-    session_days = [day.day_of_week for day in session.days.all()]
-
-    current = academic_year_start
-    while current <= academic_year_end:
-        in_term = any(term_start <= current <= term_end for term_start, term_end in term_dates)
-        if in_term and pycalendar.day_name[current.weekday()] in session_days and current.month == month and current.year == year:
-            dates.append(current.day + 1)
-            current += timedelta(days=interlude)
-        else:
-            current += timedelta(days=1)
-    
     """so basically the dates are being added as the actual number days
         so if the date is 2022-01-01, the day is being added as 1
         calendar will then cycle through the calendar which is just a table with numbers and add it in if the number is the same"""
     return dates
 
+class SessionSummary(namedtuple('SessionSummary', ['id', 'subject', 'student', 'tutor', 'proficiency', 'frequency'])):
+    """The fields of a session shown in a calendar cell."""
+
+    __slots__ = ()
+
+@timed('calendar')
 def get_calendar_context(user, month=None, year=None, search_query=None):
     """Get calendar context for the user."""
     if month is None:
@@ -995,46 +934,145 @@ def get_calendar_context(user, month=None, year=None, search_query=None):
     if year is None:
         year = date.today().year
 
+    # Only sessions whose schedule overlaps the month can have dates in it
+    month_start = date(year, month, 1)
+    month_end = date(year, month, pycalendar.monthrange(year, month)[1])
+    active_in_month = Q(schedule_start__lte=month_end, schedule_end__gte=month_start) | Q(schedule_start__isnull=True)
+
     if user.user_type == 'student':
         # students can only see their sessions
         sessions = RequestSession.objects.filter(
             student=user,
             match__isnull=False,
             match__tutor_approved=True
-        ).select_related('match', 'subject', 'match__tutor').prefetch_related('days')
-    elif user.user_type == 'tutor':\
+        ).select_related('match', 'subject', 'student', 'match__tutor')
+    elif user.user_type == 'tutor':
         # tutors can only see their approved sessions
         sessions = RequestSession.objects.filter(
             match__tutor=user,
             match__tutor_approved=True
-        ).select_related('match', 'subject', 'student').prefetch_related('days')
+        ).select_related('match', 'subject', 'student', 'match__tutor')
     else:
         # admins can see or search through all sessions
+        sessions = RequestSession.objects.filter(
+            match__isnull=False,
+            match__tutor_approved=True
+        ).select_related('match', 'subject', 'student', 'match__tutor')
         if search_query:
-            sessions = RequestSession.objects.filter(
+            sessions = sessions.filter(
                 Q(student__username__icontains=search_query) |
                 Q(subject__name__icontains=search_query) |
                 Q(proficiency__icontains=search_query) |
                 Q(match__tutor__username__icontains=search_query)
-            ).filter(
-                match__isnull=False,
-                match__tutor_approved=True
-            ).select_related('match', 'subject', 'student', 'match__tutor')
-        else:
-            sessions = RequestSession.objects.filter(
-                match__isnull=False,
-                match__tutor_approved=True
-            ).select_related('match', 'subject', 'student', 'match__tutor').prefetch_related('days')
+            )
 
+    sessions = sessions.filter(active_in_month)
 
-    highlighted_dates = set()
+    # One pass over the sessions builds the month bitmasks and the sessions on each day
+    occupancy = MonthOccupancy()
+    sessions_by_day = {}
     for session in sessions:
         recurring_dates = get_recurring_dates(session, year, month)
         session.recurring_dates = recurring_dates
-        highlighted_dates.update(recurring_dates)
-    
+        session.occupancy_mask = occupancy.add(
+            recurring_dates,
+            user_ids=(session.student_id, session.match.tutor_id)
+        )
+        if recurring_dates:
+            summary = SessionSummary(
+                id=session.id,
+                subject=session.subject.name,
+                student=session.student.username,
+                tutor=session.match.tutor.username,
+                proficiency=session.proficiency,
+                frequency=session.get_frequency_display(),
+            )
+            for day in recurring_dates:
+                sessions_by_day.setdefault(day, []).append(summary)
+
+    calendar_month = pycalendar.monthcalendar(year, month)
     return {
-        'calendar_month': pycalendar.monthcalendar(year, month),
-        'highlighted_dates': highlighted_dates,
+        'year': year,
+        'month': month,
+        # Whose sessions the calendar shows, which keys its cached fragments
+        'calendar_scope': 'all' if user.is_admin else user.pk,
+        'calendar_month': calendar_month,
+        'calendar_weeks': [
+            [(day, sessions_by_day.get(day, [])) for day in week]
+            for week in calendar_month
+        ],
+        'highlighted_dates': occupancy,
+        'occupancy': occupancy,
+        'sessions_by_day': sessions_by_day,
         'sessions': sessions
     }
+
+"""EXPORTS"""
+
+@login_required
+def export_csv(request, name):
+    """Stream an admin listing as CSV, filtered by the listing's search or, for invoices, tutor."""
+    if not request.user.is_admin:
+        return redirect('dashboard')
+    if name not in EXPORTS:
+        raise Http404
+    tutor = request.GET.get('tutor') or None
+    if tutor is not None and not tutor.isdigit():
+        raise Http404
+
+    rows = export_rows(name, search_query=request.GET.get('search', '').lower(), tutor=tutor)
+    response = StreamingHttpResponse(csv_lines(rows), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{name}-{date.today().isoformat()}.csv"'
+    return response
+
+"""IMPORTS"""
+
+# Rejected rows listed on the import page; the count covers all of them
+IMPORT_ERRORS_SHOWN = 200
+
+@login_required
+def import_csv(request, name):
+    """Import student requests or tutor subjects from an uploaded CSV and report the rejected rows."""
+    if not request.user.is_admin:
+        return redirect('dashboard')
+    if name not in IMPORTS:
+        raise Http404
+
+    report = None
+    if request.method == 'POST':
+        form = CsvImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            lines = io.TextIOWrapper(form.cleaned_data['file'].file, encoding='utf-8-sig', newline='')
+            try:
+                report = import_rows(name, lines)
+            except (UnicodeDecodeError, csv.Error):
+                form.add_error('file', 'The file is not a UTF-8 encoded CSV file.')
+            else:
+                messages.success(request, f"Imported {report.created} rows, rejected {len(report.errors)}.")
+    else:
+        form = CsvImportForm()
+
+    context = {
+        'form': form,
+        'name': name,
+        'columns': IMPORTS[name].columns,
+        'report': report,
+        'errors': report.errors[:IMPORT_ERRORS_SHOWN] if report else [],
+    }
+    return render(request, 'import_csv.html', context)
+
+"""METRICS"""
+
+def metrics(request):
+    """Serve the metrics of every worker process in Prometheus text format."""
+    if not getattr(settings, 'METRICS', False):
+        raise Http404
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    authorization = request.META.get('HTTP_AUTHORIZATION', '')
+    has_token = bool(token) and constant_time_compare(authorization, f'Bearer {token}')
+    is_admin = request.user.is_authenticated and request.user.is_admin
+    if not has_token and not is_admin:
+        return HttpResponse(status=403)
+
+    REGISTRY.flush()
+    return HttpResponse(REGISTRY.exposition(), content_type='text/plain; version=0.0.4; charset=utf-8')